@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Timeseries Analytics
+📐 Rolling means, peaks, period changes and slope for interest_over_time
+
+Every function works on a (series x points) matrix at once, so batch
+requests cost a handful of NumPy operations whatever the series count.
+Series in one matrix must share a length; callers group by length first.
+"""
+
+import numpy as np
+
+SECONDS_PER_YEAR = 365.25 * 86400
+
+# Scales MAD to a standard deviation for normally distributed data
+MAD_SCALE = 0.6745
+
+# Rolling window (in points) used when the caller gives none
+DEFAULT_WINDOWS = {
+    'minute': 15,
+    'hourly': 24,
+    'daily': 7,
+    'weekly': 4,
+    'monthly': 3,
+}
+
+
+def default_window(granularity):
+    return DEFAULT_WINDOWS.get(granularity, 4)
+
+
+def rolling_mean(values, window):
+    """Trailing mean over `window` points; NaN until the window fills"""
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+    if 0 < window <= values.shape[1]:
+        sums = np.cumsum(values, axis=1)
+        sums = np.concatenate([np.zeros((values.shape[0], 1)), sums], axis=1)
+        result[:, window - 1:] = (sums[:, window:] - sums[:, :-window]) / window
+    return result
+
+
+def peak_mask(values):
+    """Local maxima standing at least one standard deviation above the series mean"""
+    values = np.asarray(values, dtype=np.float64)
+    mask = np.zeros(values.shape, dtype=bool)
+    if values.shape[1] < 3:
+        return mask
+    threshold = values.mean(axis=1) + values.std(axis=1)
+    middle = values[:, 1:-1]
+    mask[:, 1:-1] = (middle > values[:, :-2]) & (middle >= values[:, 2:]) & (middle >= threshold[:, None])
+    return mask
+
+
+def period_change(values, period, lag=None):
+    """Percent change of the mean of the last `period` points
+
+    Compared against the `period` points just before them, or, with lag,
+    the same window `lag` points earlier. NaN where there is not enough
+    history or the baseline is zero.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    lag = period if lag is None else lag
+    points = values.shape[1]
+    if period < 1 or points < lag + period:
+        return np.full(values.shape[0], np.nan)
+    latest = values[:, points - period:].mean(axis=1)
+    baseline = values[:, points - lag - period:points - lag].mean(axis=1)
+    return np.divide((latest - baseline) * 100, baseline,
+                     out=np.full(values.shape[0], np.nan), where=baseline > 0)
+
+
+def points_per_year(timestamps):
+    """How many points of a series span one year, from its median spacing"""
+    timestamps = np.asarray(timestamps)
+    if timestamps.shape[-1] < 2:
+        return None
+    step = float(np.median(np.diff(timestamps, axis=-1)))
+    return int(round(SECONDS_PER_YEAR / step)) if step > 0 else None
+
+
+def trend_slope(values, timestamps):
+    """Least-squares slope of each series, in interest points per year"""
+    values = np.asarray(values, dtype=np.float64)
+    timestamps = np.broadcast_to(np.asarray(timestamps, dtype=np.float64), values.shape)
+    centered_t = timestamps - timestamps.mean(axis=1, keepdims=True)
+    centered_v = values - values.mean(axis=1, keepdims=True)
+    spread = (centered_t * centered_t).sum(axis=1)
+    slope = np.divide((centered_t * centered_v).sum(axis=1), spread,
+                      out=np.full(values.shape[0], np.nan), where=spread > 0)
+    return slope * SECONDS_PER_YEAR
+
+
+def robust_zscores(values, window, last=None, mad_floor=1.0):
+    """Rolling median/MAD z-score of each point against the `window` points before it
+
+    Only the final `last` points are scored when given (NaN elsewhere),
+    which keeps a corpus-wide alerting pass proportional to series count.
+    MAD is floored at `mad_floor` interest points so a flat baseline
+    (often all zeros) does not turn any change into an infinite score.
+    Returns (scores, baseline medians), both shaped like values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    points = values.shape[1]
+    scores = np.full(values.shape, np.nan)
+    medians = np.full(values.shape, np.nan)
+    first = window if last is None else max(window, points - last)
+    if points <= first:
+        return scores, medians
+
+    windows = np.lib.stride_tricks.sliding_window_view(values[:, first - window:points - 1], window, axis=1)
+    median = np.median(windows, axis=2)
+    mad = np.median(np.abs(windows - median[..., np.newaxis]), axis=2)
+    scores[:, first:] = MAD_SCALE * (values[:, first:] - median) / np.maximum(mad, mad_floor)
+    medians[:, first:] = median
+    return scores, medians
+
+
+def series_metrics(values, timestamps, window):
+    """Every metric for a (series x points) matrix sharing one length
+
+    Returns a dict of arrays with one entry (or row) per series.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    timestamps = np.broadcast_to(np.asarray(timestamps, dtype=np.int64), values.shape)
+    per_year = points_per_year(timestamps[0]) if len(values) else None
+    return {
+        'rolling_mean': rolling_mean(values, window),
+        'peaks': peak_mask(values),
+        'mean': values.mean(axis=1),
+        'max': values.max(axis=1),
+        'latest': values[:, -1],
+        'period_over_period': period_change(values, window),
+        'year_over_year': (period_change(values, window, per_year) if per_year
+                           else np.full(values.shape[0], np.nan)),
+        'slope_per_year': trend_slope(values, timestamps),
+    }
+
+
+def finite_or_none(value, digits=2):
+    """JSON-friendly float: rounded, with NaN as None"""
+    return None if not np.isfinite(value) else round(float(value), digits)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Anomaly Scanner
+🚨 Periodic robust spike/drop detection over every archived series
+
+Each pass loads the tail of every series in the columnar archive, groups
+them by length and scores the newest points of each group in one
+rolling median/MAD computation. The latest pass is kept in memory for
+/api/trends/anomalies; a background thread repeats it on an interval.
+"""
+
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from analytics import robust_zscores
+
+logger = logging.getLogger(__name__)
+
+ANOMALY_WINDOW = int(os.environ.get('ANOMALY_WINDOW', 12))
+ANOMALY_THRESHOLD = float(os.environ.get('ANOMALY_THRESHOLD', 3.5))
+ANOMALY_RECENT_POINTS = int(os.environ.get('ANOMALY_RECENT_POINTS', 1))
+ANOMALY_SCAN_INTERVAL = int(os.environ.get('ANOMALY_SCAN_INTERVAL', 600))
+
+
+class AnomalyScanner:
+    """Scores the newest points of every archived series against their recent baseline"""
+
+    def __init__(self, archive, window=ANOMALY_WINDOW, threshold=ANOMALY_THRESHOLD,
+                 recent=ANOMALY_RECENT_POINTS, interval=ANOMALY_SCAN_INTERVAL):
+        self.archive = archive
+        self.window = window
+        self.threshold = threshold
+        self.recent = recent
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._result = None
+        self._thread = None
+
+    def scan(self):
+        """One full pass over the archive; returns and keeps the result"""
+        started = time.monotonic()
+        tail = self.window + self.recent
+        timestamps, values = self.archive.columns()
+
+        # Only the last window + recent points of each series matter
+        groups = {}
+        entries = self.archive.entries()
+        for entry in entries:
+            length = min(entry['length'], tail)
+            if length > self.window:
+                groups.setdefault(length, []).append(entry)
+
+        anomalies = []
+        for length, members in groups.items():
+            ends = np.array([entry['offset'] + entry['length'] for entry in members])
+            index = ends[:, np.newaxis] - length + np.arange(length)
+            scores, medians = robust_zscores(values[index], self.window, last=self.recent)
+            rows, cols = np.nonzero(np.abs(np.nan_to_num(scores)) >= self.threshold)
+            for row, col in zip(rows, cols):
+                entry = members[row]
+                anomalies.append({
+                    'keyword': entry['keyword'],
+                    'geo': entry['geo'],
+                    'granularity': entry['granularity'],
+                    'timestamp': int(timestamps[index[row, col]]),
+                    'value': int(values[index[row, col]]),
+                    'baseline': float(medians[row, col]),
+                    'score': round(float(scores[row, col]), 2),
+                    'direction': 'spike' if scores[row, col] > 0 else 'drop'
+                })
+
+        anomalies.sort(key=lambda anomaly: -abs(anomaly['score']))
+        result = {
+            'scanned_at': int(time.time()),
+            'series': len(entries),
+            'elapsed_ms': round((time.monotonic() - started) * 1000),
+            'window': self.window,
+            'threshold': self.threshold,
+            'anomalies': anomalies
+        }
+        with self._lock:
+            self._result = result
+        logger.info(f"Anomaly scan: {len(anomalies)} anomalies in {len(entries)} series "
+                    f"({result['elapsed_ms']}ms)")
+        return result
+
+    def latest(self):
+        """Result of the most recent pass, scanning now if none has run yet
+
+        Also starts the background rescans on first use.
+        """
+        self._ensure_started()
+        with self._lock:
+            result = self._result
+        return result if result is not None else self.scan()
+
+    def run_forever(self, stop_event):
+        """Rescan every `interval` seconds until stop_event is set"""
+        while not stop_event.wait(self.interval):
+            try:
+                self.scan()
+            except Exception as e:
+                logger.warning(f"Anomaly scan failed: {e}")
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self.run_forever, args=(threading.Event(),), name='anomaly-scanner', daemon=True
+                )
+                self._thread.start()
@@ -5,14 +5,44 @@ World Trends Explorer - Backend Server v1.4.0
 NO FAKE DATA - Real API calls only
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import reduce
+import gzip
 import logging
 import os
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 import requests
 import json
 
+from trends_cache import TrendsCache, make_key
+from trends_batch import normalize_batch_item, run_bounded
+from keyword_packing import (
+    MAX_KEYWORDS_PER_CALL, chain_groups, is_packable, pack_entries, parse_packed_timeline,
+    parse_region_breakdown, split_packed_result, stitch_groups, stitch_region_groups
+)
+from timeseries import (
+    align_series, infer_granularity, lttb_indices, point_timestamp, series_arrays, timeframe_window
+)
+from analytics import default_window, finite_or_none, series_metrics
+from trending import GlobalTrendingAggregate, normalize_query, overlap_matrix, trending_diff
+from snapshot_store import TrendingSnapshotStore
+from export import EXPORT_FORMATS, EXPORT_MIMETYPES, export_writer, format_available as export_format_available
+from response_formats import (
+    MSGPACK_MIMETYPE, RESPONSE_FORMATS, columnar_matrix, columnar_series, format_available, pack_msgpack
+)
+from broadcaster import TrendingBroadcaster
+from series_archive import SeriesArchive, archive_keyword
+from anomalies import AnomalyScanner
+from correlation import CORRELATION_METHODS, correlation_matrix
+from similarity import SimilarityIndex, shape_vectors
+from forecasting import (
+    FORECAST_METHODS, INTERVAL_Z, fit, forecast_from_state, season_length, stack_states, state_row
+)
+import numpy as np
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)
@@ -28,6 +58,21 @@ logger = logging.getLogger(__name__)
 SERPAPI_KEY = os.environ.get('SERPAPI_KEY', '')
 SERPAPI_BASE_URL = "https://serpapi.com/search"
 
+# Upstream concurrency and batch limits
+UPSTREAM_CONCURRENCY = int(os.environ.get('UPSTREAM_CONCURRENCY', 4))
+FORECAST_MAX_HORIZON = 52
+ANALYTICS_MAX_ITEMS = int(os.environ.get('ANALYTICS_MAX_ITEMS', 5000))
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 500))
+EXPORT_MAX_ITEMS = int(os.environ.get('EXPORT_MAX_ITEMS', 10000))
+COMPARE_MAX_KEYWORDS = int(os.environ.get('COMPARE_MAX_KEYWORDS', 50))
+CORRELATE_MAX_KEYWORDS = 200
+CORRELATE_MAX_LAG = 52
+COMPARE_MAX_GEOS = int(os.environ.get('COMPARE_MAX_GEOS', 25))
+TRENDING_CACHE_TTL = int(os.environ.get('TRENDING_CACHE_TTL', 600))
+TRENDING_STORE_MAX_AGE = int(os.environ.get('TRENDING_STORE_MAX_AGE', 1800))
+PUSH_KEEPALIVE_SECONDS = 15
+COMPRESS_MIN_BYTES = 1024
+
 # Country codes mapping
 COUNTRY_CODES = {
     'US': 'United States',
@@ -84,6 +129,28 @@ class SerpAPIClient:
 # Initialize SerpAPI client
 serpapi_client = SerpAPIClient()
 
+# Shared cache and bounded executor for upstream calls
+trends_cache = TrendsCache.from_env()
+upstream_executor = ThreadPoolExecutor(max_workers=UPSTREAM_CONCURRENCY, thread_name_prefix='serpapi')
+
+# Global trending view, folded in from per-country snapshots
+global_trending = GlobalTrendingAggregate()
+
+# Persistent history of every trending snapshot
+snapshot_store = TrendingSnapshotStore()
+
+# Columnar archive of every interest_over_time series fetched upstream
+series_archive = SeriesArchive()
+
+# Periodic spike/drop detection over the archive
+anomaly_scanner = AnomalyScanner(series_archive)
+
+# Shape-similarity search over the archive
+similarity_index = SimilarityIndex(series_archive)
+
+# Push fan-out of trending updates (Redis pub/sub between workers when configured)
+trending_broadcaster = TrendingBroadcaster(redis_client=trends_cache.redis, store=snapshot_store)
+
 @app.route('/api/trends/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -94,9 +161,232 @@ def health_check():
         'version': '1.4.0',
         'data_source': 'SerpAPI',
         'api_key_configured': bool(SERPAPI_KEY),
+        'cache': trends_cache.stats(),
+        'archive': series_archive.stats(),
         'message': 'SerpAPI key required for real data' if not SERPAPI_KEY else 'Ready'
     })
 
+def build_trends_params(keyword, geo, data_type, timeframe='today 12-m'):
+    """Build SerpAPI google_trends parameters for one data type"""
+    return {
+        'engine': 'google_trends',
+        'q': keyword,
+        'geo': geo,
+        'date': timeframe,
+        'data_type': data_type,
+        'tz': '360'
+    }
+
+def archive_series(keyword, geo, interest_over_time):
+    """Keep a freshly fetched series in the columnar archive; never fails the request"""
+    try:
+        series_archive.store(keyword, geo, interest_over_time)
+    except Exception as e:
+        logger.warning(f"Failed to archive series for '{keyword}' in {geo}: {e}")
+
+def fetch_interest_over_time(keyword, geo, timeframe='today 12-m'):
+    """Fetch REAL interest over time (TIMESERIES leg)"""
+    result = serpapi_client.make_request(build_trends_params(keyword, geo, 'TIMESERIES', timeframe))
+    
+    interest_over_time = []
+    if 'interest_over_time' in result and 'timeline_data' in result['interest_over_time']:
+        for point in result['interest_over_time']['timeline_data']:
+            interest_over_time.append({
+                'date': point.get('date', ''),
+                'timestamp': point_timestamp(point),
+                'value': point['values'][0]['extracted_value'] if point.get('values') else 0
+            })
+    archive_series(keyword, geo, interest_over_time)
+    return interest_over_time
+
+def fetch_interest_by_region(keyword, geo, timeframe='today 12-m'):
+    """Fetch REAL interest by region (GEO_MAP leg)"""
+    result = serpapi_client.make_request(build_trends_params(keyword, geo, 'GEO_MAP', timeframe))
+    
+    interest_by_region = []
+    if 'interest_by_region' in result:
+        for region in result['interest_by_region']:
+            interest_by_region.append({
+                'geoName': region.get('location', ''),
+                'geoCode': region.get('location_code', ''),
+                'value': region.get('extracted_value', 0)
+            })
+    return interest_by_region
+
+def fetch_related_queries(keyword, geo, timeframe='today 12-m'):
+    """Fetch REAL related queries (RELATED_QUERIES leg)"""
+    result = serpapi_client.make_request(build_trends_params(keyword, geo, 'RELATED_QUERIES', timeframe))
+    
+    related_queries = {'top': [], 'rising': []}
+    if 'related_queries' in result:
+        if 'top' in result['related_queries']:
+            related_queries['top'] = [
+                {'query': q.get('query', ''), 'value': str(q.get('extracted_value', ''))}
+                for q in result['related_queries']['top']
+            ]
+        if 'rising' in result['related_queries']:
+            related_queries['rising'] = [
+                {'query': q.get('query', ''), 'value': q.get('extracted_value', 'Rising')}
+                for q in result['related_queries']['rising']
+            ]
+    return related_queries
+
+# Search legs: (response field, fetcher, empty value, required)
+# A required leg failing fails the whole search; optional legs degrade to empty.
+SEARCH_LEGS = (
+    ('interest_over_time', fetch_interest_over_time, list, True),
+    ('interest_by_region', fetch_interest_by_region, list, False),
+    ('related_queries', fetch_related_queries, lambda: {'top': [], 'rising': []}, False),
+)
+LEG_FETCHERS = {field: fetcher for field, fetcher, empty, required in SEARCH_LEGS}
+
+def leg_key(field, keyword, geo, timeframe):
+    """Cache key for one search leg"""
+    return make_key('leg', field, geo, timeframe, keyword.lower())
+
+def fetch_leg(field, keyword, geo, timeframe='today 12-m'):
+    """Fetch one search leg through the shared cache, returning (data, cached)"""
+    return trends_cache.get_or_fetch(
+        leg_key(field, keyword, geo, timeframe),
+        lambda: LEG_FETCHERS[field](keyword, geo, timeframe)
+    )
+
+def fetch_timeseries_packed(keywords, geo, timeframe='today 12-m'):
+    """Fetch up to five keywords' TIMESERIES in one call and cache each series
+
+    Series are rescaled as if fetched alone; any too coarse to rescale are
+    left uncached so the normal per-keyword leg fetches them.
+    """
+    result = serpapi_client.make_request(
+        build_trends_params(','.join(keywords), geo, 'TIMESERIES', timeframe)
+    )
+    series, coarse = split_packed_result(result, keywords)
+    for keyword, interest_over_time in series.items():
+        trends_cache.set(leg_key('interest_over_time', keyword, geo, timeframe), interest_over_time)
+        archive_series(keyword, geo, interest_over_time)
+    if coarse:
+        logger.info(f"Re-fetching coarse packed series alone: {coarse}")
+    return series
+
+def run_batch_item(item):
+    """Fetch every requested field of one normalized batch item"""
+    result = {'keyword': item['keyword'], 'geo': item['geo'], 'timeframe': item['timeframe']}
+    cached = True
+    for field in item['fields']:
+        result[field], hit = fetch_leg(field, item['keyword'], item['geo'], item['timeframe'])
+        cached = cached and hit
+    result['cached'] = cached
+    return result
+
+def cached_batch_item(item):
+    """Serve a batch item entirely from cache, or None if any field is missing"""
+    result = {'keyword': item['keyword'], 'geo': item['geo'], 'timeframe': item['timeframe']}
+    for field in item['fields']:
+        value = trends_cache.get(leg_key(field, item['keyword'], item['geo'], item['timeframe']))
+        if value is None:
+            return None
+        result[field] = value
+    result['cached'] = True
+    return result
+
+def pack_batch_items(entries):
+    """Split (index, item) entries into work units for the upstream executor
+
+    Items needing an uncached TIMESERIES leg are packed up to five distinct
+    keywords per unit for the same geo and timeframe; the rest run alone.
+    """
+    units = []
+    packable = {}
+    for index, item in entries:
+        if ('interest_over_time' in item['fields'] and is_packable(item['keyword'])
+                and trends_cache.get(leg_key('interest_over_time', item['keyword'],
+                                             item['geo'], item['timeframe'])) is None):
+            packable.setdefault((item['geo'], item['timeframe']), []).append((index, item))
+        else:
+            units.append([(index, item)])
+    
+    for group in packable.values():
+        units.extend(pack_entries(group, lambda entry: entry[1]['keyword'], MAX_KEYWORDS_PER_CALL))
+    return units
+
+def run_batch_unit(unit):
+    """Run one work unit, returning (index, result, error) for each of its items"""
+    packed = set()
+    keywords = list({item['keyword'].lower(): item['keyword'] for _, item in unit
+                     if 'interest_over_time' in item['fields']}.values())
+    if len(keywords) > 1:
+        geo, timeframe = unit[0][1]['geo'], unit[0][1]['timeframe']
+        try:
+            packed = {keyword.lower() for keyword in fetch_timeseries_packed(keywords, geo, timeframe)}
+        except Exception as e:
+            logger.warning(f"Packed fetch failed, fetching alone: {e}")
+    
+    outcomes = []
+    for index, item in unit:
+        try:
+            result = run_batch_item(item)
+            if item['keyword'].lower() in packed:
+                result['cached'] = False
+                result['packed'] = True
+            outcomes.append((index, result, None))
+        except Exception as e:
+            outcomes.append((index, item, e))
+    return outcomes
+
+def validate_search_args(keyword):
+    """Return an error response tuple for invalid search input, or None"""
+    if not keyword:
+        return jsonify({'error': 'Keyword parameter is required'}), 400
+        
+    if not SERPAPI_KEY:
+        return jsonify({'error': 'SerpAPI key not configured. Please set SERPAPI_KEY environment variable.'}), 503
+    
+    return None
+
+def format_sse(event, payload):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def parse_points(value):
+    """Requested maximum points for LTTB downsampling, or None when not given"""
+    if value in (None, ''):
+        return None
+    try:
+        points = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('points must be an integer')
+    if points < 3:
+        raise ValueError('points must be at least 3')
+    return points
+
+def response_format(value):
+    """(format, error response) for the requested timeseries layout
+
+    json keeps row-per-point arrays; columnar and msgpack (columnar, binary)
+    send one date array plus one value array per series.
+    """
+    fmt = (value or 'json').lower()
+    if fmt not in RESPONSE_FORMATS:
+        return None, (jsonify({'error': f"format must be one of: {', '.join(RESPONSE_FORMATS)}"}), 400)
+    if not format_available(fmt):
+        return None, (jsonify({'error': f'{fmt} output is not available on this server'}), 501)
+    return fmt, None
+
+def formatted_response(payload, fmt):
+    """jsonify the payload, or pack it when MessagePack was requested"""
+    if fmt == 'msgpack':
+        return Response(pack_msgpack(payload), mimetype=MSGPACK_MIMETYPE)
+    return jsonify(payload)
+
+def downsampled_indices(key, values, points):
+    """Cached LTTB positions for a (series x length) matrix
+
+    The key should identify the full series it was computed from, so a
+    refreshed series gets fresh positions.
+    """
+    indices, _ = trends_cache.get_or_fetch(key, lambda: lttb_indices(values, points).tolist())
+    return indices
+
 @app.route('/api/trends/search', methods=['GET'])
 def search_trends():
     """Search trends using REAL SerpAPI data"""
@@ -105,87 +395,709 @@ def search_trends():
         geo = request.args.get('geo', 'US')
         timeframe = request.args.get('timeframe', 'today 12-m')
         
-        if not keyword:
-            return jsonify({'error': 'Keyword parameter is required'}), 400
-            
-        if not SERPAPI_KEY:
-            return jsonify({'error': 'SerpAPI key not configured. Please set SERPAPI_KEY environment variable.'}), 503
+        try:
+            points = parse_points(request.args.get('points'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        fmt, error_response = response_format(request.args.get('format'))
+        if error_response:
+            return error_response
+        
+        error_response = validate_search_args(keyword)
+        if error_response:
+            return error_response
             
         logger.info(f"Searching trends: '{keyword}' in {geo}")
         
-        # REAL SerpAPI request
-        params = {
-            'engine': 'google_trends',
-            'q': keyword,
+        # Format REAL response
+        response_data = {
+            'keyword': keyword,
             'geo': geo,
-            'data_type': 'TIMESERIES',
-            'tz': '360'
+            'timeframe': timeframe,
+            'timestamp': datetime.now().isoformat(),
+            'data_source': 'SerpAPI'
         }
         
-        result = serpapi_client.make_request(params)
+        # Each leg is a separate API call
+        for field, fetcher, empty, required in SEARCH_LEGS:
+            try:
+                response_data[field], _ = fetch_leg(field, keyword, geo, timeframe)
+            except Exception as e:
+                if required:
+                    raise
+                logger.warning(f"Failed to get {field}: {e}")
+                response_data[field] = empty()
         
-        # Format REAL response
-        response_data = {
+        series = response_data['interest_over_time']
+        if points and len(series) > points:
+            kept = downsampled_indices(
+                make_key('lttb', points, len(series), series[-1]['date'],
+                         leg_key('interest_over_time', keyword, geo, timeframe)),
+                [[point['value'] for point in series]], points
+            )
+            response_data['interest_over_time'] = [series[index] for index in kept]
+            response_data['original_points'] = len(series)
+        
+        if fmt != 'json':
+            response_data['interest_over_time'] = columnar_series(response_data['interest_over_time'], keyword)
+            response_data['format'] = 'columnar'
+        
+        return formatted_response(response_data, fmt)
+        
+    except Exception as e:
+        logger.error(f"Error in search_trends: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/search/stream', methods=['GET'])
+def search_trends_stream():
+    """Stream search legs as Server-Sent Events as each one completes"""
+    keyword = request.args.get('keyword', '').strip()
+    geo = request.args.get('geo', 'US')
+    timeframe = request.args.get('timeframe', 'today 12-m')
+    
+    error_response = validate_search_args(keyword)
+    if error_response:
+        return error_response
+        
+    logger.info(f"Streaming trends: '{keyword}' in {geo}")
+    
+    def generate():
+        started = time.monotonic()
+        legs = {}
+        
+        futures = {
+            upstream_executor.submit(fetch_leg, field, keyword, geo, timeframe): (field, empty)
+            for field, fetcher, empty, required in SEARCH_LEGS
+        }
+        for future in as_completed(futures):
+            field, empty = futures[future]
+            try:
+                data, _ = future.result()
+                legs[field] = 'ok'
+                yield format_sse(field, {'keyword': keyword, 'geo': geo, field: data})
+            except Exception as e:
+                logger.warning(f"Failed to get {field}: {e}")
+                legs[field] = 'error'
+                yield format_sse(field, {'keyword': keyword, 'geo': geo, field: empty(), 'error': str(e)})
+        
+        yield format_sse('summary', {
             'keyword': keyword,
             'geo': geo,
             'timeframe': timeframe,
             'timestamp': datetime.now().isoformat(),
             'data_source': 'SerpAPI',
-            'interest_over_time': [],
-            'interest_by_region': [],
-            'related_queries': {'top': [], 'rising': []}
+            'legs': legs,
+            'elapsed_ms': round((time.monotonic() - started) * 1000)
+        })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/trends/batch', methods=['POST'])
+def batch_trends():
+    """Run many keyword/geo lookups, streaming NDJSON lines as each finishes"""
+    data = request.get_json(silent=True) or {}
+    items = data.get('items')
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'A non-empty items list is required'}), 400
+        
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({'error': f'Maximum {BATCH_MAX_ITEMS} items allowed'}), 400
+        
+    if not SERPAPI_KEY:
+        return jsonify({'error': 'SerpAPI key not configured. Please set SERPAPI_KEY environment variable.'}), 503
+    
+    logger.info(f"Batch of {len(items)} items")
+    
+    def generate():
+        started = time.monotonic()
+        counts = {'ok': 0, 'error': 0, 'cached': 0}
+        
+        def line(payload):
+            counts[payload['status']] += 1
+            if payload.get('cached'):
+                counts['cached'] += 1
+            return json.dumps(payload) + '\n'
+        
+        # Invalid and fully cached items are answered without touching the executor
+        upstream = []
+        for index, raw in enumerate(items):
+            try:
+                item = normalize_batch_item(raw)
+            except ValueError as e:
+                yield line({'index': index, 'status': 'error', 'error': str(e)})
+                continue
+            
+            result = cached_batch_item(item)
+            if result is not None:
+                yield line({'index': index, 'status': 'ok', **result})
+            else:
+                upstream.append((index, item))
+        
+        # Remaining items are packed into units that fan out with at most
+        # 2x concurrency in flight
+        units = pack_batch_items(upstream)
+        for position, future in run_bounded(units, run_batch_unit, upstream_executor,
+                                            UPSTREAM_CONCURRENCY * 2):
+            try:
+                outcomes = future.result()
+            except Exception as e:
+                outcomes = [(index, item, e) for index, item in units[position]]
+            for index, result, error in outcomes:
+                if error is None:
+                    yield line({'index': index, 'status': 'ok', **result})
+                else:
+                    logger.warning(f"Batch item {index} failed: {error}")
+                    yield line({'index': index, 'status': 'error', 'keyword': result['keyword'],
+                                'geo': result['geo'], 'error': str(error)})
+        
+        yield json.dumps({
+            'status': 'summary',
+            'total': len(items),
+            'ok': counts['ok'],
+            'error': counts['error'],
+            'cached': counts['cached'],
+            'elapsed_ms': round((time.monotonic() - started) * 1000)
+        }) + '\n'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/trends/export', methods=['POST'])
+def export_trends():
+    """Stream interest over time for many keyword/geo items as CSV or Parquet
+
+    Stored series (cache, then archive) are written first, in request
+    order, one series at a time. Up to BATCH_MAX_ITEMS misses then go
+    through the batch engine and are written as each unit finishes.
+    Items that fail become rows carrying only an error.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('items')
+    fmt = str(data.get('format') or 'csv').lower()
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'A non-empty items list is required'}), 400
+        
+    if len(items) > EXPORT_MAX_ITEMS:
+        return jsonify({'error': f'Maximum {EXPORT_MAX_ITEMS} items allowed'}), 400
+        
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        
+    if not export_format_available(fmt):
+        return jsonify({'error': f'{fmt} export is not available on this server'}), 501
+    
+    logger.info(f"Export of {len(items)} items as {fmt}")
+    
+    def generate():
+        writer = export_writer(fmt)
+        
+        def chunks():
+            yield writer.header()
+            misses = []
+            for raw in items:
+                try:
+                    item = normalize_batch_item(raw)
+                except ValueError as e:
+                    keyword = str(raw.get('keyword', '')) if isinstance(raw, dict) else ''
+                    yield writer.add_error({'keyword': keyword, 'geo': '', 'timeframe': ''}, str(e))
+                    continue
+                item['fields'] = ['interest_over_time']
+                
+                stored = stored_series_arrays(item['keyword'], item['geo'], item['timeframe'])
+                if stored is not None:
+                    yield writer.add_series(item, *stored)
+                elif not SERPAPI_KEY:
+                    yield writer.add_error(item, 'Not stored and SerpAPI key not configured')
+                elif len(misses) >= BATCH_MAX_ITEMS:
+                    yield writer.add_error(item, f'Not stored; only {BATCH_MAX_ITEMS} items are fetched per export')
+                else:
+                    misses.append((len(misses), item))
+            
+            units = pack_batch_items(misses)
+            for position, future in run_bounded(units, run_batch_unit, upstream_executor,
+                                                UPSTREAM_CONCURRENCY * 2):
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    outcomes = [(index, item, e) for index, item in units[position]]
+                for _, result, error in outcomes:
+                    if error is None:
+                        yield writer.add_series(result, *series_arrays(result['interest_over_time']))
+                    else:
+                        logger.warning(f"Export of '{result['keyword']}' failed: {error}")
+                        yield writer.add_error(result, str(error))
+            
+            yield from writer.close()
+        
+        for chunk in chunks():
+            if chunk:
+                yield chunk
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={
+            'Content-Disposition': f'attachment; filename=trends-export.{fmt}',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
         }
+    )
+
+def archived_series_arrays(keyword, geo, timeframe='today 12-m'):
+    """(timestamps, values) of an archived series spanning the timeframe's window, or None
+
+    The archive is not keyed by timeframe; a series archived for another
+    window (or too long ago) does not count, nor does any series for a
+    timeframe whose window cannot be worked out.
+    """
+    window = timeframe_window(timeframe)
+    if window is None:
+        return None
+    return series_archive.load_window(keyword, geo, *window)
+
+def stored_series_arrays(keyword, geo, timeframe='today 12-m'):
+    """(timestamps, values) for a series from the cache, else the archive, else None
+
+    Never calls upstream.
+    """
+    series = trends_cache.get(leg_key('interest_over_time', keyword, geo, timeframe))
+    if series is not None:
+        return series_arrays(series)
+    return archived_series_arrays(keyword, geo, timeframe)
+
+def analytics_summary(metrics, row):
+    """Per-series scalar metrics from a series_metrics result"""
+    return {
+        'mean': finite_or_none(metrics['mean'][row]),
+        'max': finite_or_none(metrics['max'][row]),
+        'latest': finite_or_none(metrics['latest'][row]),
+        'rolling_mean_latest': finite_or_none(metrics['rolling_mean'][row][-1]),
+        'peak_count': int(metrics['peaks'][row].sum()),
+        'period_over_period': finite_or_none(metrics['period_over_period'][row]),
+        'year_over_year': finite_or_none(metrics['year_over_year'][row]),
+        'slope_per_year': finite_or_none(metrics['slope_per_year'][row])
+    }
+
+@app.route('/api/trends/analytics', methods=['GET'])
+def get_analytics():
+    """Get derived metrics for one keyword's REAL interest over time"""
+    try:
+        keyword = request.args.get('keyword', '').strip()
+        geo = request.args.get('geo', 'US')
+        timeframe = request.args.get('timeframe', 'today 12-m')
+        window = request.args.get('window', type=int)
         
-        # Process REAL data
-        if 'interest_over_time' in result and 'timeline_data' in result['interest_over_time']:
-            for point in result['interest_over_time']['timeline_data']:
-                response_data['interest_over_time'].append({
-                    'date': point.get('date', ''),
-                    'value': point['values'][0]['extracted_value'] if point.get('values') else 0
-                })
+        error_response = validate_search_args(keyword)
+        if error_response:
+            return error_response
         
-        # Get regional data - separate API call
-        regional_params = params.copy()
-        regional_params['data_type'] = 'GEO_MAP'
+        series, cached = fetch_leg('interest_over_time', keyword, geo, timeframe)
+        timestamps, values = series_arrays(series)
+        if not len(timestamps):
+            return jsonify({'error': f"No interest over time data for '{keyword}'"}), 404
         
-        try:
-            regional_result = serpapi_client.make_request(regional_params)
-            if 'interest_by_region' in regional_result:
-                for region in regional_result['interest_by_region']:
-                    response_data['interest_by_region'].append({
-                        'geoName': region.get('location', ''),
-                        'geoCode': region.get('location_code', ''),
-                        'value': region.get('extracted_value', 0)
-                    })
-        except Exception as e:
-            logger.warning(f"Failed to get regional data: {e}")
+        granularity = infer_granularity(timestamps)
+        window = min(max(window or default_window(granularity), 1), len(values))
+        metrics = series_metrics(values[np.newaxis, :], timestamps, window)
+        rolling = metrics['rolling_mean'][0]
         
-        # Get related queries - separate API call
-        related_params = params.copy()
-        related_params['data_type'] = 'RELATED_QUERIES'
+        return jsonify({
+            'keyword': keyword,
+            'geo': geo,
+            'timeframe': timeframe,
+            'granularity': granularity,
+            'window': window,
+            'cached': cached,
+            'data_source': 'SerpAPI',
+            'series': [
+                {'timestamp': int(ts), 'value': int(value), 'rolling_mean': finite_or_none(mean)}
+                for ts, value, mean in zip(timestamps, values, rolling)
+            ],
+            'peaks': [
+                {'timestamp': int(timestamps[i]), 'value': int(values[i])}
+                for i in np.flatnonzero(metrics['peaks'][0])
+            ],
+            **analytics_summary(metrics, 0)
+        })
         
-        try:
-            related_result = serpapi_client.make_request(related_params)
-            if 'related_queries' in related_result:
-                if 'top' in related_result['related_queries']:
-                    response_data['related_queries']['top'] = [
-                        {'query': q.get('query', ''), 'value': str(q.get('extracted_value', ''))}
-                        for q in related_result['related_queries']['top']
-                    ]
-                if 'rising' in related_result['related_queries']:
-                    response_data['related_queries']['rising'] = [
-                        {'query': q.get('query', ''), 'value': q.get('extracted_value', 'Rising')}
-                        for q in related_result['related_queries']['rising']
-                    ]
-        except Exception as e:
-            logger.warning(f"Failed to get related queries: {e}")
+    except Exception as e:
+        logger.error(f"Error in get_analytics: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/analytics', methods=['POST'])
+def batch_analytics():
+    """Get summary metrics for many cached or archived series at once
+
+    Never calls upstream: items with no stored series are listed as missing.
+    Series of equal length and window are computed as one matrix.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        items = data.get('items')
+        window = data.get('window')
         
-        return jsonify(response_data)
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'A non-empty items list is required'}), 400
+            
+        if len(items) > ANALYTICS_MAX_ITEMS:
+            return jsonify({'error': f'Maximum {ANALYTICS_MAX_ITEMS} items allowed'}), 400
+        
+        started = time.monotonic()
+        results = [None] * len(items)
+        groups = {}
+        for index, raw in enumerate(items):
+            try:
+                item = normalize_batch_item(raw)
+            except ValueError as e:
+                results[index] = {'index': index, 'status': 'error', 'error': str(e)}
+                continue
+            
+            stored = stored_series_arrays(item['keyword'], item['geo'], item['timeframe'])
+            if stored is None or not len(stored[0]):
+                results[index] = {'index': index, 'status': 'missing',
+                                  'keyword': item['keyword'], 'geo': item['geo']}
+                continue
+            
+            timestamps, values = stored
+            item_window = min(max(int(window or default_window(infer_granularity(timestamps))), 1), len(values))
+            groups.setdefault((len(values), item_window), []).append((index, item, timestamps, values))
+        
+        for (length, item_window), members in groups.items():
+            metrics = series_metrics(
+                np.stack([values for _, _, _, values in members]),
+                np.stack([timestamps for _, _, timestamps, _ in members]),
+                item_window
+            )
+            for row, (index, item, _, _) in enumerate(members):
+                results[index] = {
+                    'index': index,
+                    'status': 'ok',
+                    'keyword': item['keyword'],
+                    'geo': item['geo'],
+                    'window': item_window,
+                    **analytics_summary(metrics, row)
+                }
+        
+        return jsonify({
+            'data_source': 'SerpAPI (stored)',
+            'results': results,
+            'elapsed_ms': round((time.monotonic() - started) * 1000)
+        })
         
     except Exception as e:
-        logger.error(f"Error in search_trends: {e}")
+        logger.error(f"Error in batch_analytics: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/anomalies', methods=['GET'])
+def get_anomalies():
+    """Get spikes and drops found by the latest scan of archived series"""
+    try:
+        geo = request.args.get('geo') or None
+        keyword = (request.args.get('keyword') or '').strip().lower() or None
+        direction = request.args.get('direction') or None
+        min_score = request.args.get('min_score', 0, type=float)
+        limit = min(max(request.args.get('limit', 100, type=int), 1), 1000)
+        
+        if direction not in (None, 'spike', 'drop'):
+            return jsonify({'error': 'direction must be spike or drop'}), 400
+        
+        # No upstream calls: the scan reads only the archive
+        scan = anomaly_scanner.latest()
+        anomalies = [
+            anomaly for anomaly in scan['anomalies']
+            if (geo is None or anomaly['geo'] == geo)
+            and (keyword is None or anomaly['keyword'] == keyword)
+            and (direction is None or anomaly['direction'] == direction)
+            and abs(anomaly['score']) >= min_score
+        ]
+        
+        return jsonify({
+            'data_source': 'SerpAPI (archived)',
+            'scanned_at': scan['scanned_at'],
+            'series_scanned': scan['series'],
+            'window': scan['window'],
+            'threshold': scan['threshold'],
+            'total': len(anomalies),
+            'anomalies': anomalies[:limit]
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_anomalies: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def forecast_args(args):
+    """(method, horizon, level) from request args, or an error response tuple"""
+    method = args.get('method') or 'holt_winters'
+    horizon = args.get('horizon') or 8
+    level = args.get('level') or 95
+    try:
+        horizon, level = int(horizon), int(level)
+    except (TypeError, ValueError):
+        return None, (jsonify({'error': 'horizon and level must be integers'}), 400)
+    if method not in FORECAST_METHODS:
+        return None, (jsonify({'error': f"method must be one of: {', '.join(FORECAST_METHODS)}"}), 400)
+    if not 1 <= horizon <= FORECAST_MAX_HORIZON:
+        return None, (jsonify({'error': f'horizon must be from 1 to {FORECAST_MAX_HORIZON}'}), 400)
+    if level not in INTERVAL_Z:
+        return None, (jsonify({'error': f"level must be one of: {', '.join(map(str, INTERVAL_Z))}"}), 400)
+    return (method, horizon, level), None
+
+def forecast_key(method, keyword, geo, timestamps):
+    """Cache key for a fitted model: refits whenever the series gains or changes points"""
+    return make_key('forecast', method, geo, keyword.lower(), int(timestamps[-1]), len(timestamps))
+
+def forecast_points(timestamps, forecast, lower, upper):
+    """Forecast rows continuing the series' median spacing"""
+    step = int(np.median(np.diff(timestamps)))
+    return [
+        {'timestamp': int(timestamps[-1]) + step * (h + 1),
+         'value': round(float(value), 1), 'lower': round(float(low), 1), 'upper': round(float(high), 1)}
+        for h, (value, low, high) in enumerate(zip(forecast, lower, upper))
+    ]
+
+@app.route('/api/trends/forecast', methods=['GET'])
+def get_forecast():
+    """Forecast a keyword's REAL interest over time a few points ahead"""
+    try:
+        keyword = request.args.get('keyword', '').strip()
+        geo = request.args.get('geo', 'US')
+        timeframe = request.args.get('timeframe', 'today 12-m')
+        
+        options, error_response = forecast_args(request.args)
+        if error_response:
+            return error_response
+        method, horizon, level = options
+        
+        error_response = validate_search_args(keyword)
+        if error_response:
+            return error_response
+        
+        timestamps, values = series_arrays(fetch_leg('interest_over_time', keyword, geo, timeframe)[0])
+        if len(timestamps) < 3:
+            return jsonify({'error': f"Not enough interest over time data to forecast '{keyword}'"}), 422
+        
+        granularity = infer_granularity(timestamps)
+        season = season_length(granularity, len(values))
+        state, cached_model = trends_cache.get_or_fetch(
+            forecast_key(method, keyword, geo, timestamps),
+            lambda: state_row(fit(values[np.newaxis, :], method, season), 0)
+        )
+        forecast, lower, upper = forecast_from_state(stack_states([state]), horizon, level)
+        
+        return jsonify({
+            'keyword': keyword,
+            'geo': geo,
+            'timeframe': timeframe,
+            'method': method,
+            'granularity': granularity,
+            'season': season,
+            'level': level,
+            'cached_model': cached_model,
+            'data_source': 'SerpAPI',
+            'forecast': forecast_points(timestamps, forecast[0], lower[0], upper[0])
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_forecast: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/forecast', methods=['POST'])
+def batch_forecast():
+    """Forecast many cached or archived series, fitting uncached models together
+
+    Never calls upstream: items with no stored series are listed as missing.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        items = data.get('items')
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'A non-empty items list is required'}), 400
+            
+        if len(items) > ANALYTICS_MAX_ITEMS:
+            return jsonify({'error': f'Maximum {ANALYTICS_MAX_ITEMS} items allowed'}), 400
+        
+        options, error_response = forecast_args(data)
+        if error_response:
+            return error_response
+        method, horizon, level = options
+        
+        started = time.monotonic()
+        results = [None] * len(items)
+        ready = []       # (index, item, timestamps, state)
+        unfitted = {}    # (length, season) -> [(index, item, timestamps, values, key)]
+        for index, raw in enumerate(items):
+            try:
+                item = normalize_batch_item(raw)
+            except ValueError as e:
+                results[index] = {'index': index, 'status': 'error', 'error': str(e)}
+                continue
+            
+            stored = stored_series_arrays(item['keyword'], item['geo'], item['timeframe'])
+            if stored is None or len(stored[0]) < 3:
+                results[index] = {'index': index, 'status': 'missing',
+                                  'keyword': item['keyword'], 'geo': item['geo']}
+                continue
+            
+            timestamps, values = stored
+            key = forecast_key(method, item['keyword'], item['geo'], timestamps)
+            state = trends_cache.get(key)
+            if state is not None:
+                ready.append((index, item, timestamps, state))
+            else:
+                season = season_length(infer_granularity(timestamps), len(values))
+                unfitted.setdefault((len(values), season), []).append((index, item, timestamps, values, key))
+        
+        # Equal-length series sharing a season are fitted as one matrix
+        fitted = 0
+        for (length, season), members in unfitted.items():
+            states = fit(np.stack([values for _, _, _, values, _ in members]), method, season)
+            for row, (index, item, timestamps, _, key) in enumerate(members):
+                state = state_row(states, row)
+                trends_cache.set(key, state)
+                ready.append((index, item, timestamps, state))
+                fitted += 1
+        
+        by_period = {}
+        for entry in ready:
+            by_period.setdefault(len(entry[3]['seasonal']), []).append(entry)
+        for members in by_period.values():
+            forecast, lower, upper = forecast_from_state(stack_states([state for *_, state in members]),
+                                                         horizon, level)
+            for row, (index, item, timestamps, state) in enumerate(members):
+                results[index] = {
+                    'index': index,
+                    'status': 'ok',
+                    'keyword': item['keyword'],
+                    'geo': item['geo'],
+                    'season': state['season'],
+                    'forecast': forecast_points(timestamps, forecast[row], lower[row], upper[row])
+                }
+        
+        return jsonify({
+            'method': method,
+            'level': level,
+            'horizon': horizon,
+            'data_source': 'SerpAPI (stored)',
+            'models_fitted': fitted,
+            'results': results,
+            'elapsed_ms': round((time.monotonic() - started) * 1000)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in batch_forecast: {e}")
         return jsonify({'error': str(e)}), 500
 
+def fetch_trending(geo):
+    """Fetch REAL trending searches for one country"""
+    params = {
+        'engine': 'google_trends_trending_now',
+        'geo': geo,
+        'hl': 'en'
+    }
+    
+    result = serpapi_client.make_request(params)
+    
+    # Format REAL response
+    response_data = {
+        'geo': geo,
+        'country': COUNTRY_CODES.get(geo, geo),
+        'timestamp': datetime.now().isoformat(),
+        'data_source': 'SerpAPI',
+        'trending_searches': []
+    }
+    
+    # Extract REAL trending searches
+    if 'trending_searches' in result:
+        for idx, search in enumerate(result['trending_searches'][:20]):
+            query = search.get('query', '')
+            response_data['trending_searches'].append({
+                'rank': idx + 1,
+                'query': query,
+                'key': normalize_query(query)
+            })
+    
+    # Keep history; a store failure must not fail the live request.
+    # The snapshot id doubles as the version token for since= diffs.
+    try:
+        response_data['version'] = snapshot_store.record(geo, response_data['trending_searches'])
+    except Exception as e:
+        logger.warning(f"Failed to store trending snapshot for {geo}: {e}")
+        response_data['version'] = None
+    
+    trending_broadcaster.publish(geo, response_data['version'], response_data['trending_searches'])
+    
+    return response_data
+
+def trending_key(geo):
+    """Cache key for one country's trending snapshot"""
+    return make_key('trending', geo)
+
+def load_stored_trending(geo):
+    """Latest stored snapshot for geo in response shape, if fresher than TRENDING_STORE_MAX_AGE"""
+    snapshot = snapshot_store.latest_before(geo, time.time())
+    if snapshot is None or time.time() - snapshot['fetched_at'] > TRENDING_STORE_MAX_AGE:
+        return None
+    return {
+        'geo': geo,
+        'country': COUNTRY_CODES.get(geo, geo),
+        'timestamp': datetime.fromtimestamp(snapshot['fetched_at']).isoformat(),
+        'data_source': 'SerpAPI',
+        'version': snapshot['id'],
+        'trending_searches': snapshot['trending_searches']
+    }
+
+def get_trending_snapshot(geo):
+    """Return one country's trending snapshot, as (data, cached)
+
+    Served from the cache, then from the collector's snapshot store, and
+    only fetched upstream when neither has a fresh copy.
+    """
+    key = trending_key(geo)
+    snapshot = trends_cache.get(key)
+    if snapshot is None:
+        snapshot = load_stored_trending(geo)
+        if snapshot is None:
+            snapshot = fetch_trending(geo)
+            trends_cache.set(key, snapshot, TRENDING_CACHE_TTL)
+            return snapshot, False
+        trends_cache.set(key, snapshot, TRENDING_CACHE_TTL)
+    return snapshot, True
+
+def sync_global_trending():
+    """Fold refreshed per-country snapshots into the global aggregate
+
+    Only countries whose cached snapshot changed since the last sync are
+    re-applied; countries whose snapshot expired are dropped.
+    """
+    for geo in COUNTRY_CODES:
+        snapshot = trends_cache.get(trending_key(geo))
+        if snapshot is None:
+            if global_trending.version(geo) is not None:
+                global_trending.remove(geo)
+        elif snapshot['timestamp'] != global_trending.version(geo):
+            global_trending.update(geo, snapshot['trending_searches'], snapshot['timestamp'])
+
+def compressed_jsonify(payload):
+    """jsonify, gzip-compressing large bodies for clients that accept it"""
+    response = jsonify(payload)
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) >= COMPRESS_MIN_BYTES and request.accept_encodings['gzip']:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 @app.route('/api/trends/trending', methods=['GET'])
 def get_trending():
     """Get REAL trending searches"""
@@ -197,30 +1109,27 @@ def get_trending():
             
         logger.info(f"Getting trending for: {geo}")
         
-        # REAL SerpAPI request
-        params = {
-            'engine': 'google_trends_trending_now',
-            'geo': geo,
-            'hl': 'en'
-        }
-        
-        result = serpapi_client.make_request(params)
-        
-        # Format REAL response
-        response_data = {
-            'geo': geo,
-            'country': COUNTRY_CODES.get(geo, geo),
-            'timestamp': datetime.now().isoformat(),
-            'data_source': 'SerpAPI',
-            'trending_searches': []
-        }
+        response_data, _ = get_trending_snapshot(geo)
+        version = response_data.get('version')
+        since = request.args.get('since', type=int)
         
-        # Extract REAL trending searches
-        if 'trending_searches' in result:
-            for idx, search in enumerate(result['trending_searches'][:20]):
-                response_data['trending_searches'].append({
-                    'rank': idx + 1,
-                    'query': search.get('query', '')
+        # Incremental update against a version the client already holds
+        if since is not None and version is not None:
+            if since == version:
+                return '', 304, {'X-Trending-Version': str(version)}
+            previous = snapshot_store.get_snapshot(since)
+            if previous is not None and previous['geo'] == geo:
+                changes = trending_diff(previous['trending_searches'], response_data['trending_searches'])
+                if not any(changes.values()):
+                    return '', 304, {'X-Trending-Version': str(version)}
+                return jsonify({
+                    'geo': geo,
+                    'country': response_data['country'],
+                    'timestamp': response_data['timestamp'],
+                    'data_source': response_data['data_source'],
+                    'version': version,
+                    'since': since,
+                    'changes': changes
                 })
         
         return jsonify(response_data)
@@ -229,6 +1138,114 @@ def get_trending():
         logger.error(f"Error in get_trending: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/trends/trending/movers', methods=['GET'])
+def get_trending_movers():
+    """Get fastest climbers, new entrants and drop-offs from stored snapshots"""
+    try:
+        geo = request.args.get('geo', 'US')
+        hours = min(max(request.args.get('hours', 24, type=int), 1), 24 * 30)
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+        
+        # No upstream calls: computed from the store's rank-change log
+        since = time.time() - hours * 3600
+        geos = list(COUNTRY_CODES) if geo == 'all' else [geo]
+        
+        return jsonify({
+            'timestamp': datetime.now().isoformat(),
+            'data_source': 'SerpAPI (stored)',
+            'hours': hours,
+            'movers': {g: snapshot_store.movers(g, since, limit) for g in geos}
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_trending_movers: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/trending/stream', methods=['GET'])
+def stream_trending():
+    """Push trending updates for the requested geos as Server-Sent Events
+
+    Sends a snapshot event per geo on connect, then a diff event whenever
+    the collector or a worker refreshes one of them. A reset event means
+    the client fell behind and should reconnect.
+    """
+    geos = [g.strip().upper() for g in request.args.get('geos', 'US').split(',') if g.strip()]
+    unknown = [g for g in geos if g not in COUNTRY_CODES]
+    if not geos or unknown:
+        return jsonify({'error': f"Unsupported geos: {', '.join(unknown) or 'none given'}"}), 400
+    
+    def initial(geo):
+        # Never calls upstream: only cached or stored snapshots
+        snapshot = trends_cache.get(trending_key(geo)) or load_stored_trending(geo)
+        return (snapshot.get('version'), snapshot['trending_searches']) if snapshot else None
+    
+    subscription = trending_broadcaster.subscribe(geos, initial)
+    logger.info(f"Trending push subscriber for {geos} ({trending_broadcaster.subscriber_count()} total)")
+    
+    def generate():
+        try:
+            while True:
+                if subscription.overflowed:
+                    yield format_sse('reset', {'reason': 'client too slow'})
+                    return
+                event = subscription.get(timeout=PUSH_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ': keepalive\n\n'
+                    continue
+                yield format_sse(*event)
+        finally:
+            trending_broadcaster.unsubscribe(subscription)
+    
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/trends/trending/all', methods=['GET'])
+def get_all_trending():
+    """Get REAL trending searches for every supported country in one response"""
+    try:
+        if not SERPAPI_KEY:
+            return jsonify({'error': 'SerpAPI key not configured. Please set SERPAPI_KEY environment variable.'}), 503
+        
+        # Serve warm snapshots from cache; fetch the missing geos concurrently
+        countries = {}
+        missing = []
+        for geo in COUNTRY_CODES:
+            snapshot = trends_cache.get(trending_key(geo))
+            if snapshot is not None:
+                countries[geo] = snapshot
+            else:
+                missing.append(geo)
+        
+        logger.info(f"Getting trending for all countries ({len(missing)} not cached)")
+        
+        futures = {geo: upstream_executor.submit(get_trending_snapshot, geo) for geo in missing}
+        errors = {}
+        fetched = 0
+        for geo, future in futures.items():
+            try:
+                countries[geo], cached = future.result()
+                # Geos the collector's store served cost no upstream call
+                fetched += not cached
+            except Exception as e:
+                logger.warning(f"Failed to get trending for {geo}: {e}")
+                errors[geo] = str(e)
+        
+        return compressed_jsonify({
+            'timestamp': datetime.now().isoformat(),
+            'data_source': 'SerpAPI',
+            'countries': {geo: countries[geo] for geo in COUNTRY_CODES if geo in countries},
+            'errors': errors,
+            'cached': len(countries) - fetched,
+            'fetched': fetched
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_all_trending: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/trends/suggestions', methods=['GET'])
 def get_suggestions():
     """Get REAL keyword suggestions"""
@@ -284,36 +1301,149 @@ def get_countries():
         'version': '1.4.0'
     })
 
+def fetch_comparison_group(keywords, geo, timeframe='today 12-m'):
+    """Fetch one multi-keyword TIMESERIES group through the cache
+
+    Returns (dates, timestamps, values) where timestamps are SerpAPI's epoch
+    seconds for each date and values has one row per keyword.
+    """
+    def fetch():
+        result = serpapi_client.make_request(
+            build_trends_params(','.join(keywords), geo, 'TIMESERIES', timeframe)
+        )
+        dates, timestamps, matrix = parse_packed_timeline(result, keywords)
+        # Archived as if fetched alone, each row rescaled to its own peak;
+        # rows too coarse to rescale are left for a solo fetch to archive
+        series, _ = split_packed_result(result, keywords)
+        for keyword, interest_over_time in series.items():
+            archive_series(keyword, geo, interest_over_time)
+        return {'dates': dates, 'timestamps': timestamps, 'values': matrix.tolist()}
+    
+    key = make_key('compare_group', geo, timeframe, ','.join(keyword.lower() for keyword in keywords))
+    group, _ = trends_cache.get_or_fetch(key, fetch)
+    values = np.array(group['values'], dtype=np.float64).reshape(len(keywords), -1)
+    return group['dates'], group['timestamps'], values
+
+def fetch_comparison_matrix(keywords, geo, timeframe='today 12-m', anchor=None):
+    """Fetch any number of keywords onto one common 0-100 scale
+
+    Up to five keywords share a single upstream call. Larger sets are split
+    into anchor-led groups of five, fetched concurrently and chained through
+    the anchor. Returns (dates, timestamps, matrix ordered like keywords,
+    groups used).
+    """
+    if len(keywords) <= MAX_KEYWORDS_PER_CALL:
+        dates, timestamps, matrix = fetch_comparison_group(keywords, geo, timeframe)
+        return dates, timestamps, matrix, 1
+    
+    anchor = anchor or keywords[0]
+    groups = chain_groups(keywords, anchor)
+    futures = [upstream_executor.submit(fetch_comparison_group, group, geo, timeframe) for group in groups]
+    fetched = [future.result() for future in futures]
+    
+    stitched = stitch_groups([matrix for _, _, matrix in fetched])
+    dates = fetched[0][0][:stitched.shape[1]]
+    timestamps = fetched[0][1][:stitched.shape[1]]
+    order = [anchor] + [keyword for group in groups for keyword in group[1:]]
+    rows = {keyword: row for keyword, row in zip(order, stitched)}
+    return dates, timestamps, np.stack([rows[keyword] for keyword in keywords]), len(groups)
+
+def fetch_region_group(keywords, geo, timeframe='today 12-m'):
+    """Fetch one multi-keyword GEO_MAP group through the cache
+
+    Returns (codes, names, values) where values has one row per keyword.
+    """
+    def fetch():
+        result = serpapi_client.make_request(
+            build_trends_params(','.join(keywords), geo, 'GEO_MAP', timeframe)
+        )
+        codes, names, matrix = parse_region_breakdown(result, keywords)
+        return {'codes': codes, 'names': names, 'values': matrix.tolist()}
+    
+    key = make_key('compare_regions', geo, timeframe, ','.join(keyword.lower() for keyword in keywords))
+    group, _ = trends_cache.get_or_fetch(key, fetch)
+    values = np.array(group['values'], dtype=np.float64).reshape(len(keywords), -1)
+    return group['codes'], group['names'], values
+
+def fetch_region_comparison(keywords, geo, timeframe='today 12-m', anchor=None):
+    """Fetch each keyword's regional share, chained through the anchor beyond five keywords
+
+    Groups are fetched one after another so this can run as a single task
+    on the upstream executor next to the timeseries fetch.
+    """
+    if len(keywords) <= MAX_KEYWORDS_PER_CALL:
+        return fetch_region_group(keywords, geo, timeframe)
+    
+    anchor = anchor or keywords[0]
+    groups = chain_groups(keywords, anchor)
+    codes, names, stitched = stitch_region_groups(
+        [fetch_region_group(group, geo, timeframe) for group in groups]
+    )
+    order = [anchor] + [keyword for group in groups for keyword in group[1:]]
+    rows = {keyword: row for keyword, row in zip(order, stitched)}
+    return codes, names, np.stack([rows[keyword] for keyword in keywords])
+
+def region_matrix_payload(keywords, codes, names, matrix):
+    """Columnar keyword x region layout: one value array per keyword plus each region's leader"""
+    rounded = np.round(matrix, 1)
+    leaders = [
+        keywords[int(np.nanargmax(column))] if not np.all(np.isnan(column)) else None
+        for column in rounded.T
+    ]
+    return {
+        'geoCodes': codes,
+        'geoNames': names,
+        'values': {
+            keyword: [None if np.isnan(value) else float(value) for value in row]
+            for keyword, row in zip(keywords, rounded)
+        },
+        'leader': leaders
+    }
+
 @app.route('/api/trends/compare', methods=['POST'])
 def compare_trends():
     """Compare multiple keywords using REAL SerpAPI data"""
     try:
-        data = request.get_json()
-        keywords = data.get('keywords', [])
+        data = request.get_json(silent=True) or {}
+        keywords = list(dict.fromkeys(str(k).strip() for k in data.get('keywords', []) if k and str(k).strip()))
         geo = data.get('geo', 'US')
         timeframe = data.get('timeframe', 'today 12-m')
+        anchor = str(data.get('anchor') or '').strip() or None
+        include_regions = bool(data.get('include_regions', False))
+        
+        try:
+            points = parse_points(data.get('points'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        fmt, error_response = response_format(data.get('format'))
+        if error_response:
+            return error_response
         
         if not keywords or len(keywords) < 2:
             return jsonify({'error': 'At least 2 keywords are required'}), 400
             
-        if len(keywords) > 5:
-            return jsonify({'error': 'Maximum 5 keywords allowed'}), 400
+        if len(keywords) > COMPARE_MAX_KEYWORDS:
+            return jsonify({'error': f'Maximum {COMPARE_MAX_KEYWORDS} keywords allowed'}), 400
+            
+        if anchor and anchor not in keywords:
+            return jsonify({'error': 'Anchor must be one of the keywords'}), 400
             
         if not SERPAPI_KEY:
             return jsonify({'error': 'SerpAPI key not configured. Please set SERPAPI_KEY environment variable.'}), 503
             
         logger.info(f"Comparing: {keywords} in {geo}")
         
-        # REAL SerpAPI request with multiple keywords
-        params = {
-            'engine': 'google_trends',
-            'q': ','.join(keywords),
-            'geo': geo,
-            'data_type': 'TIMESERIES',
-            'tz': '360'
-        }
+        # Regional breakdown runs on the executor while the timeseries is fetched
+        regions_future = None
+        if include_regions:
+            regions_future = upstream_executor.submit(fetch_region_comparison, keywords, geo, timeframe, anchor)
         
-        result = serpapi_client.make_request(params)
+        # REAL SerpAPI requests, chained through an anchor beyond five keywords
+        try:
+            dates, timestamps, matrix, groups = fetch_comparison_matrix(keywords, geo, timeframe, anchor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 422
         
         # Format REAL response
         response_data = {
@@ -324,26 +1454,442 @@ def compare_trends():
             'data_source': 'SerpAPI',
             'comparison_data': []
         }
+        if groups > 1:
+            response_data['anchor'] = anchor or keywords[0]
+            response_data['groups'] = groups
+        
+        # One shared index set keeps every keyword aligned on the same dates
+        if points and len(dates) > points:
+            kept = downsampled_indices(
+                make_key('compare_lttb', points, len(dates), dates[-1], geo, timeframe, anchor or '',
+                         ','.join(keyword.lower() for keyword in keywords)),
+                matrix, points
+            )
+            response_data['original_points'] = len(dates)
+            dates, timestamps = [dates[index] for index in kept], [timestamps[index] for index in kept]
+            matrix = matrix[:, kept]
         
         # Process REAL comparison data
-        if 'interest_over_time' in result and 'timeline_data' in result['interest_over_time']:
-            for point in result['interest_over_time']['timeline_data']:
-                data_point = {'date': point.get('date', '')}
-                
-                for idx, keyword in enumerate(keywords):
-                    if 'values' in point and idx < len(point['values']):
-                        data_point[keyword] = point['values'][idx].get('extracted_value', 0)
-                    else:
-                        data_point[keyword] = 0
-                        
+        if fmt != 'json':
+            response_data['comparison_data'] = columnar_matrix(timestamps, keywords, np.rint(matrix).astype(int).tolist())
+            response_data['format'] = 'columnar'
+        else:
+            columns = np.rint(matrix).astype(int).T.tolist()
+            for date, timestamp, values in zip(dates, timestamps, columns):
+                data_point = {'date': date, 'timestamp': timestamp}
+                data_point.update(zip(keywords, values))
                 response_data['comparison_data'].append(data_point)
         
-        return jsonify(response_data)
+        if regions_future is not None:
+            try:
+                response_data['regional_comparison'] = region_matrix_payload(keywords, *regions_future.result())
+            except Exception as e:
+                logger.warning(f"Failed to get regional comparison: {e}")
+                response_data['regional_comparison'] = None
+        
+        return formatted_response(response_data, fmt)
         
     except Exception as e:
         logger.error(f"Error in compare_trends: {e}")
         return jsonify({'error': str(e)}), 500
 
+def resolve_timeseries(keywords, geo, timeframe='today 12-m'):
+    """Each keyword's (timestamps, values) from the cache, then the archive, then upstream
+
+    Archived series count only when they span the timeframe's window. Only
+    keywords found in neither are fetched, packed five per call on the
+    upstream executor; any a packed call cannot serve are fetched alone.
+    Returns (series, sources, missing).
+    """
+    series = {}
+    sources = {'cached': 0, 'archived': 0, 'fetched': 0}
+    to_fetch = []
+    for keyword in keywords:
+        cached = trends_cache.get(leg_key('interest_over_time', keyword, geo, timeframe))
+        archived = archived_series_arrays(keyword, geo, timeframe) if cached is None else None
+        if cached is not None:
+            series[keyword] = series_arrays(cached)
+            sources['cached'] += 1
+        elif archived is not None:
+            series[keyword] = archived
+            sources['archived'] += 1
+        else:
+            to_fetch.append(keyword)
+    
+    packable = [keyword for keyword in to_fetch if is_packable(keyword)]
+    groups = [packable[start:start + MAX_KEYWORDS_PER_CALL]
+              for start in range(0, len(packable), MAX_KEYWORDS_PER_CALL)]
+    futures = [upstream_executor.submit(fetch_timeseries_packed, group, geo, timeframe)
+               for group in groups if len(group) > 1]
+    for future in futures:
+        try:
+            for keyword, interest_over_time in future.result().items():
+                series[keyword] = series_arrays(interest_over_time)
+                sources['fetched'] += 1
+        except Exception as e:
+            logger.warning(f"Packed fetch failed, fetching alone: {e}")
+    
+    alone = [keyword for keyword in to_fetch if keyword not in series]
+    futures = {upstream_executor.submit(fetch_leg, 'interest_over_time', keyword, geo, timeframe): keyword
+               for keyword in alone}
+    missing = []
+    for future, keyword in futures.items():
+        try:
+            series[keyword] = series_arrays(future.result()[0])
+            sources['fetched'] += 1
+        except Exception as e:
+            logger.warning(f"Failed to fetch '{keyword}' for correlation: {e}")
+            missing.append(keyword)
+    return series, sources, missing
+
+@app.route('/api/trends/correlate', methods=['POST'])
+def correlate_trends():
+    """Correlate many keywords' REAL interest over time on a common date grid"""
+    try:
+        data = request.get_json(silent=True) or {}
+        keywords = list(dict.fromkeys(str(k).strip() for k in data.get('keywords', []) if k and str(k).strip()))
+        geo = data.get('geo', 'US')
+        timeframe = data.get('timeframe', 'today 12-m')
+        method = data.get('method', 'pearson')
+        max_lag = data.get('max_lag', 0)
+        
+        if len(keywords) < 2:
+            return jsonify({'error': 'At least 2 keywords are required'}), 400
+            
+        if len(keywords) > CORRELATE_MAX_KEYWORDS:
+            return jsonify({'error': f'Maximum {CORRELATE_MAX_KEYWORDS} keywords allowed'}), 400
+            
+        if method not in CORRELATION_METHODS:
+            return jsonify({'error': f"method must be one of: {', '.join(CORRELATION_METHODS)}"}), 400
+            
+        if not isinstance(max_lag, int) or not 0 <= max_lag <= CORRELATE_MAX_LAG:
+            return jsonify({'error': f'max_lag must be an integer from 0 to {CORRELATE_MAX_LAG}'}), 400
+            
+        if not SERPAPI_KEY:
+            return jsonify({'error': 'SerpAPI key not configured. Please set SERPAPI_KEY environment variable.'}), 503
+        
+        logger.info(f"Correlating {len(keywords)} keywords in {geo} ({method}, max lag {max_lag})")
+        series, sources, missing = resolve_timeseries(keywords, geo, timeframe)
+        included = [keyword for keyword in keywords if keyword in series and len(series[keyword][0])]
+        
+        # Common grid: only dates every series has
+        grid = reduce(np.intersect1d, [series[keyword][0] for keyword in included]) if included else []
+        if len(included) < 2 or len(grid) < 3:
+            return jsonify({'error': 'Not enough overlapping data points to correlate'}), 422
+        
+        values = np.stack([np.asarray(series[keyword][1])[np.isin(series[keyword][0], grid)]
+                           for keyword in included])
+        max_lag = min(max_lag, len(grid) // 2)
+        matrix, best, lags = correlation_matrix(values, method, max_lag)
+        
+        def rounded(array):
+            return [[finite_or_none(value, 4) for value in row] for row in array]
+        
+        response_data = {
+            'keywords': included,
+            'geo': geo,
+            'timeframe': timeframe,
+            'method': method,
+            'points': len(grid),
+            'timestamp': datetime.now().isoformat(),
+            'data_source': 'SerpAPI',
+            'sources': sources,
+            'missing': missing,
+            'matrix': rounded(matrix)
+        }
+        if max_lag:
+            response_data['max_lag'] = max_lag
+            response_data['best_lag'] = lags.tolist()
+            response_data['best_correlation'] = rounded(best)
+        
+        return jsonify(response_data)
+        
+    except Exception as e:
+        logger.error(f"Error in correlate_trends: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/similar', methods=['GET'])
+def get_similar_trends():
+    """Find archived keywords whose interest curve has the closest shape"""
+    try:
+        keyword = request.args.get('keyword', '').strip()
+        geo = request.args.get('geo', 'US')
+        timeframe = request.args.get('timeframe', 'today 12-m')
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+        
+        if not keyword:
+            return jsonify({'error': 'Keyword parameter is required'}), 400
+        
+        # The query curve itself may come from upstream; candidates never do
+        series = archived_series_arrays(keyword, geo, timeframe)
+        if series is None:
+            error_response = validate_search_args(keyword)
+            if error_response:
+                return error_response
+            series = series_arrays(fetch_leg('interest_over_time', keyword, geo, timeframe)[0])
+        
+        timestamps, values = series
+        vector = shape_vectors(np.asarray(values)[np.newaxis, :])[0]
+        if not vector.any():
+            return jsonify({'error': f"'{keyword}' has no interest curve to match"}), 422
+        
+        granularity = infer_granularity(timestamps)
+        matches = similarity_index.get(granularity).query(vector, limit, exclude=(archive_keyword(keyword), geo))
+        
+        return jsonify({
+            'keyword': keyword,
+            'geo': geo,
+            'granularity': granularity,
+            'data_source': 'SerpAPI (archived)',
+            'similar': [
+                {'keyword': match_keyword, 'geo': match_geo, 'similarity': round(score, 4)}
+                for (match_keyword, match_geo), score in matches
+            ]
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_similar_trends: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/compare-geo', methods=['POST'])
+def compare_geo_trends():
+    """Compare one keyword across many countries using REAL SerpAPI data"""
+    try:
+        data = request.get_json(silent=True) or {}
+        keyword = str(data.get('keyword', '')).strip()
+        geos = list(dict.fromkeys(g.strip().upper() for g in data.get('geos', []) if g and g.strip()))
+        timeframe = data.get('timeframe', 'today 12-m')
+        
+        if not keyword:
+            return jsonify({'error': 'Keyword parameter is required'}), 400
+            
+        if len(geos) < 2:
+            return jsonify({'error': 'At least 2 geos are required'}), 400
+            
+        if len(geos) > COMPARE_MAX_GEOS:
+            return jsonify({'error': f'Maximum {COMPARE_MAX_GEOS} geos allowed'}), 400
+            
+        if not SERPAPI_KEY:
+            return jsonify({'error': 'SerpAPI key not configured. Please set SERPAPI_KEY environment variable.'}), 503
+            
+        logger.info(f"Comparing '{keyword}' across: {geos}")
+        
+        # Only the TIMESERIES leg is needed, one cached call per geo in parallel
+        futures = {
+            geo: upstream_executor.submit(fetch_leg, 'interest_over_time', keyword, geo, timeframe)
+            for geo in geos
+        }
+        series = {}
+        errors = {}
+        for geo, future in futures.items():
+            try:
+                series[geo], _ = future.result()
+            except Exception as e:
+                logger.warning(f"Failed to get {geo} series: {e}")
+                errors[geo] = str(e)
+        
+        if not series:
+            return jsonify({'error': 'Failed to fetch every geo', 'errors': errors}), 502
+        
+        timestamps, columns = align_series(series)
+        
+        return jsonify({
+            'keyword': keyword,
+            'geos': geos,
+            'timeframe': timeframe,
+            'timestamp': datetime.now().isoformat(),
+            'data_source': 'SerpAPI',
+            'dates': timestamps,
+            'series': columns,
+            'errors': errors
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in compare_geo_trends: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/trending/global', methods=['GET'])
+def get_global_trending():
+    """Get a rank-weighted global trending list from cached country snapshots"""
+    try:
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        
+        # No upstream calls: only snapshots already in the cache are counted
+        sync_global_trending()
+        
+        return jsonify({
+            'timestamp': datetime.now().isoformat(),
+            'data_source': 'SerpAPI',
+            'countries': global_trending.geos(),
+            'trending_searches': global_trending.top(limit)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_global_trending: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/trending/overlap', methods=['GET'])
+def get_trending_overlap():
+    """Get pairwise Jaccard overlap between countries' trending query sets
+
+    Without hours, compares each country's current cached or stored list;
+    with hours, the union of everything each country stored in that window.
+    """
+    try:
+        geos = [g.strip().upper() for g in request.args.get('geos', '').split(',') if g.strip()]
+        geos = geos or list(COUNTRY_CODES)
+        hours = request.args.get('hours', type=int)
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 200)
+        
+        # No upstream calls: only cached or stored snapshots are compared
+        if hours:
+            hours = min(max(hours, 1), 24 * 365)
+            query_sets = snapshot_store.query_sets(time.time() - hours * 3600, geos=set(geos))
+        else:
+            query_sets = {}
+            for geo in geos:
+                snapshot = trends_cache.get(trending_key(geo)) or load_stored_trending(geo)
+                if snapshot:
+                    query_sets[geo] = {normalize_query(item['query']) for item in snapshot['trending_searches']} - {''}
+        
+        countries, jaccard, shared = overlap_matrix(query_sets)
+        rows, cols = np.triu_indices(len(countries), k=1)
+        pair_scores = jaccard[rows, cols]
+        top_pairs = [
+            {
+                'geos': [countries[rows[i]], countries[cols[i]]],
+                'jaccard': round(float(pair_scores[i]), 4),
+                'shared': int(shared[rows[i], cols[i]])
+            }
+            for i in np.argsort(-pair_scores, kind='stable')[:limit] if pair_scores[i] > 0
+        ]
+        
+        return jsonify({
+            'timestamp': datetime.now().isoformat(),
+            'data_source': 'SerpAPI (stored)' if hours else 'SerpAPI',
+            'hours': hours,
+            'countries': countries,
+            'jaccard': np.round(jaccard, 4).tolist(),
+            'shared': shared.tolist(),
+            'top_pairs': top_pairs
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_trending_overlap: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def parse_day(value):
+    """Parse YYYY-MM-DD as a UTC day, returning its (start, end) epoch seconds"""
+    start = datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    return start.timestamp(), (start + timedelta(days=1)).timestamp()
+
+@app.route('/api/trends/history/trending', methods=['GET'])
+def get_trending_history():
+    """Get stored trending snapshots for a country on a given UTC date"""
+    try:
+        geo = request.args.get('geo', 'US')
+        date = request.args.get('date', '')
+        
+        try:
+            start, end = parse_day(date)
+        except ValueError:
+            return jsonify({'error': 'date parameter must be YYYY-MM-DD'}), 400
+        
+        return jsonify({
+            'geo': geo,
+            'country': COUNTRY_CODES.get(geo, geo),
+            'date': date,
+            'data_source': 'SerpAPI (stored)',
+            'snapshots': snapshot_store.snapshots_between(geo, start, end)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_trending_history: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/history/query', methods=['GET'])
+def get_query_history():
+    """Get the stored rank history of one trending query"""
+    try:
+        query = request.args.get('q', '').strip()
+        geo = request.args.get('geo') or None
+        days = min(max(request.args.get('days', 30, type=int), 1), 3650)
+        
+        if not query:
+            return jsonify({'error': 'q parameter is required'}), 400
+        
+        start = time.time() - days * 86400
+        return jsonify({
+            'query': query,
+            'geo': geo,
+            'days': days,
+            'data_source': 'SerpAPI (stored)',
+            'history': snapshot_store.rank_history(query, geo, start)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_query_history: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/history/series', methods=['GET'])
+def get_series_history():
+    """Get an archived interest_over_time series without calling upstream"""
+    try:
+        keyword = request.args.get('keyword', '').strip()
+        geo = request.args.get('geo', 'US')
+        granularity = request.args.get('granularity') or None
+        
+        if not keyword:
+            return jsonify({'error': 'Keyword parameter is required'}), 400
+        
+        series = series_archive.load(keyword, geo, granularity)
+        if series is None:
+            return jsonify({'error': f"No archived series for '{keyword}' in {geo}"}), 404
+        
+        timestamps, values = series
+        return jsonify({
+            'keyword': keyword,
+            'geo': geo,
+            'granularity': granularity or infer_granularity(timestamps),
+            'data_source': 'SerpAPI (archived)',
+            'timestamps': timestamps.tolist(),
+            'values': values.tolist()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in get_series_history: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/trends/history/search', methods=['GET'])
+def search_trending_history():
+    """Full-text search over stored trending queries: every day a match trended"""
+    try:
+        text = request.args.get('q', '').strip()
+        geo = request.args.get('geo') or None
+        limit = min(max(request.args.get('limit', 100, type=int), 1), 1000)
+        
+        if not text:
+            return jsonify({'error': 'q parameter is required'}), 400
+        
+        try:
+            start = parse_day(request.args['from'])[0] if request.args.get('from') else 0
+            end = parse_day(request.args['to'])[1] if request.args.get('to') else None
+        except ValueError:
+            return jsonify({'error': 'from and to parameters must be YYYY-MM-DD'}), 400
+        
+        return jsonify({
+            'query': text,
+            'geo': geo,
+            'from': request.args.get('from'),
+            'to': request.args.get('to'),
+            'data_source': 'SerpAPI (stored)',
+            'results': snapshot_store.search(text, geo, start, end, limit)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error in search_trending_history: {e}")
+        return jsonify({'error': str(e)}), 500
+
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Trending Broadcaster
+📡 Fans trending updates out to every push subscriber in this worker
+
+New snapshots arrive over Redis pub/sub when REDIS_URL is configured, so
+one refresh (by the collector or any web worker) reaches every worker.
+Without Redis, each worker watches the snapshot store for new rows
+instead. Either way each worker turns a new snapshot into one diff and
+hands it to all of its subscribers for that geo.
+"""
+
+import json
+import logging
+import queue
+import threading
+
+from trending import trending_diff
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'trends:trending-updates'
+SUBSCRIBER_QUEUE_SIZE = 100
+STORE_POLL_INTERVAL = 5
+
+
+class Subscription:
+    """One client's queue of events for a set of geos"""
+
+    def __init__(self, geos, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.geos = set(geos)
+        self.events = queue.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def get(self, timeout=None):
+        """Next event, or None if none arrived within timeout"""
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class TrendingBroadcaster:
+    """In-process fan-out of trending snapshots as per-geo diffs"""
+
+    def __init__(self, redis_client=None, store=None, poll_interval=STORE_POLL_INTERVAL):
+        self.redis = redis_client
+        self.store = store
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._latest = {}  # geo -> (version, trending_searches)
+        self._source = None
+
+    def subscribe(self, geos, initial=None):
+        """Register a subscriber, queueing a snapshot event for each geo already known
+
+        `initial(geo)` may supply (version, trending_searches) for geos this
+        worker has not seen an update for yet.
+        """
+        self._ensure_source()
+        subscription = Subscription(geos)
+        with self._lock:
+            for geo in sorted(subscription.geos):
+                if geo not in self._latest and initial is not None:
+                    snapshot = initial(geo)
+                    if snapshot is not None:
+                        self._latest[geo] = snapshot
+                if geo in self._latest:
+                    version, trending_searches = self._latest[geo]
+                    subscription.events.put_nowait(('snapshot', {
+                        'geo': geo, 'version': version, 'trending_searches': trending_searches
+                    }))
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+    def publish(self, geo, version, trending_searches):
+        """Announce a new snapshot to every worker
+
+        Without Redis this is a no-op: each worker's store watcher sees the
+        recorded snapshot on its own.
+        """
+        if self.redis is None:
+            return
+        try:
+            self.redis.publish(CHANNEL, json.dumps({
+                'geo': geo, 'version': version, 'trending_searches': trending_searches
+            }))
+        except Exception as e:
+            logger.warning(f"Failed to publish trending update: {e}")
+
+    def dispatch(self, geo, version, trending_searches):
+        """Turn a new snapshot into a diff and queue it for geo's subscribers"""
+        with self._lock:
+            previous = self._latest.get(geo)
+            if previous is not None and version is not None and previous[0] is not None \
+                    and version <= previous[0]:
+                return
+            self._latest[geo] = (version, trending_searches)
+
+            if previous is None:
+                event = ('snapshot', {'geo': geo, 'version': version, 'trending_searches': trending_searches})
+            else:
+                changes = trending_diff(previous[1], trending_searches)
+                if not any(changes.values()):
+                    return
+                event = ('diff', {'geo': geo, 'version': version, 'since': previous[0], 'changes': changes})
+
+            for subscription in self._subscriptions:
+                if geo not in subscription.geos:
+                    continue
+                try:
+                    subscription.events.put_nowait(event)
+                except queue.Full:
+                    # A stalled client must resync rather than block the fan-out
+                    subscription.overflowed = True
+
+    def _ensure_source(self):
+        with self._lock:
+            if self._source is not None:
+                return
+            if self.redis is not None:
+                target = self._listen_redis
+            elif self.store is not None:
+                target = self._watch_store
+            else:
+                return
+            self._source = threading.Thread(target=target, name='trending-broadcaster', daemon=True)
+            self._source.start()
+
+    def _listen_redis(self):
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(CHANNEL)
+        for message in pubsub.listen():
+            try:
+                update = json.loads(message['data'])
+                self.dispatch(update['geo'], update['version'], update['trending_searches'])
+            except Exception as e:
+                logger.warning(f"Bad trending update message: {e}")
+
+    def _watch_store(self):
+        last_id = self.store.max_snapshot_id()
+        stop = threading.Event()
+        while not stop.wait(self.poll_interval):
+            try:
+                for snapshot in self.store.snapshots_after(last_id):
+                    self.dispatch(snapshot['geo'], snapshot['id'], snapshot['trending_searches'])
+                    last_id = snapshot['id']
+            except Exception as e:
+                logger.warning(f"Trending store watch failed: {e}")
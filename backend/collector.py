@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Trending Collector
+🛰️ Long-running process that polls REAL trending searches for every country
+
+Runs next to app.py and shares only the snapshot store and the cache with
+the web workers, which then serve trending from those instead of calling
+SerpAPI. Progress is checkpointed in the store after every country, so a
+restarted collector picks up the most overdue countries first.
+
+Usage:
+    python collector.py            # run until SIGINT/SIGTERM
+    python collector.py --once     # single pass, e.g. from cron
+"""
+
+import argparse
+import logging
+import os
+import signal
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+COLLECTOR_INTERVAL = int(os.environ.get('COLLECTOR_INTERVAL', 900))
+COLLECTOR_CALLS_PER_HOUR = int(os.environ.get('COLLECTOR_CALLS_PER_HOUR', 100))
+COLLECTOR_RETRY_DELAY = int(os.environ.get('COLLECTOR_RETRY_DELAY', 60))
+COLLECTOR_TICK = 30
+
+
+class TrendingCollector:
+    """Polls trending for each geo once per interval within an hourly call budget"""
+
+    def __init__(self, fetch, store, geos, publish=None, interval=COLLECTOR_INTERVAL,
+                 calls_per_hour=COLLECTOR_CALLS_PER_HOUR, retry_delay=COLLECTOR_RETRY_DELAY,
+                 clock=time.time):
+        self.fetch = fetch
+        self.store = store
+        self.geos = list(geos)
+        self.publish = publish
+        self.interval = interval
+        self.calls_per_hour = calls_per_hour
+        self.retry_delay = retry_delay
+        self.clock = clock
+
+    def due(self, now):
+        """Geos that need polling, most overdue first
+
+        A geo is due once `interval` has passed since its last success;
+        failing geos back off exponentially from `retry_delay`.
+        """
+        checkpoints = self.store.checkpoints()
+        due = []
+        for geo in self.geos:
+            checkpoint = checkpoints.get(geo)
+            if checkpoint is None:
+                due.append((0, geo))
+                continue
+            if now - checkpoint['last_success'] < self.interval:
+                continue
+            if checkpoint['failures']:
+                backoff = min(self.interval, self.retry_delay * 2 ** (checkpoint['failures'] - 1))
+                if now - checkpoint['last_attempt'] < backoff:
+                    continue
+            due.append((checkpoint['last_success'], geo))
+        return [geo for _, geo in sorted(due, key=lambda entry: entry[0])]
+
+    def budget(self, now):
+        """Upstream calls still allowed in the trailing hour"""
+        return max(self.calls_per_hour - self.store.calls_since(now - 3600), 0)
+
+    def run_once(self):
+        """Poll every due geo the budget allows; returns a summary of the pass"""
+        now = self.clock()
+        due = self.due(now)
+        allowed = due[:self.budget(now)]
+        polled, failed = [], []
+
+        for geo in allowed:
+            attempted_at = self.clock()
+            try:
+                data = self.fetch(geo)
+                if self.publish:
+                    self.publish(geo, data)
+                self.store.save_checkpoint(geo, attempted_at, True)
+                polled.append(geo)
+            except Exception as e:
+                logger.warning(f"Collector failed for {geo}: {e}")
+                self.store.save_checkpoint(geo, attempted_at, False)
+                failed.append(geo)
+
+        self.store.prune_calls(now - 3600)
+        return {'polled': polled, 'failed': failed, 'deferred': due[len(allowed):]}
+
+    def run_forever(self, stop_event, tick=COLLECTOR_TICK):
+        """Run passes every `tick` seconds until stop_event is set"""
+        logger.info(f"Collector started for {len(self.geos)} geos every {self.interval}s "
+                    f"(budget {self.calls_per_hour} calls/hour)")
+        while not stop_event.is_set():
+            summary = self.run_once()
+            if any(summary.values()):
+                logger.info(f"Collector pass: {len(summary['polled'])} polled, "
+                            f"{len(summary['failed'])} failed, {len(summary['deferred'])} deferred by budget")
+            stop_event.wait(tick)
+        logger.info("Collector stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='World Trends Explorer trending collector')
+    parser.add_argument('--once', action='store_true', help='run a single pass and exit')
+    args = parser.parse_args()
+
+    # Shares the web app's configuration, store and cache, not its processes
+    from app import (COUNTRY_CODES, SERPAPI_KEY, TRENDING_CACHE_TTL, fetch_trending,
+                     snapshot_store, trending_key, trends_cache)
+
+    if not SERPAPI_KEY:
+        print("❌ ERROR: SerpAPI key not configured!")
+        print("⚠️  Set environment variable: export SERPAPI_KEY='your_key'")
+        raise SystemExit(1)
+
+    collector = TrendingCollector(
+        fetch=fetch_trending,
+        store=snapshot_store,
+        geos=COUNTRY_CODES,
+        publish=lambda geo, data: trends_cache.set(trending_key(geo), data, TRENDING_CACHE_TTL)
+    )
+
+    if args.once:
+        print(collector.run_once())
+        return
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    collector.run_forever(stop_event)
+
+
+if __name__ == '__main__':
+    main()
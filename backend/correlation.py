@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Keyword Correlation
+🔗 Pearson/Spearman correlation matrices over aligned interest_over_time series
+
+Rows are standardized once and every pairwise correlation for a lag comes
+out of a single matrix product. Lagged scans are independent per lag, so
+large ones are spread over a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import numpy as np
+
+CORRELATION_METHODS = ('pearson', 'spearman')
+
+# Multiply-adds (series^2 x points x lags) above which lags run on the pool
+POOL_MIN_WORK = int(os.environ.get('CORRELATE_POOL_MIN_WORK', 50_000_000))
+
+_pool = None
+
+
+def rank_rows(values):
+    """Average ranks (1-based, ties share their mean rank) along each row"""
+    values = np.asarray(values, dtype=np.float64)
+    rows, points = values.shape
+    if not values.size:
+        return values.copy()
+    # Shift each row into its own disjoint range so one flat searchsorted ranks all rows
+    span = np.nanmax(values) - np.nanmin(values) + 1
+    shifted = (values - np.nanmin(values)) + span * np.arange(rows)[:, np.newaxis]
+    ordered = np.sort(shifted, axis=None)
+    left = np.searchsorted(ordered, shifted, side='left')
+    right = np.searchsorted(ordered, shifted, side='right')
+    row_start = points * np.arange(rows)[:, np.newaxis]
+    return (left + right - 1) / 2 - row_start + 1
+
+
+def standardize(values):
+    """Rows rescaled to zero mean and unit norm; constant rows become NaN"""
+    centered = values - values.mean(axis=1, keepdims=True)
+    norms = np.sqrt((centered * centered).sum(axis=1, keepdims=True))
+    return np.divide(centered, norms, out=np.full(centered.shape, np.nan), where=norms > 0)
+
+
+def lagged_correlation(values, lag):
+    """Correlation of every row at t with every row at t + lag (lag may be negative)"""
+    points = values.shape[1]
+    if lag >= 0:
+        leading, lagging = values[:, :points - lag], values[:, lag:]
+    else:
+        leading, lagging = values[:, -lag:], values[:, :points + lag]
+    return standardize(leading) @ standardize(lagging).T
+
+
+def correlation_matrix(values, method='pearson', max_lag=0):
+    """Correlations of (series x points) values
+
+    Returns (matrix at lag 0, best |correlation| per pair over lags, the
+    lag achieving it). A positive lag for (i, j) means series j follows
+    series i by that many points.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if method == 'spearman':
+        values = rank_rows(values)
+
+    lags = list(range(-max_lag, max_lag + 1))
+    work = values.shape[0] ** 2 * values.shape[1] * len(lags)
+    if len(lags) > 1 and work >= POOL_MIN_WORK:
+        matrices = list(_process_pool().map(lagged_correlation, [values] * len(lags), lags))
+    else:
+        matrices = [lagged_correlation(values, lag) for lag in lags]
+
+    stacked = np.stack(matrices)
+    zero_lag = stacked[lags.index(0)]
+    strength = np.where(np.isnan(stacked), -np.inf, np.abs(stacked))
+    best = np.argmax(strength, axis=0)
+    best_correlation = np.take_along_axis(stacked, best[np.newaxis], axis=0)[0]
+    return zero_lag, best_correlation, np.array(lags)[best]
+
+
+def _process_pool():
+    """Shared pool; spawned rather than forked since the web server is threaded"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+    return _pool
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Export
+📤 CSV and Parquet serialization of timeseries, one series at a time
+
+Writers take a series at a time and hand back bytes as they go, so an
+export of any size holds at most one series (CSV) or one row group
+(Parquet) in memory. Parquet needs its footer written last, so row groups
+are spooled to a temporary file and streamed out once it is closed.
+"""
+
+import csv
+import io
+import os
+import tempfile
+
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export is optional
+    pyarrow = None
+
+EXPORT_FORMATS = ('csv', 'parquet')
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+EXPORT_COLUMNS = ('keyword', 'geo', 'timeframe', 'timestamp', 'date', 'value', 'error')
+
+# Rows buffered per Parquet row group
+PARQUET_ROW_GROUP = int(os.environ.get('EXPORT_PARQUET_ROW_GROUP', 65536))
+READ_BLOCK = 64 * 1024
+
+
+def format_available(fmt):
+    """Whether the optional dependency behind an export format is installed"""
+    return fmt != 'parquet' or pyarrow is not None
+
+
+def iso_dates(timestamps):
+    """ISO 8601 UTC strings for epoch seconds"""
+    return np.char.add(np.datetime_as_string(np.asarray(timestamps, dtype='datetime64[s]'), unit='s'), 'Z')
+
+
+class CsvExportWriter:
+    """CSV text for each series as it is added"""
+
+    def header(self):
+        return self._rows([EXPORT_COLUMNS])
+
+    def add_series(self, item, timestamps, values):
+        count = len(timestamps)
+        return self._rows(zip(
+            [item['keyword']] * count, [item['geo']] * count, [item['timeframe']] * count,
+            timestamps.tolist(), iso_dates(timestamps).tolist(), values.tolist(), [''] * count
+        ))
+
+    def add_error(self, item, message):
+        return self._rows([(item['keyword'], item['geo'], item['timeframe'], '', '', '', message)])
+
+    def close(self):
+        return iter(())
+
+    @staticmethod
+    def _rows(rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+
+class ParquetExportWriter:
+    """Parquet row groups spooled to a temporary file, streamed back on close"""
+
+    def __init__(self, row_group=PARQUET_ROW_GROUP):
+        if pyarrow is None:
+            raise RuntimeError('Parquet export requires the pyarrow package')
+        self.schema = pyarrow.schema([
+            ('keyword', pyarrow.string()),
+            ('geo', pyarrow.string()),
+            ('timeframe', pyarrow.string()),
+            ('timestamp', pyarrow.int64()),
+            ('date', pyarrow.timestamp('s', tz='UTC')),
+            ('value', pyarrow.uint8()),
+            ('error', pyarrow.string()),
+        ])
+        self.row_group = row_group
+        self.file = tempfile.TemporaryFile()
+        self.writer = pyarrow.parquet.ParquetWriter(self.file, self.schema)
+        self.pending = []
+        self.pending_rows = 0
+
+    def header(self):
+        return b''
+
+    def add_series(self, item, timestamps, values):
+        count = len(timestamps)
+        self._add(pyarrow.table({
+            'keyword': [item['keyword']] * count,
+            'geo': [item['geo']] * count,
+            'timeframe': [item['timeframe']] * count,
+            'timestamp': timestamps,
+            'date': timestamps,
+            'value': values,
+            'error': pyarrow.nulls(count, pyarrow.string()),
+        }, schema=self.schema))
+        return b''
+
+    def add_error(self, item, message):
+        self._add(pyarrow.table({
+            'keyword': [item['keyword']],
+            'geo': [item['geo']],
+            'timeframe': [item['timeframe']],
+            'timestamp': pyarrow.nulls(1, pyarrow.int64()),
+            'date': pyarrow.nulls(1, pyarrow.timestamp('s', tz='UTC')),
+            'value': pyarrow.nulls(1, pyarrow.uint8()),
+            'error': [message],
+        }, schema=self.schema))
+        return b''
+
+    def close(self):
+        """Finish the file and yield it in blocks"""
+        try:
+            self._flush()
+            self.writer.close()
+            self.file.seek(0)
+            while True:
+                block = self.file.read(READ_BLOCK)
+                if not block:
+                    break
+                yield block
+        finally:
+            self.file.close()
+
+    def _add(self, table):
+        self.pending.append(table)
+        self.pending_rows += table.num_rows
+        if self.pending_rows >= self.row_group:
+            self._flush()
+
+    def _flush(self):
+        if self.pending:
+            self.writer.write_table(pyarrow.concat_tables(self.pending))
+            self.pending = []
+            self.pending_rows = 0
+
+
+def export_writer(fmt):
+    """A fresh writer for one export"""
+    return ParquetExportWriter() if fmt == 'parquet' else CsvExportWriter()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Forecasting
+🔮 Short-horizon forecasts with prediction intervals for interest_over_time
+
+Additive Holt-Winters is fitted to many series at once: the recursion
+steps through time, but every step updates all series and every
+candidate (alpha, beta, gamma) together, and each series keeps the
+candidate with the lowest one-step error. Fitting yields a small state
+(level, trend, seasonal profile, residual sigma) from which any horizon
+is O(horizon), so callers cache the state rather than the forecast.
+"""
+
+import numpy as np
+
+FORECAST_METHODS = ('holt_winters', 'seasonal_naive')
+
+# Points per seasonal cycle for each granularity
+SEASON_LENGTHS = {
+    'hourly': 24,
+    'daily': 7,
+    'weekly': 52,
+    'monthly': 12,
+}
+
+# Normal quantiles for the supported interval levels
+INTERVAL_Z = {80: 1.2816, 95: 1.96}
+
+_GRID = np.array([
+    (alpha, beta, gamma)
+    for alpha in (0.1, 0.3, 0.5, 0.8)
+    for beta in (0.0, 0.1, 0.3)
+    for gamma in (0.05, 0.2, 0.5)
+])
+
+
+def season_length(granularity, points):
+    """Seasonal period to model, or None when fewer than two full cycles exist"""
+    season = SEASON_LENGTHS.get(granularity)
+    return season if season and points >= 2 * season else None
+
+
+def fit_holt_winters(values, season=None):
+    """Fit additive Holt-Winters (Holt's linear trend without season) to every row
+
+    Returns a state dict of arrays with one entry (or row) per series.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    series, points = values.shape
+    # Without a season only (alpha, beta) matter
+    grid = _GRID if season else np.unique(_GRID * [1, 1, 0], axis=0)
+    alpha, beta, gamma = grid.T
+    period = season or 1
+
+    if season:
+        first, second = values[:, :season].mean(axis=1), values[:, season:2 * season].mean(axis=1)
+        level = np.repeat(first[:, None], len(grid), axis=1)
+        trend = np.repeat(((second - first) / season)[:, None], len(grid), axis=1)
+        seasonal = np.repeat((values[:, :season] - first[:, None])[:, None, :], len(grid), axis=1)
+    else:
+        level = np.repeat(values[:, :1], len(grid), axis=1)
+        trend = np.repeat(values[:, 1:2] - values[:, :1], len(grid), axis=1)
+        seasonal = np.zeros((series, len(grid), 1))
+
+    sse = np.zeros((series, len(grid)))
+    for t in range(points):
+        observed = values[:, t:t + 1]
+        profile = seasonal[:, :, t % period]
+        error = observed - (level + trend + profile)
+        sse += error * error
+        new_level = alpha * (observed - profile) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        seasonal[:, :, t % period] = gamma * (observed - new_level) + (1 - gamma) * profile
+        level = new_level
+
+    rows = np.arange(series)
+    best = np.argmin(sse, axis=1)
+    parameters = max(points - 3 - (season or 0), 1)
+    return {
+        'method': 'holt_winters',
+        'season': season,
+        'level': level[rows, best],
+        'trend': trend[rows, best],
+        # Rotated so column 0 applies to the first forecast step
+        'seasonal': np.roll(seasonal[rows, best], -(points % period), axis=1),
+        'sigma': np.sqrt(sse[rows, best] / parameters),
+        'alpha': alpha[best],
+        'beta': beta[best],
+        'gamma': gamma[best],
+    }
+
+
+def fit_seasonal_naive(values, season=None):
+    """Repeat the last seasonal cycle (or the last value without season)"""
+    values = np.asarray(values, dtype=np.float64)
+    period = season or 1
+    residuals = values[:, period:] - values[:, :-period]
+    series = values.shape[0]
+    return {
+        'method': 'seasonal_naive',
+        'season': season,
+        'level': np.zeros(series),
+        'trend': np.zeros(series),
+        'seasonal': values[:, -period:],
+        'sigma': np.sqrt((residuals * residuals).mean(axis=1)) if residuals.size else np.zeros(series),
+        'alpha': np.zeros(series),
+        'beta': np.zeros(series),
+        'gamma': np.zeros(series),
+    }
+
+
+def forecast_from_state(state, horizon, level=95):
+    """(forecast, lower, upper), each (series x horizon), from a fitted state
+
+    Values are clipped to the 0-100 interest scale.
+    """
+    steps = np.arange(1, horizon + 1)
+    seasonal = np.asarray(state['seasonal'], dtype=np.float64)
+    period = seasonal.shape[1]
+    forecast = (np.asarray(state['level'])[:, None]
+                + steps * np.asarray(state['trend'])[:, None]
+                + seasonal[:, (steps - 1) % period])
+
+    if state['method'] == 'seasonal_naive':
+        variance_factor = ((steps - 1) // period + 1).astype(np.float64)[None, :]
+    else:
+        # Additive Holt-Winters: sigma^2 * (1 + sum of c_j^2 for j < h)
+        j = np.arange(1, horizon)
+        alpha, beta, gamma = (np.asarray(state[name])[:, None] for name in ('alpha', 'beta', 'gamma'))
+        seasonal_hit = (j % period == 0) if state['season'] else np.zeros(len(j), dtype=bool)
+        c = alpha + alpha * beta * j + gamma * seasonal_hit
+        variance_factor = 1 + np.concatenate([np.zeros((len(c), 1)), np.cumsum(c * c, axis=1)], axis=1)
+
+    spread = INTERVAL_Z[level] * np.asarray(state['sigma'])[:, None] * np.sqrt(variance_factor)
+    return np.clip(forecast, 0, 100), np.clip(forecast - spread, 0, 100), np.clip(forecast + spread, 0, 100)
+
+
+def fit(values, method='holt_winters', season=None):
+    """Fit `method` to every row of values"""
+    if method == 'seasonal_naive':
+        return fit_seasonal_naive(values, season)
+    return fit_holt_winters(values, season)
+
+
+def state_row(state, row):
+    """One series' state in JSON-friendly form, for caching"""
+    return {key: (value[row].tolist() if isinstance(value, np.ndarray) else value)
+            for key, value in state.items()}
+
+
+def stack_states(states):
+    """Turn a list of state_row dicts back into one array state"""
+    stacked = {key: states[0][key] for key in ('method', 'season')}
+    for key in ('level', 'trend', 'seasonal', 'sigma', 'alpha', 'beta', 'gamma'):
+        stacked[key] = np.array([state[key] for state in states], dtype=np.float64)
+    return stacked
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Keyword Packing
+🧮 Fetch up to five keywords per TIMESERIES call and split them back out
+
+SerpAPI's google_trends engine accepts up to five comma-separated queries
+for one credit, but scales every series in the call against the largest
+peak among them. Unpacked series are rescaled so each one peaks at 100,
+exactly as a single-keyword fetch would report it.
+"""
+
+import numpy as np
+
+from timeseries import point_timestamp
+
+MAX_KEYWORDS_PER_CALL = 5
+
+# Packed series peaking below this are too coarse to rescale (a peak of 2
+# can only become 0, 50 or 100) and should be re-fetched alone. That
+# includes a peak of 0: a keyword dwarfed by its neighbours reads all
+# zeros packed but has a real curve when fetched alone.
+MIN_PACKED_PEAK = 5
+
+
+def is_packable(keyword):
+    """Keywords containing commas cannot share a comma-separated query"""
+    return ',' not in keyword
+
+
+def pack_entries(entries, keyword_of, size=MAX_KEYWORDS_PER_CALL):
+    """Group entries so each group spans at most `size` distinct keywords
+
+    Entries sharing a keyword (case-insensitively) always land in the same
+    group, so one upstream call serves all of them.
+    """
+    by_keyword = {}
+    for entry in entries:
+        by_keyword.setdefault(keyword_of(entry).lower(), []).append(entry)
+
+    keyword_groups = list(by_keyword.values())
+    return [
+        [entry for group in keyword_groups[start:start + size] for entry in group]
+        for start in range(0, len(keyword_groups), size)
+    ]
+
+
+def parse_packed_timeline(result, keywords):
+    """Split a multi-keyword TIMESERIES result into dates, epoch timestamps and a (keywords x points) matrix"""
+    timeline = result.get('interest_over_time', {}).get('timeline_data', [])
+    dates = [point.get('date', '') for point in timeline]
+    timestamps = [point_timestamp(point) for point in timeline]
+    matrix = np.zeros((len(keywords), len(timeline)), dtype=np.float64)
+
+    for column, point in enumerate(timeline):
+        for row, value in enumerate(point.get('values', [])[:len(keywords)]):
+            matrix[row, column] = value.get('extracted_value', 0) or 0
+
+    return dates, timestamps, matrix
+
+
+def renormalize_rows(matrix):
+    """Rescale each row so its own peak is 100; all-zero rows stay zero
+
+    Returns (rescaled integer matrix, packed peak per row).
+    """
+    peaks = matrix.max(axis=1) if matrix.size else np.zeros(matrix.shape[0])
+    scale = np.divide(100.0, peaks, out=np.zeros_like(peaks, dtype=np.float64), where=peaks > 0)
+    rescaled = np.rint(matrix * scale[:, np.newaxis]).astype(np.int64)
+    return rescaled, peaks
+
+
+def split_packed_result(result, keywords):
+    """Turn a packed TIMESERIES result into per-keyword interest_over_time lists
+
+    Returns (series, coarse): series maps each keyword to its rescaled
+    [{'date', 'timestamp', 'value'}] list; coarse lists keywords whose packed peak fell
+    below MIN_PACKED_PEAK and should be re-fetched alone.
+    """
+    dates, timestamps, matrix = parse_packed_timeline(result, keywords)
+    rescaled, peaks = renormalize_rows(matrix)
+
+    series = {}
+    coarse = []
+    for row, keyword in enumerate(keywords):
+        if peaks[row] < MIN_PACKED_PEAK:
+            coarse.append(keyword)
+            continue
+        series[keyword] = [
+            {'date': date, 'timestamp': timestamp, 'value': int(value)}
+            for date, timestamp, value in zip(dates, timestamps, rescaled[row])
+        ]
+    return series, coarse
+
+
+def chain_groups(keywords, anchor, size=MAX_KEYWORDS_PER_CALL):
+    """Split keywords into groups of `size` that all start with the anchor
+
+    Every group shares the anchor so their scales can be chained together.
+    """
+    others = [keyword for keyword in keywords if keyword != anchor]
+    step = size - 1
+    return [[anchor] + others[start:start + step] for start in range(0, len(others), step)] or [[anchor]]
+
+
+def stitch_groups(matrices):
+    """Rescale anchor-led group matrices onto one common 0-100 scale
+
+    Each matrix is (group keywords x points) with the anchor in row 0.
+    Group g is scaled by the ratio of the anchor's total interest in the
+    first group to its total in group g, then everything is rescaled so
+    the overall peak is 100. Returns (anchor row + every group's other
+    rows) as one float matrix.
+
+    Raises ValueError if the anchor has no interest in some group, since
+    that group cannot be placed on the common scale.
+    """
+    points = min(matrix.shape[1] for matrix in matrices)
+    matrices = [matrix[:, :points] for matrix in matrices]
+
+    anchor_totals = np.array([matrix[0].sum() for matrix in matrices])
+    if np.any(anchor_totals <= 0):
+        raise ValueError('Anchor keyword has no interest in at least one group; choose a more popular anchor')
+
+    factors = anchor_totals[0] / anchor_totals
+    rows = np.concatenate(
+        [matrices[0][:1]] + [matrix[1:] * factor for matrix, factor in zip(matrices, factors)]
+    )
+
+    peak = rows.max() if rows.size else 0
+    return rows * (100.0 / peak) if peak > 0 else rows
+
+
+def parse_region_breakdown(result, keywords):
+    """Split a multi-keyword GEO_MAP result into region codes, names and a (keywords x regions) matrix
+
+    Values are each keyword's share of searches among the compared keywords
+    in that region.
+    """
+    regions = result.get('compared_breakdown_by_region', [])
+    codes = [region.get('geo') or region.get('location_code', '') for region in regions]
+    names = [region.get('location', '') for region in regions]
+    matrix = np.zeros((len(keywords), len(regions)), dtype=np.float64)
+
+    for column, region in enumerate(regions):
+        for row, value in enumerate(region.get('values', [])[:len(keywords)]):
+            matrix[row, column] = value.get('extracted_value', 0) or 0
+
+    return codes, names, matrix
+
+
+def stitch_region_groups(groups):
+    """Chain anchor-led regional breakdowns into one (keywords x regions) share matrix
+
+    Each group is (codes, names, matrix) with the anchor in row 0. Within a
+    region, a keyword's ratio to the anchor carries across groups, so every
+    group is scaled by the anchor's share in the first group over its share
+    in that group, and each region's column is renormalized to sum to 100.
+    Regions a group lacks, or where its anchor share is zero, become NaN.
+    """
+    codes, names = [], []
+    for group_codes, group_names, _ in groups:
+        for code, name in zip(group_codes, group_names):
+            if code not in codes:
+                codes.append(code)
+                names.append(name)
+    position = {code: column for column, code in enumerate(codes)}
+
+    aligned = []
+    for group_codes, _, matrix in groups:
+        full = np.full((matrix.shape[0], len(codes)), np.nan)
+        full[:, [position[code] for code in group_codes]] = matrix
+        aligned.append(full)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        base = aligned[0][0]
+        rows = [aligned[0][:1]]
+        for full in aligned:
+            factor = np.where((full[0] > 0) & (base > 0), base / full[0], np.nan)
+            rows.append(full[1:] * factor)
+        stitched = np.concatenate(rows)
+        totals = np.nansum(stitched, axis=0)
+        shares = np.where(totals > 0, stitched * (100.0 / totals), np.nan)
+
+    return codes, names, shares
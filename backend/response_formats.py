@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Response Formats
+📦 Columnar and MessagePack layouts for timeseries payloads
+
+Row-per-point payloads repeat every key on every row; the columnar
+layout sends one epoch-seconds date array plus one value array per
+series. MessagePack carries the same columnar payload in binary for
+machine clients.
+"""
+
+from timeseries import point_timestamp
+
+try:
+    import msgpack
+except ImportError:  # MessagePack output is optional
+    msgpack = None
+
+RESPONSE_FORMATS = ('json', 'columnar', 'msgpack')
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+
+def columnar_series(series, name):
+    """{'dates', 'series': {name: values}} for a [{'date', 'value'}] series"""
+    return {
+        'dates': [point_timestamp(point) for point in series],
+        'series': {name: [point['value'] for point in series]},
+    }
+
+
+def columnar_matrix(timestamps, names, rows):
+    """{'dates', 'series'} for one value row per name over shared epoch timestamps"""
+    return {
+        'dates': list(timestamps),
+        'series': dict(zip(names, rows)),
+    }
+
+
+def pack_msgpack(payload):
+    """Serialize a payload to MessagePack bytes"""
+    if msgpack is None:
+        raise RuntimeError('MessagePack output requires the msgpack package')
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def format_available(fmt):
+    """Whether the optional dependency behind a format is installed"""
+    return fmt != 'msgpack' or msgpack is not None
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Series Archive
+🗃️ Every REAL interest_over_time series fetched, kept as memory-mapped columns
+
+Two append-only column files hold every archived point: int64 epoch
+seconds and uint8 values (0-100). A small SQLite index maps each
+(keyword, geo, granularity) to its latest slice of those columns, so bulk
+scans read straight from the memory map without parsing JSON or calling
+SerpAPI. A re-fetched series is appended and the index repointed; compact()
+reclaims the superseded slices.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from timeseries import infer_granularity, series_arrays
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within one process
+    fcntl = None
+
+DEFAULT_ARCHIVE_PATH = os.environ.get(
+    'SERIES_ARCHIVE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'series')
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    keyword TEXT NOT NULL,
+    geo TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    first_ts INTEGER NOT NULL,
+    last_ts INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY (keyword, geo, granularity)
+) WITHOUT ROWID;
+"""
+
+# Sampling step (seconds) of each granularity, for window coverage checks
+GRANULARITY_STEPS = {
+    'minute': 60,
+    'hourly': 3600,
+    'daily': 86400,
+    'weekly': 7 * 86400,
+    'monthly': 31 * 86400,
+}
+
+TIMESTAMP_DTYPE = np.dtype('<i8')
+VALUE_DTYPE = np.dtype('u1')
+
+
+def archive_keyword(keyword):
+    """Archive key for a keyword: case and surrounding space do not matter"""
+    return keyword.strip().lower()
+
+
+class SeriesArchive:
+    """Columnar, memory-mapped store of interest_over_time series"""
+
+    def __init__(self, path=DEFAULT_ARCHIVE_PATH):
+        self.path = str(path)
+        self.timestamps_path = os.path.join(self.path, 'timestamps.i8')
+        self.values_path = os.path.join(self.path, 'values.u1')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._maps = {}  # path -> ((inode, size), memmap)
+
+    def connection(self):
+        """This thread's index connection, creating the archive on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(self.path, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.path, 'index.db'), timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def store(self, keyword, geo, series):
+        """Archive a [{'date', 'value'}] series, returning its granularity
+
+        Returns None when no point has a parseable date. Re-archiving an
+        identical series writes nothing.
+        """
+        timestamps, values = series_arrays(series)
+        if not len(timestamps):
+            return None
+        granularity = infer_granularity(timestamps)
+        keyword = archive_keyword(keyword)
+
+        existing = self.load(keyword, geo, granularity)
+        if existing is not None and np.array_equal(existing[0], timestamps) \
+                and np.array_equal(existing[1], values):
+            return granularity
+
+        conn = self.connection()
+        with self._lock, self._file_lock():
+            offset = self._append(timestamps, values)
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO series '
+                    '(keyword, geo, granularity, offset, length, first_ts, last_ts, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (keyword, geo, granularity, offset, len(timestamps),
+                     int(timestamps[0]), int(timestamps[-1]), int(time.time()))
+                )
+        return granularity
+
+    def entries(self, geo=None, granularity=None):
+        """Index rows for archived series, optionally filtered"""
+        sql = 'SELECT * FROM series WHERE 1 = 1'
+        params = []
+        if geo:
+            sql += ' AND geo = ?'
+            params.append(geo)
+        if granularity:
+            sql += ' AND granularity = ?'
+            params.append(granularity)
+        return [dict(row) for row in self.connection().execute(sql + ' ORDER BY keyword, geo', params)]
+
+    def load(self, keyword, geo, granularity=None):
+        """(timestamps, values) read-only views of one series, or None
+
+        Without granularity, the most recently archived one is returned.
+        """
+        sql = 'SELECT offset, length FROM series WHERE keyword = ? AND geo = ?'
+        params = [archive_keyword(keyword), geo]
+        if granularity:
+            sql += ' AND granularity = ?'
+            params.append(granularity)
+        row = self.connection().execute(sql + ' ORDER BY updated_at DESC LIMIT 1', params).fetchone()
+        if row is None:
+            return None
+        return self.slice(row['offset'], row['length'])
+
+    def load_window(self, keyword, geo, start, end):
+        """(timestamps, values) of the newest series spanning [start, end], or None
+
+        The index is not keyed by timeframe, so a slice only stands in for a
+        window when both its ends fall within two sampling steps (plus a
+        day) of the window's: upstream buckets never line up exactly, and
+        a 12-month series must not answer for a 5-year window or vice versa.
+        """
+        rows = self.connection().execute(
+            'SELECT offset, length, granularity, first_ts, last_ts FROM series '
+            'WHERE keyword = ? AND geo = ? ORDER BY updated_at DESC',
+            (archive_keyword(keyword), geo)
+        ).fetchall()
+        for row in rows:
+            slack = 2 * GRANULARITY_STEPS.get(row['granularity'], 86400) + 86400
+            if abs(row['first_ts'] - start) <= slack and abs(row['last_ts'] - end) <= slack:
+                return self.slice(row['offset'], row['length'])
+        return None
+
+    def slice(self, offset, length):
+        """Read-only views of one archived slice, as named by an index row"""
+        timestamps, values = self.columns()
+        return timestamps[offset:offset + length], values[offset:offset + length]
+
+    def columns(self):
+        """Whole memory-mapped columns, for scans over many series at once"""
+        return self._map(self.timestamps_path, TIMESTAMP_DTYPE), self._map(self.values_path, VALUE_DTYPE)
+
+    def compact(self):
+        """Rewrite the columns keeping only slices the index points at
+
+        Returns the number of points reclaimed. Run it while no other
+        process is archiving.
+        """
+        conn = self.connection()
+        with self._lock, self._file_lock():
+            rows = conn.execute('SELECT keyword, geo, granularity, offset, length FROM series').fetchall()
+            timestamps, values = self.columns()
+            live = [(row, timestamps[row['offset']:row['offset'] + row['length']],
+                     values[row['offset']:row['offset'] + row['length']]) for row in rows]
+            total = len(values)
+
+            with open(self.timestamps_path + '.tmp', 'wb') as ts_file, \
+                    open(self.values_path + '.tmp', 'wb') as value_file:
+                offset = 0
+                updates = []
+                for row, ts_slice, value_slice in live:
+                    ts_file.write(np.ascontiguousarray(ts_slice).tobytes())
+                    value_file.write(np.ascontiguousarray(value_slice).tobytes())
+                    updates.append((offset, row['keyword'], row['geo'], row['granularity']))
+                    offset += len(value_slice)
+
+            with conn:
+                conn.executemany(
+                    'UPDATE series SET offset = ? WHERE keyword = ? AND geo = ? AND granularity = ?', updates
+                )
+                os.replace(self.timestamps_path + '.tmp', self.timestamps_path)
+                os.replace(self.values_path + '.tmp', self.values_path)
+            return total - offset
+
+    def stats(self):
+        """Archive size for the health endpoint"""
+        row = self.connection().execute(
+            'SELECT COUNT(*) AS series, COALESCE(SUM(length), 0) AS points FROM series'
+        ).fetchone()
+        stored = os.path.getsize(self.values_path) if os.path.exists(self.values_path) else 0
+        return {'series': row['series'], 'points': row['points'], 'stored_points': stored}
+
+    def _append(self, timestamps, values):
+        """Append one series to both columns, returning its offset"""
+        with open(self.values_path, 'ab') as value_file, open(self.timestamps_path, 'ab') as ts_file:
+            offset = value_file.tell()
+            # Heal a torn earlier append so both columns stay the same length
+            ts_file.truncate(offset * TIMESTAMP_DTYPE.itemsize)
+            ts_file.write(timestamps.astype(TIMESTAMP_DTYPE).tobytes())
+            value_file.write(values.astype(VALUE_DTYPE).tobytes())
+        return offset
+
+    def _map(self, path, dtype):
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            return np.empty(0, dtype=dtype)
+        identity = (info.st_ino, info.st_size)
+        cached = self._maps.get(path)
+        if cached is not None and cached[0] == identity:
+            return cached[1]
+        mapped = np.memmap(path, dtype=dtype, mode='r') if info.st_size else np.empty(0, dtype=dtype)
+        # Only whole items: a concurrent append may be half-written
+        mapped = mapped[:info.st_size // dtype.itemsize]
+        self._maps[path] = (identity, mapped)
+        return mapped
+
+    def _file_lock(self):
+        return _FileLock(os.path.join(self.path, 'write.lock'))
+
+
+class _FileLock:
+    """Exclusive advisory lock serializing writers across processes"""
+
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.handle = open(self.path, 'a')
+        if fcntl is not None:
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self.handle, fcntl.LOCK_UN)
+        self.handle.close()
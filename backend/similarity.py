@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Shape Similarity Index
+🧬 Find archived series whose curve looks like a given one
+
+Every archived series is resampled to a fixed number of points and
+z-normalized to unit length, so a dot product is the Pearson correlation
+of the two shapes. Small corpora are searched exhaustively; large ones
+get an IVF partition (spherical k-means lists) and only the lists nearest
+the query are scanned.
+"""
+
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SHAPE_POINTS = 64
+BRUTE_FORCE_MAX = int(os.environ.get('SIMILAR_BRUTE_FORCE_MAX', 100_000))
+SIMILAR_INDEX_TTL = int(os.environ.get('SIMILAR_INDEX_TTL', 300))
+IVF_MAX_LISTS = 256
+IVF_PROBES = 8
+IVF_TRAIN_SAMPLE = 50_000
+IVF_ITERATIONS = 8
+BUILD_CHUNK = 65536
+
+
+def shape_vectors(values, points=SHAPE_POINTS):
+    """Resample (series x length) values to `points` and z-normalize each row to unit length
+
+    Constant rows have no shape and come back as zero vectors.
+    """
+    values = np.asarray(values, dtype=np.float32)
+    length = values.shape[1]
+    if length == 1:
+        resampled = np.repeat(values, points, axis=1)
+    else:
+        position = np.linspace(0, length - 1, points)
+        left = np.floor(position).astype(int).clip(0, length - 2)
+        weight = (position - left).astype(np.float32)
+        resampled = values[:, left] * (1 - weight) + values[:, left + 1] * weight
+    centered = resampled - resampled.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centered, axis=1, keepdims=True)
+    return np.divide(centered, norms, out=np.zeros_like(centered), where=norms > 1e-3)
+
+
+class ShapeIndex:
+    """Unit shape vectors with exact or IVF nearest-neighbour search"""
+
+    def __init__(self, keys, vectors, brute_force_max=BRUTE_FORCE_MAX, seed=0):
+        self.keys = keys
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.centroids = None
+        if len(keys) > brute_force_max:
+            self._build_ivf(np.random.default_rng(seed))
+
+    def query(self, vector, limit=10, exclude=None):
+        """[(key, similarity)] for the `limit` most similar shapes"""
+        vector = np.asarray(vector, dtype=np.float32)
+        if self.centroids is None:
+            candidates = None
+            scores = self.vectors @ vector
+        else:
+            nearest = np.argsort(-(self.centroids @ vector))[:IVF_PROBES]
+            candidates = np.concatenate([self.order[self.starts[c]:self.starts[c + 1]] for c in nearest])
+            scores = self.vectors[candidates] @ vector
+
+        wanted = min(limit + 1, len(scores))
+        if not wanted:
+            return []
+        top = np.argpartition(-scores, wanted - 1)[:wanted]
+        top = top[np.argsort(-scores[top])]
+        results = []
+        for position in top:
+            key = self.keys[position if candidates is None else candidates[position]]
+            if key != exclude and len(results) < limit:
+                results.append((key, float(scores[position])))
+        return results
+
+    def _build_ivf(self, rng):
+        """Spherical k-means on a sample, then one inverted list per centroid"""
+        count = len(self.vectors)
+        lists = int(min(IVF_MAX_LISTS, max(16, np.sqrt(count))))
+        sample = self.vectors[rng.choice(count, min(count, IVF_TRAIN_SAMPLE), replace=False)]
+        centroids = sample[rng.choice(len(sample), lists, replace=False)]
+        for _ in range(IVF_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        assignment = np.concatenate([
+            np.argmax(self.vectors[start:start + 65536] @ centroids.T, axis=1)
+            for start in range(0, count, 65536)
+        ])
+        self.centroids = centroids
+        self.order = np.argsort(assignment, kind='stable')
+        self.starts = np.searchsorted(assignment[self.order], np.arange(lists + 1))
+
+
+class SimilarityIndex:
+    """Per-granularity shape indexes over the series archive, rebuilt in the background"""
+
+    def __init__(self, archive, ttl=SIMILAR_INDEX_TTL):
+        self.archive = archive
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._indexes = {}     # granularity -> (built_at, ShapeIndex)
+        self._building = set()
+
+    def get(self, granularity):
+        """The index for one granularity, building it now if none exists yet
+
+        A stale index keeps serving while its replacement builds.
+        """
+        with self._lock:
+            current = self._indexes.get(granularity)
+            stale = current is not None and time.time() - current[0] > self.ttl
+            if stale and granularity not in self._building:
+                self._building.add(granularity)
+                threading.Thread(target=self._rebuild, args=(granularity,), daemon=True).start()
+        if current is None:
+            current = (time.time(), self.build(granularity))
+            with self._lock:
+                self._indexes[granularity] = current
+        return current[1]
+
+    def build(self, granularity):
+        """Read every archived series of one granularity into a ShapeIndex"""
+        started = time.monotonic()
+        _, values = self.archive.columns()
+        groups = {}
+        for entry in self.archive.entries(granularity=granularity):
+            groups.setdefault(entry['length'], []).append(entry)
+
+        keys, vectors = [], []
+        for length, members in groups.items():
+            # Chunked so only the resampled vectors, not every raw series, sit in memory
+            for start in range(0, len(members), BUILD_CHUNK):
+                chunk = members[start:start + BUILD_CHUNK]
+                offsets = np.array([entry['offset'] for entry in chunk])
+                shapes = shape_vectors(values[offsets[:, np.newaxis] + np.arange(length)])
+                has_shape = np.flatnonzero(shapes.any(axis=1))
+                keys.extend((chunk[i]['keyword'], chunk[i]['geo']) for i in has_shape)
+                vectors.append(shapes[has_shape])
+
+        index = ShapeIndex(keys, np.concatenate(vectors) if vectors else np.zeros((0, SHAPE_POINTS)))
+        logger.info(f"Built {granularity} shape index over {len(keys)} series "
+                    f"({round((time.monotonic() - started) * 1000)}ms, "
+                    f"{'ivf' if index.centroids is not None else 'exact'})")
+        return index
+
+    def _rebuild(self, granularity):
+        try:
+            index = self.build(granularity)
+            with self._lock:
+                self._indexes[granularity] = (time.time(), index)
+        except Exception as e:
+            logger.warning(f"Shape index rebuild failed for {granularity}: {e}")
+        finally:
+            with self._lock:
+                self._building.discard(granularity)
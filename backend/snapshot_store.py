@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Trending Snapshot Store
+🗄️ Every REAL trending_now result, kept in SQLite (WAL mode) for history queries
+
+Snapshots are indexed by (geo, fetched_at) and entries by normalized
+query, so "what trended in KR on date X" and "rank history of query Q"
+never touch SerpAPI. Distinct normalized queries also get an FTS5 trigram
+index, which matches substrings in any script (Korean and Japanese have
+no spaces to tokenize on).
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from trending import normalize_query, rank_changes
+
+DEFAULT_DB_PATH = os.environ.get(
+    'SNAPSHOT_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'trending.db')
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    geo TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_geo_time ON snapshots (geo, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_time ON snapshots (fetched_at);
+
+CREATE TABLE IF NOT EXISTS entries (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    rank INTEGER NOT NULL,
+    query TEXT NOT NULL,
+    query_norm TEXT NOT NULL,
+    PRIMARY KEY (snapshot_id, rank)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entries_query ON entries (query_norm, snapshot_id);
+
+CREATE TABLE IF NOT EXISTS rank_changes (
+    geo TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL,
+    query_norm TEXT NOT NULL,
+    query TEXT NOT NULL,
+    prev_rank INTEGER,
+    rank INTEGER,
+    delta INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rank_changes_geo_time ON rank_changes (geo, fetched_at);
+
+CREATE TABLE IF NOT EXISTS collector_checkpoints (
+    geo TEXT PRIMARY KEY,
+    last_success INTEGER NOT NULL DEFAULT 0,
+    last_attempt INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS collector_calls (
+    called_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_collector_calls_time ON collector_calls (called_at);
+
+CREATE TABLE IF NOT EXISTS queries (
+    id INTEGER PRIMARY KEY,
+    query_norm TEXT NOT NULL UNIQUE
+);
+"""
+
+# Needs SQLite 3.34+ built with FTS5; search falls back to LIKE without it
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS queries_fts USING fts5(
+    query_norm, content='queries', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS queries_fts_insert AFTER INSERT ON queries BEGIN
+    INSERT INTO queries_fts (rowid, query_norm) VALUES (new.id, new.query_norm);
+END;
+"""
+
+# Trigram matching needs at least three characters
+MIN_FTS_TERM = 3
+
+# Distinct queries a search expands to, closest (shortest) first; keeps
+# broad terms like "news" from aggregating most of the history
+MAX_SEARCH_MATCHES = 50
+
+
+class TrendingSnapshotStore:
+    """SQLite-backed history of trending snapshots, one connection per thread"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = str(path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self.fts = False
+
+    def connection(self):
+        """This thread's connection, creating the database on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            with self._init_lock:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=30)
+                conn.row_factory = sqlite3.Row
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                if not self._initialized:
+                    conn.executescript(SCHEMA)
+                    self.fts = self._init_fts(conn)
+                    self._initialized = True
+            self._local.conn = conn
+        return conn
+
+    def record(self, geo, trending_searches, fetched_at=None):
+        """Persist one trending list, returning its snapshot id
+
+        Rank changes against geo's previous snapshot are logged in the same
+        transaction, so movers never need to rescan history. The previous
+        snapshot is read under the write lock: two writers recording one geo
+        at once (collector and web fallback) would otherwise both diff
+        against the same snapshot and break the telescoping deltas.
+        """
+        fetched_at = int(fetched_at if fetched_at is not None else time.time())
+        conn = self.connection()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            previous = self.latest_before(geo, fetched_at)
+            conn.executemany(
+                'INSERT INTO rank_changes (geo, fetched_at, query_norm, query, prev_rank, rank, delta) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(geo, fetched_at) + change for change in
+                 rank_changes(previous['trending_searches'] if previous else [], trending_searches)]
+            )
+            cursor = conn.execute(
+                'INSERT INTO snapshots (geo, fetched_at) VALUES (?, ?)', (geo, fetched_at)
+            )
+            snapshot_id = cursor.lastrowid
+            rows = [(snapshot_id, item['rank'], item['query'], normalize_query(item['query']))
+                    for item in trending_searches if item.get('query')]
+            conn.executemany(
+                'INSERT OR IGNORE INTO entries (snapshot_id, rank, query, query_norm) VALUES (?, ?, ?, ?)',
+                rows
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO queries (query_norm) VALUES (?)',
+                [(row[3],) for row in rows if row[3]]
+            )
+        return snapshot_id
+
+    def snapshots_between(self, geo, start, end):
+        """Snapshots for geo with start <= fetched_at < end, oldest first, with their entries"""
+        conn = self.connection()
+        rows = conn.execute(
+            'SELECT id, geo, fetched_at FROM snapshots '
+            'WHERE geo = ? AND fetched_at >= ? AND fetched_at < ? ORDER BY fetched_at',
+            (geo, int(start), int(end))
+        ).fetchall()
+        return [self._with_entries(conn, row) for row in rows]
+
+    def get_snapshot(self, snapshot_id):
+        """One snapshot by id, or None"""
+        conn = self.connection()
+        row = conn.execute(
+            'SELECT id, geo, fetched_at FROM snapshots WHERE id = ?', (int(snapshot_id),)
+        ).fetchone()
+        return self._with_entries(conn, row) if row else None
+
+    def max_snapshot_id(self):
+        """Id of the newest snapshot, or 0 when empty"""
+        return self.connection().execute('SELECT COALESCE(MAX(id), 0) FROM snapshots').fetchone()[0]
+
+    def snapshots_after(self, snapshot_id, limit=100):
+        """Snapshots with id greater than snapshot_id, oldest first"""
+        conn = self.connection()
+        rows = conn.execute(
+            'SELECT id, geo, fetched_at FROM snapshots WHERE id > ? ORDER BY id LIMIT ?',
+            (int(snapshot_id), int(limit))
+        ).fetchall()
+        return [self._with_entries(conn, row) for row in rows]
+
+    def latest_before(self, geo, when):
+        """The last snapshot for geo taken at or before `when`, or None"""
+        conn = self.connection()
+        row = conn.execute(
+            'SELECT id, geo, fetched_at FROM snapshots '
+            'WHERE geo = ? AND fetched_at <= ? ORDER BY fetched_at DESC LIMIT 1',
+            (geo, int(when))
+        ).fetchone()
+        return self._with_entries(conn, row) if row else None
+
+    def rank_history(self, query, geo=None, start=0, end=None):
+        """Every (geo, fetched_at, rank) where the normalized query trended, oldest first"""
+        end = int(end if end is not None else time.time() + 1)
+        sql = ('SELECT s.geo, s.fetched_at, e.rank, e.query FROM entries e '
+               'JOIN snapshots s ON s.id = e.snapshot_id '
+               'WHERE e.query_norm = ? AND s.fetched_at >= ? AND s.fetched_at < ?')
+        params = [normalize_query(query), int(start), end]
+        if geo:
+            sql += ' AND s.geo = ?'
+            params.append(geo)
+        sql += ' ORDER BY s.fetched_at'
+        return [dict(row) for row in self.connection().execute(sql, params)]
+
+    def query_sets(self, start, end=None, geos=None):
+        """{geo: set of normalized queries} that trended with start <= fetched_at < end"""
+        end = int(end if end is not None else time.time() + 1)
+        sets = {}
+        rows = self.connection().execute(
+            'SELECT DISTINCT s.geo, e.query_norm FROM snapshots s JOIN entries e ON e.snapshot_id = s.id '
+            "WHERE s.fetched_at >= ? AND s.fetched_at < ? AND e.query_norm != ''",
+            (int(start), end)
+        )
+        for geo, query_norm in rows:
+            if geos is None or geo in geos:
+                sets.setdefault(geo, set()).add(query_norm)
+        return sets
+
+    def search(self, text, geo=None, start=0, end=None, limit=100):
+        """Days on which trending queries containing `text` trended, newest first
+
+        Returns one row per (geo, UTC day, query) with its best rank and how
+        many snapshots it appeared in. The FTS index narrows the distinct
+        queries first (at most MAX_SEARCH_MATCHES), so the entries scan only
+        touches matching queries.
+        """
+        term = normalize_query(text)
+        if not term:
+            return []
+        end = int(end if end is not None else time.time() + 1)
+
+        if self.fts and len(term) >= MIN_FTS_TERM:
+            matches = ('SELECT q.query_norm FROM queries_fts f JOIN queries q ON q.id = f.rowid '
+                       'WHERE queries_fts MATCH ? ORDER BY length(q.query_norm) LIMIT ?')
+            match_param = f'"{term}"'  # normalized terms carry no quotes
+        else:
+            matches = ("SELECT query_norm FROM queries WHERE query_norm LIKE ? ESCAPE '\\' "
+                       'ORDER BY length(query_norm) LIMIT ?')
+            match_param = '%' + re.sub(r'([%_\\])', r'\\\1', term) + '%'
+
+        sql = ("SELECT s.geo, date(s.fetched_at, 'unixepoch') AS date, e.query, "
+               'MIN(e.rank) AS best_rank, COUNT(*) AS snapshots, '
+               'MIN(s.fetched_at) AS first_seen, MAX(s.fetched_at) AS last_seen '
+               'FROM entries e JOIN snapshots s ON s.id = e.snapshot_id '
+               f'WHERE e.query_norm IN ({matches}) AND s.fetched_at >= ? AND s.fetched_at < ?')
+        params = [match_param, MAX_SEARCH_MATCHES, int(start), end]
+        if geo:
+            sql += ' AND s.geo = ?'
+            params.append(geo)
+        sql += ' GROUP BY s.geo, date, e.query_norm ORDER BY date DESC, best_rank LIMIT ?'
+        params.append(int(limit))
+        return [dict(row) for row in self.connection().execute(sql, params)]
+
+    def movers(self, geo, since, limit=10):
+        """Climbers, new entrants and drop-offs for geo since `since`
+
+        Aggregates only the rank-change log inside the window; net climb is
+        the place gain between the window start and the latest snapshot.
+        """
+        conn = self.connection()
+        latest = self.latest_before(geo, time.time())
+        current = {normalize_query(item['query']): item['rank']
+                   for item in (latest['trending_searches'] if latest else [])}
+
+        rows = conn.execute(
+            'SELECT query_norm, query, SUM(delta) AS net_climb, '
+            'SUM(prev_rank IS NULL) AS entries, SUM(rank IS NULL) AS exits, '
+            'MIN(fetched_at) AS first_change, MAX(fetched_at) AS last_change '
+            'FROM rank_changes WHERE geo = ? AND fetched_at >= ? GROUP BY query_norm',
+            (geo, int(since))
+        ).fetchall()
+
+        climbers, new_entrants, drop_offs = [], [], []
+        for row in rows:
+            item = {'query': row['query'], 'net_climb': row['net_climb']}
+            if row['query_norm'] in current:
+                item['rank'] = current[row['query_norm']]
+                if row['entries']:
+                    new_entrants.append(item)
+                if row['net_climb'] > 0:
+                    climbers.append(item)
+            elif row['exits']:
+                item['dropped_at'] = row['last_change']
+                drop_offs.append(item)
+
+        return {
+            'climbers': sorted(climbers, key=lambda item: (-item['net_climb'], item['rank']))[:limit],
+            'new_entrants': sorted(new_entrants, key=lambda item: item['rank'])[:limit],
+            'drop_offs': sorted(drop_offs, key=lambda item: item['net_climb'])[:limit]
+        }
+
+    def checkpoints(self):
+        """Collector checkpoints: {geo: {'last_success', 'last_attempt', 'failures'}}"""
+        rows = self.connection().execute(
+            'SELECT geo, last_success, last_attempt, failures FROM collector_checkpoints'
+        )
+        return {row['geo']: dict(row) for row in rows}
+
+    def save_checkpoint(self, geo, attempted_at, succeeded):
+        """Record one collector attempt for geo, and its upstream call, in one transaction"""
+        attempted_at = int(attempted_at)
+        conn = self.connection()
+        with conn:
+            conn.execute('INSERT INTO collector_calls (called_at) VALUES (?)', (attempted_at,))
+            if succeeded:
+                conn.execute(
+                    'INSERT INTO collector_checkpoints (geo, last_success, last_attempt, failures) '
+                    'VALUES (?, ?, ?, 0) ON CONFLICT (geo) DO UPDATE SET '
+                    'last_success = excluded.last_success, last_attempt = excluded.last_attempt, failures = 0',
+                    (geo, attempted_at, attempted_at)
+                )
+            else:
+                conn.execute(
+                    'INSERT INTO collector_checkpoints (geo, last_attempt, failures) VALUES (?, ?, 1) '
+                    'ON CONFLICT (geo) DO UPDATE SET '
+                    'last_attempt = excluded.last_attempt, failures = failures + 1',
+                    (geo, attempted_at)
+                )
+
+    def calls_since(self, since):
+        """Number of collector upstream calls made at or after `since`"""
+        return self.connection().execute(
+            'SELECT COUNT(*) FROM collector_calls WHERE called_at >= ?', (int(since),)
+        ).fetchone()[0]
+
+    def prune_calls(self, before):
+        """Forget collector calls older than `before`"""
+        conn = self.connection()
+        with conn:
+            conn.execute('DELETE FROM collector_calls WHERE called_at < ?', (int(before),))
+
+    def _init_fts(self, conn):
+        try:
+            conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        # Databases written before the index existed: backfill once
+        if conn.execute('SELECT 1 FROM queries LIMIT 1').fetchone() is None:
+            with conn:
+                conn.execute('INSERT OR IGNORE INTO queries (query_norm) '
+                             "SELECT DISTINCT query_norm FROM entries WHERE query_norm != ''")
+        return True
+
+    def _with_entries(self, conn, row):
+        entries = conn.execute(
+            'SELECT rank, query, query_norm AS key FROM entries WHERE snapshot_id = ? ORDER BY rank', (row['id'],)
+        ).fetchall()
+        return {
+            'id': row['id'],
+            'geo': row['geo'],
+            'fetched_at': row['fetched_at'],
+            'trending_searches': [dict(entry) for entry in entries]
+        }
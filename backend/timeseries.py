@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Timeseries Helpers
+📈 Alignment and columnar layout for interest_over_time series
+"""
+
+import re
+import time
+from calendar import timegm
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+_MONTHS = {name: number for number, name in enumerate(
+    ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], start=1
+)}
+
+# "Jan 2024", "Jan 7, 2024", "Jan 7, 2024 at 3:00 PM", and the start of
+# week ranges like "Jan 1 – 7, 2024" or "Dec 31, 2023 – Jan 6, 2024"
+_SERPAPI_DATE = re.compile(
+    r'^([A-Z][a-z]{2})\s+(?:(\d{4})|(\d{1,2})(?:,\s*(\d{4}))?)'
+    r'(?:\s+at\s+(\d{1,2}):(\d{2})\s*([AP]M))?'
+)
+_YEAR = re.compile(r'(\d{4})\s*$')
+
+# Median spacing (seconds) below which a series counts as each granularity
+_GRANULARITIES = (
+    (3600, 'minute'),
+    (86400, 'hourly'),
+    (7 * 86400, 'daily'),
+    (28 * 86400, 'weekly'),
+)
+
+# Seconds per unit of a relative timeframe ("today 12-m", "now 7-d", "now 4-H")
+_TIMEFRAME_UNITS = {'H': 3600, 'd': 86400, 'm': 30.4375 * 86400, 'y': 365.25 * 86400}
+_RELATIVE_TIMEFRAME = re.compile(r'^(?:today|now)\s+(\d+)-([Hdmy])$')
+_DATE_RANGE_TIMEFRAME = re.compile(r'^(\d{4}-\d{2}-\d{2})\s+(\d{4}-\d{2}-\d{2})$')
+# Google Trends data starts in 2004
+_ALL_START = 1072915200
+
+
+def align_series(series_by_name):
+    """Align several timeline series on one common epoch-seconds index
+
+    Points are keyed by point_timestamp, so series whose date labels are
+    worded differently still line up; points without a usable date are
+    dropped. A series missing a timestamp gets None there. Returns
+    (ascending timestamps, {name: [values]}).
+    """
+    keyed = {
+        name: {
+            timestamp: point['value'] for point in series
+            for timestamp in (point_timestamp(point),) if timestamp is not None
+        }
+        for name, series in series_by_name.items()
+    }
+    timestamps = sorted({timestamp for values in keyed.values() for timestamp in values})
+    columns = {name: [values.get(timestamp) for timestamp in timestamps] for name, values in keyed.items()}
+    return timestamps, columns
+
+
+@lru_cache(maxsize=8192)
+def parse_point_date(text):
+    """Epoch seconds (UTC) for the start of a SerpAPI timeline date, or None
+
+    Memoized: every series of a timeframe repeats the same few hundred dates.
+    """
+    match = _SERPAPI_DATE.match(text.strip())
+    if match and match.group(1) in _MONTHS:
+        month, month_year, day, year, hour, minute, meridiem = match.groups()
+        if month_year:
+            year, day = month_year, 1
+        elif year is None:
+            # "Jan 1 – 7, 2024": the year only appears at the end of the range
+            tail = _YEAR.search(text)
+            if tail is None:
+                return None
+            year = tail.group(1)
+        hour = int(hour or 0) % 12 + (12 if meridiem == 'PM' else 0)
+        return timegm((int(year), _MONTHS[month], int(day), hour, int(minute or 0), 0))
+    try:
+        parsed = datetime.fromisoformat(text.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return timegm(parsed.utctimetuple())
+
+
+def point_timestamp(point):
+    """Epoch seconds for a timeline point: its 'timestamp' when present, else its parsed 'date'
+
+    SerpAPI timeline_data points carry 'timestamp' as a string of epoch
+    seconds; points cached before it was kept only have 'date'.
+    """
+    timestamp = point.get('timestamp')
+    if timestamp not in (None, ''):
+        try:
+            return int(timestamp)
+        except (TypeError, ValueError):
+            pass
+    return parse_point_date(point.get('date', ''))
+
+
+def series_arrays(series):
+    """Columnar (int64 epoch seconds, uint8 values) arrays for a [{'date', 'value'}] series
+
+    Points whose date cannot be parsed are dropped.
+    """
+    timestamps, values = [], []
+    for point in series:
+        timestamp = point_timestamp(point)
+        if timestamp is not None:
+            timestamps.append(timestamp)
+            values.append(point.get('value') or 0)
+    return (np.array(timestamps, dtype=np.int64),
+            np.clip(np.array(values, dtype=np.float64), 0, 255).round().astype(np.uint8))
+
+
+def timeframe_window(timeframe, now=None):
+    """(start, end) epoch seconds a SerpAPI timeframe covers, or None if not understood"""
+    now = int(time.time() if now is None else now)
+    timeframe = (timeframe or '').strip()
+    if timeframe == 'all':
+        return _ALL_START, now
+    match = _RELATIVE_TIMEFRAME.match(timeframe)
+    if match:
+        return now - int(int(match.group(1)) * _TIMEFRAME_UNITS[match.group(2)]), now
+    match = _DATE_RANGE_TIMEFRAME.match(timeframe)
+    if match:
+        start, end = (parse_point_date(date) for date in match.groups())
+        if start is not None and end is not None and start <= end:
+            return start, end + 86400
+    return None
+
+
+def infer_granularity(timestamps):
+    """Name the sampling interval of a series from its median spacing"""
+    if len(timestamps) < 2:
+        return 'single'
+    step = float(np.median(np.diff(timestamps)))
+    for limit, name in _GRANULARITIES:
+        if step < limit:
+            return name
+    return 'monthly'
+
+
+def lttb_indices(values, points):
+    """Positions kept by Largest-Triangle-Three-Buckets downsampling to `points`
+
+    values is (series x length) and x is the point position. With several
+    series the triangle areas are summed, so all series share one index set
+    and stay aligned on the same dates. First and last points are always kept.
+    """
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    length = values.shape[1]
+    if points >= length or points < 3:
+        return np.arange(length)
+
+    # points - 2 middle buckets over positions 1 .. length - 2
+    edges = (np.arange(points - 1) * ((length - 2) / (points - 2))).astype(np.int64) + 1
+    edges[-1] = length - 1
+    sums = np.add.reduceat(values[:, 1:length - 1], edges[:-1] - 1, axis=1)
+    widths = np.diff(edges)
+    # Each bucket is scored against the mean of the bucket after it (the last point for the final one)
+    next_x = np.append(((edges[:-1] + edges[1:] - 1) / 2)[1:], length - 1)
+    next_y = np.hstack([(sums / widths)[:, 1:], values[:, -1:]])
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, length - 1
+    anchor = 0
+    # Each pick depends on the previous one, so only the bucket loop is sequential
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        anchor_y = values[:, anchor:anchor + 1]
+        areas = np.abs(
+            (anchor - next_x[bucket]) * (values[:, start:end] - anchor_y)
+            - (anchor - np.arange(start, end)) * (next_y[:, bucket:bucket + 1] - anchor_y)
+        ).sum(axis=0)
+        anchor = start + int(np.argmax(areas))
+        selected[bucket + 1] = anchor
+    return selected
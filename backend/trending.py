@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Trending Aggregation
+🔥 Cross-country views computed from cached per-country trending lists
+"""
+
+import heapq
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+import numpy as np
+
+MAX_RANK = 20
+
+_PUNCTUATION = re.compile(r'[^\w\s]', re.UNICODE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_query(query):
+    """Normalize a trending query so near-duplicates share one key
+
+    NFKC folds full-width and compatibility forms (common in Japanese and
+    Korean feeds), casefold handles case across scripts, diacritics are
+    stripped ("Pokémon" == "pokemon") and punctuation and spacing are
+    collapsed.
+    """
+    text = unicodedata.normalize('NFKC', query).casefold()
+    text = ''.join(
+        char for char in unicodedata.normalize('NFKD', text)
+        if not unicodedata.combining(char)
+    )
+    text = _PUNCTUATION.sub(' ', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def rank_weight(rank):
+    """Linear rank weight: #1 scores 1.0, #20 scores 0.05"""
+    return max(MAX_RANK + 1 - rank, 0) / MAX_RANK
+
+
+class GlobalTrendingAggregate:
+    """Rank-weighted global trending list, updated one country at a time
+
+    Each country's contribution is remembered so a refreshed snapshot
+    replaces it in O(list size) instead of recomputing every country.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contributions = {}   # geo -> {key: weight}
+        self._versions = {}        # geo -> snapshot timestamp
+        self._labels = {}          # geo -> {key: original query}
+        self._scores = {}          # key -> total weight
+
+    def version(self, geo):
+        """Timestamp of the snapshot currently counted for geo, if any"""
+        return self._versions.get(geo)
+
+    def update(self, geo, trending_searches, version=None):
+        """Replace geo's contribution with a new trending list"""
+        contribution = {}
+        labels = {}
+        for item in trending_searches:
+            key = normalize_query(item.get('query', ''))
+            if not key:
+                continue
+            weight = rank_weight(item.get('rank', MAX_RANK))
+            if weight > contribution.get(key, 0):
+                contribution[key] = weight
+                labels[key] = item['query']
+
+        with self._lock:
+            self._apply(self._contributions.get(geo, {}), -1)
+            self._apply(contribution, 1)
+            self._contributions[geo] = contribution
+            self._labels[geo] = labels
+            self._versions[geo] = version
+
+    def remove(self, geo):
+        """Drop geo's contribution entirely"""
+        with self._lock:
+            self._apply(self._contributions.pop(geo, {}), -1)
+            self._labels.pop(geo, None)
+            self._versions.pop(geo, None)
+
+    def geos(self):
+        """Countries currently included"""
+        return sorted(self._contributions)
+
+    def top(self, limit=20):
+        """Highest scoring queries with the countries they trend in"""
+        with self._lock:
+            best = heapq.nlargest(limit, self._scores.items(), key=lambda entry: (entry[1], entry[0]))
+            results = []
+            for rank, (key, score) in enumerate(best, start=1):
+                countries = sorted(geo for geo, labels in self._labels.items() if key in labels)
+                # Show the spelling used by the country where it ranks highest
+                label_geo = max(countries, key=lambda geo: self._contributions[geo][key])
+                results.append({
+                    'rank': rank,
+                    'query': self._labels[label_geo][key],
+                    'score': round(score, 3),
+                    'countries': countries
+                })
+            return results
+
+    def _apply(self, contribution, sign):
+        for key, weight in contribution.items():
+            score = self._scores.get(key, 0) + sign * weight
+            if score > 1e-9:
+                self._scores[key] = score
+            else:
+                self._scores.pop(key, None)
+
+
+def rank_changes(previous, current):
+    """Rank changes between two consecutive trending lists for one geo
+
+    Each list is [{'rank', 'query'}]. Returns (query_norm, query,
+    prev_rank, rank, delta) tuples where a missing rank is None and delta
+    counts places climbed, treating "not listed" as rank MAX_RANK + 1.
+    Deltas therefore telescope: summed over any window they equal the net
+    climb between the window's first and last list.
+    """
+    def by_key(items):
+        ranks = {}
+        for item in items:
+            key = normalize_query(item.get('query', ''))
+            if key and key not in ranks:
+                ranks[key] = (item['rank'], item['query'])
+        return ranks
+
+    before, after = by_key(previous), by_key(current)
+    unlisted = MAX_RANK + 1
+    changes = []
+    for key, (rank, query) in after.items():
+        prev_rank = before[key][0] if key in before else None
+        delta = (prev_rank or unlisted) - rank
+        if delta:
+            changes.append((key, query, prev_rank, rank, delta))
+    for key, (prev_rank, query) in before.items():
+        if key not in after:
+            changes.append((key, query, prev_rank, None, prev_rank - unlisted))
+    return changes
+
+
+def trending_diff(previous, current):
+    """Changes that turn one trending list into another
+
+    Returns {'inserted': [{'rank', 'query', 'key'}], 'removed': [{'query',
+    'key'}], 'moved': [{'query', 'key', 'from', 'to'}]}; all empty when
+    nothing changed. `key` is the normalized query, so clients match
+    entries whose spelling changed between lists ("Pokémon" -> "Pokemon").
+    """
+    changes = {'inserted': [], 'removed': [], 'moved': []}
+    for key, query, prev_rank, rank, _ in rank_changes(previous, current):
+        if prev_rank is None:
+            changes['inserted'].append({'rank': rank, 'query': query, 'key': key})
+        elif rank is None:
+            changes['removed'].append({'query': query, 'key': key})
+        else:
+            changes['moved'].append({'query': query, 'key': key, 'from': prev_rank, 'to': rank})
+    return changes
+
+
+def overlap_matrix(query_sets):
+    """Pairwise Jaccard similarity of per-geo sets of normalized queries
+
+    Queries trending in only one geo never contribute to an intersection,
+    so the geo x query incidence matrix keeps only shared queries and one
+    matrix product yields every pairwise intersection. Returns (geos,
+    jaccard, shared) with geos sorted and both matrices indexed alike.
+    """
+    geos = sorted(query_sets)
+    sizes = np.array([len(query_sets[geo]) for geo in geos], dtype=np.float64)
+    counts = Counter(key for geo in geos for key in query_sets[geo])
+    columns = {key: column for column, key in enumerate(key for key, count in counts.items() if count > 1)}
+
+    rows, cols = [], []
+    for row, geo in enumerate(geos):
+        for key in query_sets[geo]:
+            column = columns.get(key)
+            if column is not None:
+                rows.append(row)
+                cols.append(column)
+
+    incidence = np.zeros((len(geos), len(columns)), dtype=np.float32)
+    incidence[rows, cols] = 1
+    shared = (incidence @ incidence.T).astype(np.float64)
+    np.fill_diagonal(shared, sizes)
+
+    union = sizes[:, None] + sizes[None, :] - shared
+    jaccard = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+    return geos, jaccard, shared.astype(np.int64)
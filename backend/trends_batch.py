@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Batch Engine
+📦 Bounded fan-out of many keyword/geo lookups over a shared executor
+"""
+
+from concurrent.futures import FIRST_COMPLETED, wait
+
+BATCH_FIELDS = ('interest_over_time', 'interest_by_region', 'related_queries')
+BATCH_DEFAULT_FIELDS = ['interest_over_time']
+
+
+def normalize_batch_item(item, default_geo='US', default_timeframe='today 12-m'):
+    """Validate one batch item and fill in defaults
+
+    Raises ValueError with a user-facing message for invalid items.
+    """
+    if not isinstance(item, dict):
+        raise ValueError('Batch item must be an object')
+
+    keyword = str(item.get('keyword', '')).strip()
+    if not keyword:
+        raise ValueError('Keyword is required')
+
+    fields = item.get('fields') or BATCH_DEFAULT_FIELDS
+    if isinstance(fields, str):
+        fields = [fields]
+    unknown = [field for field in fields if field not in BATCH_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(map(str, unknown))}")
+
+    return {
+        'keyword': keyword,
+        'geo': item.get('geo') or default_geo,
+        'timeframe': item.get('timeframe') or default_timeframe,
+        'fields': list(dict.fromkeys(fields))
+    }
+
+
+def run_bounded(items, func, executor, window):
+    """Run func(item) on executor, yielding (index, future) as each completes
+
+    At most `window` items are in flight; the next item is only submitted
+    once the caller consumes a result, so a slow consumer (e.g. a slow
+    client reading a streamed response) throttles upstream work.
+    """
+    pending = {}
+    queue = iter(enumerate(items))
+
+    def fill():
+        while len(pending) < window:
+            try:
+                index, item = next(queue)
+            except StopIteration:
+                return
+            pending[executor.submit(func, item)] = index
+
+    fill()
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future
+        fill()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+World Trends Explorer - Response Cache
+💾 TTL cache for REAL SerpAPI results, shared by every endpoint
+
+In-process LRU by default; set REDIS_URL to share entries between
+gunicorn workers and background processes.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # Redis is optional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = int(os.environ.get('CACHE_TTL', 3600))
+DEFAULT_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 10000))
+
+
+def make_key(*parts):
+    """Build a cache key from its parts, e.g. make_key('leg', 'TIMESERIES', 'US', 'bitcoin')"""
+    return ':'.join(str(part) for part in parts)
+
+
+class TrendsCache:
+    """Thread-safe TTL cache with optional Redis backend"""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, redis_client=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls):
+        """Create a cache, using Redis when REDIS_URL is set and redis is installed"""
+        redis_url = os.environ.get('REDIS_URL', '')
+        if redis_url and redis is not None:
+            try:
+                client = redis.Redis.from_url(redis_url)
+                client.ping()
+                logger.info("Using Redis cache backend")
+                return cls(redis_client=client)
+            except Exception as e:
+                logger.warning(f"Redis unavailable, falling back to memory cache: {e}")
+        return cls()
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(key)
+            except Exception as e:
+                logger.warning(f"Redis get failed: {e}")
+                raw = None
+            value = json.loads(raw) if raw is not None else None
+            self._count(value is not None)
+            return value
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable value for ttl seconds"""
+        ttl = ttl or self.ttl
+        if self.redis is not None:
+            try:
+                self.redis.setex(key, ttl, json.dumps(value))
+            except Exception as e:
+                logger.warning(f"Redis set failed: {e}")
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_fetch(self, key, fetch, ttl=None):
+        """Return (value, cached), calling fetch() and storing its result on a miss"""
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = fetch()
+        self.set(key, value, ttl)
+        return value, False
+
+    def clear(self):
+        """Drop every in-process entry"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Cache statistics for the health endpoint"""
+        return {
+            'backend': 'redis' if self.redis is not None else 'memory',
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
@@ -7,6 +7,7 @@ class TrendsAPI {
     constructor(baseURL = 'http://localhost:5000/api/trends') {  // 🔧 Changed from 5555 to 5000
         this.baseURL = baseURL;
         this.cache = new Map();
+        this.trendingSnapshots = new Map(); // geo -> last full trending response (for since= diffs)
         this.requestTimeout = 30000; // 30 seconds
     }
 
@@ -30,6 +31,10 @@ class TrendsAPI {
 
             clearTimeout(timeoutId);
 
+            if (response.status === 304 && options.allowNotModified) {
+                return null;
+            }
+
             if (!response.ok) {
                 throw new Error(`HTTP ${response.status}: ${response.statusText}`);
             }
@@ -78,14 +83,15 @@ class TrendsAPI {
     }
 
     /**
-     * Search trends for a keyword
+     * Search trends for a keyword.
+     * `points` asks the server to downsample interest_over_time to at most that many points.
      */
-    async searchTrends(keyword, geo = '', timeframe = 'today 12-m') {
+    async searchTrends(keyword, geo = '', timeframe = 'today 12-m', points = null) {
         if (!keyword || keyword.trim() === '') {
             throw new Error('Keyword is required');
         }
 
-        const cacheKey = `search_${keyword}_${geo}_${timeframe}`;
+        const cacheKey = `search_${keyword}_${geo}_${timeframe}${points ? `_${points}` : ''}`;
         const cached = this.getCached(cacheKey);
         if (cached) {
             console.log('Returning cached search results');
@@ -101,6 +107,10 @@ class TrendsAPI {
             params.append('geo', geo.trim());
         }
 
+        if (points) {
+            params.append('points', points);
+        }
+
         try {
             const data = await this.makeRequest(`/search?${params}`);
             this.setCache(cacheKey, data);
@@ -111,6 +121,140 @@ class TrendsAPI {
         }
     }
 
+    /**
+     * Stream search results leg by leg via Server-Sent Events.
+     * handlers.onLeg(field, data) fires as each leg (interest_over_time,
+     * interest_by_region, related_queries) arrives with the data assembled so far.
+     * Resolves with the full response once the summary event arrives.
+     */
+    async searchTrendsStream(keyword, geo = '', timeframe = 'today 12-m', handlers = {}) {
+        if (!keyword || keyword.trim() === '') {
+            throw new Error('Keyword is required');
+        }
+
+        const onLeg = handlers.onLeg || (() => {});
+        const legs = ['interest_over_time', 'interest_by_region', 'related_queries'];
+
+        const cacheKey = `search_${keyword}_${geo}_${timeframe}`;
+        const cached = this.getCached(cacheKey);
+        if (cached || typeof EventSource === 'undefined') {
+            const data = cached || await this.searchTrends(keyword, geo, timeframe);
+            legs.forEach(field => onLeg(field, data));
+            return data;
+        }
+
+        const params = new URLSearchParams({
+            keyword: keyword.trim(),
+            timeframe: timeframe
+        });
+
+        if (geo && geo.trim() !== '') {
+            params.append('geo', geo.trim());
+        }
+
+        const data = {
+            keyword: keyword.trim(),
+            geo: geo,
+            timeframe: timeframe,
+            interest_over_time: [],
+            interest_by_region: [],
+            related_queries: { top: [], rising: [] }
+        };
+
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(`${this.baseURL}/search/stream?${params}`);
+            const timeoutId = setTimeout(() => fail(new Error('Request timed out')), this.requestTimeout);
+            let legError = null;
+
+            const fail = (error) => {
+                clearTimeout(timeoutId);
+                source.close();
+                console.error('Search stream failed:', error);
+                reject(new Error(`Failed to search trends for "${keyword}": ${error.message}`));
+            };
+
+            legs.forEach(field => {
+                source.addEventListener(field, (event) => {
+                    const payload = JSON.parse(event.data);
+                    data[field] = payload[field];
+                    if (payload.error && field === 'interest_over_time') {
+                        legError = payload.error;
+                        return;
+                    }
+                    onLeg(field, data);
+                });
+            });
+
+            source.addEventListener('summary', (event) => {
+                clearTimeout(timeoutId);
+                source.close();
+
+                const summary = JSON.parse(event.data);
+                if (legError) {
+                    fail(new Error(legError));
+                    return;
+                }
+
+                Object.assign(data, {
+                    geo: summary.geo,
+                    timestamp: summary.timestamp,
+                    data_source: summary.data_source
+                });
+                this.setCache(cacheKey, data);
+                resolve(data);
+            });
+
+            source.onerror = () => fail(new Error('Stream connection lost'));
+        });
+    }
+
+    /**
+     * Subscribe to live trending updates for several countries.
+     * onUpdate(geo, data) fires with the full trending list on connect and
+     * after every pushed diff. Returns a function that closes the stream.
+     */
+    subscribeTrending(geos, onUpdate) {
+        if (typeof EventSource === 'undefined') {
+            return () => {};
+        }
+
+        const params = new URLSearchParams({ geos: geos.join(',') });
+        let source = null;
+
+        const apply = (geo, data) => {
+            this.trendingSnapshots.set(geo, data);
+            this.setCache(`trending_${geo}`, data);
+            onUpdate(geo, data);
+        };
+
+        const connect = () => {
+            source = new EventSource(`${this.baseURL}/trending/stream?${params}`);
+
+            source.addEventListener('snapshot', (event) => {
+                const payload = JSON.parse(event.data);
+                const previous = this.trendingSnapshots.get(payload.geo) || {};
+                apply(payload.geo, { ...previous, ...payload });
+            });
+
+            source.addEventListener('diff', (event) => {
+                const payload = JSON.parse(event.data);
+                const previous = this.trendingSnapshots.get(payload.geo);
+                if (previous && previous.version === payload.since) {
+                    apply(payload.geo, TrendsUtils.applyTrendingDiff(previous, payload));
+                }
+            });
+
+            // Fell behind: reconnect to start again from fresh snapshots
+            source.addEventListener('reset', () => {
+                source.close();
+                connect();
+            });
+        };
+
+        connect();
+        return () => source.close();
+    }
+
     /**
      * Get trending searches by country
      */
@@ -122,8 +266,16 @@ class TrendsAPI {
             return cached;
         }
 
+        // With a previous snapshot, ask only for what changed since its version
+        const previous = this.trendingSnapshots.get(geo);
+        const since = previous && previous.version != null ? `&since=${previous.version}` : '';
+
         try {
-            const data = await this.makeRequest(`/trending?geo=${geo}`);
+            const response = await this.makeRequest(`/trending?geo=${geo}${since}`, { allowNotModified: true });
+            const data = response === null ? previous
+                : response.changes ? TrendsUtils.applyTrendingDiff(previous, response)
+                : response;
+            this.trendingSnapshots.set(geo, data);
             this.setCache(cacheKey, data);
             return data;
         } catch (error) {
@@ -132,6 +284,31 @@ class TrendsAPI {
         }
     }
 
+    /**
+     * Get trending searches for every supported country in one request.
+     * Also seeds the per-country cache used by getTrendingSearches.
+     */
+    async getAllTrendingSearches() {
+        const cacheKey = 'trending_all';
+        const cached = this.getCached(cacheKey, 10 * 60 * 1000); // 10 minutes cache
+        if (cached) {
+            console.log('Returning cached trending searches for all countries');
+            return cached;
+        }
+
+        try {
+            const data = await this.makeRequest('/trending/all');
+            Object.entries(data.countries || {}).forEach(([geo, trending]) => {
+                this.setCache(`trending_${geo}`, trending);
+            });
+            this.setCache(cacheKey, data);
+            return data;
+        } catch (error) {
+            console.error('Get all trending searches failed:', error);
+            throw new Error(`Failed to get trending searches for all countries: ${error.message}`);
+        }
+    }
+
     /**
      * Get keyword suggestions
      */
@@ -177,18 +354,20 @@ class TrendsAPI {
     }
 
     /**
-     * Compare multiple keywords
+     * Compare multiple keywords.
+     * `points` asks the server to downsample comparison_data to at most that many dates.
      */
-    async compareTrends(keywords, geo = '', timeframe = 'today 12-m') {
+    async compareTrends(keywords, geo = '', timeframe = 'today 12-m', anchor = '', points = null) {
         if (!keywords || !Array.isArray(keywords) || keywords.length < 2) {
             throw new Error('At least 2 keywords are required for comparison');
         }
 
-        if (keywords.length > 5) {
-            throw new Error('Maximum 5 keywords allowed for comparison');
+        // More than 5 keywords are chained server-side through an anchor keyword
+        if (keywords.length > 50) {
+            throw new Error('Maximum 50 keywords allowed for comparison');
         }
 
-        const cacheKey = `compare_${keywords.join('_')}_${geo}_${timeframe}`;
+        const cacheKey = `compare_${keywords.join('_')}_${geo}_${timeframe}_${anchor}${points ? `_${points}` : ''}`;
         const cached = this.getCached(cacheKey);
         if (cached) {
             console.log('Returning cached comparison results');
@@ -204,6 +383,14 @@ class TrendsAPI {
             payload.geo = geo.trim();
         }
 
+        if (anchor && anchor.trim() !== '') {
+            payload.anchor = anchor.trim();
+        }
+
+        if (points) {
+            payload.points = points;
+        }
+
         try {
             const data = await this.makeRequest('/compare', {
                 method: 'POST',
@@ -217,6 +404,110 @@ class TrendsAPI {
         }
     }
 
+    /**
+     * Get derived metrics for a keyword: rolling mean, peaks,
+     * period-over-period and year-over-year change, and trend slope.
+     */
+    async getAnalytics(keyword, geo = 'US', timeframe = 'today 12-m', window = null) {
+        if (!keyword || keyword.trim() === '') {
+            throw new Error('Keyword is required');
+        }
+
+        const params = new URLSearchParams({
+            keyword: keyword.trim(),
+            geo: geo,
+            timeframe: timeframe
+        });
+        if (window) {
+            params.append('window', window);
+        }
+
+        const cacheKey = `analytics_${params}`;
+        const cached = this.getCached(cacheKey);
+        if (cached) {
+            return cached;
+        }
+
+        try {
+            const data = await this.makeRequest(`/analytics?${params}`);
+            this.setCache(cacheKey, data);
+            return data;
+        } catch (error) {
+            console.error('Analytics failed:', error);
+            throw new Error(`Failed to get analytics for "${keyword}": ${error.message}`);
+        }
+    }
+
+    /**
+     * Forecast a keyword's interest a few points ahead with prediction intervals
+     */
+    async getForecast(keyword, geo = 'US', horizon = 8, method = 'holt_winters', level = 95) {
+        if (!keyword || keyword.trim() === '') {
+            throw new Error('Keyword is required');
+        }
+
+        const params = new URLSearchParams({
+            keyword: keyword.trim(),
+            geo: geo,
+            horizon: horizon,
+            method: method,
+            level: level
+        });
+
+        const cacheKey = `forecast_${params}`;
+        const cached = this.getCached(cacheKey);
+        if (cached) {
+            return cached;
+        }
+
+        try {
+            const data = await this.makeRequest(`/forecast?${params}`);
+            this.setCache(cacheKey, data);
+            return data;
+        } catch (error) {
+            console.error('Forecast failed:', error);
+            throw new Error(`Failed to get forecast for "${keyword}": ${error.message}`);
+        }
+    }
+
+    /**
+     * Compare one keyword across several countries.
+     * Returns columnar data: a shared `dates` index of epoch seconds and
+     * `series[geo]` value arrays, the same shape as a columnar compare.
+     */
+    async compareGeos(keyword, geos, timeframe = 'today 12-m') {
+        if (!keyword || keyword.trim() === '') {
+            throw new Error('Keyword is required');
+        }
+
+        if (!geos || !Array.isArray(geos) || geos.length < 2) {
+            throw new Error('At least 2 countries are required for comparison');
+        }
+
+        const cacheKey = `compare_geo_${keyword}_${geos.join('_')}_${timeframe}`;
+        const cached = this.getCached(cacheKey);
+        if (cached) {
+            console.log('Returning cached geo comparison results');
+            return cached;
+        }
+
+        try {
+            const data = await this.makeRequest('/compare-geo', {
+                method: 'POST',
+                body: JSON.stringify({
+                    keyword: keyword.trim(),
+                    geos: geos,
+                    timeframe: timeframe
+                })
+            });
+            this.setCache(cacheKey, data);
+            return data;
+        } catch (error) {
+            console.error('Compare geos failed:', error);
+            throw new Error(`Failed to compare "${keyword}" across countries: ${error.message}`);
+        }
+    }
+
     /**
      * Switch to Mock API for testing
      */
@@ -263,19 +554,24 @@ class TrendsAPI {
 
 // Utility functions for data processing
 const TrendsUtils = {
+    // Built once: toLocaleDateString creates a new formatter on every call
+    dateFormatter: new Intl.DateTimeFormat('en-US', { year: 'numeric', month: 'short', day: 'numeric' }),
+    utcDateFormatter: new Intl.DateTimeFormat('en-US', {
+        year: 'numeric', month: 'short', day: 'numeric', timeZone: 'UTC'
+    }),
+
     /**
-     * Format date for display
+     * Format date for display.
+     * Numbers are epoch seconds from the backend (UTC) and skip string parsing.
      */
     formatDate(dateString) {
-        if (!dateString) return 'Unknown';
+        if (!dateString && dateString !== 0) return 'Unknown';
         
         try {
-            const date = new Date(dateString);
-            return date.toLocaleDateString('en-US', {
-                year: 'numeric',
-                month: 'short',
-                day: 'numeric'
-            });
+            if (typeof dateString === 'number') {
+                return this.utcDateFormatter.format(new Date(dateString * 1000));
+            }
+            return this.dateFormatter.format(new Date(dateString));
         } catch (error) {
             return dateString;
         }
@@ -381,6 +677,32 @@ const TrendsUtils = {
         };
     },
 
+    /**
+     * Apply a since= trending diff to the previous full response.
+     * Entries are matched on the server's normalized query key, so a
+     * query whose spelling changed between snapshots still lines up.
+     */
+    applyTrendingDiff(previous, diff) {
+        const removed = new Set(diff.changes.removed.map(item => item.key));
+        const moved = new Map(diff.changes.moved.map(item => [item.key, item]));
+
+        const trending = previous.trending_searches
+            .filter(item => !removed.has(item.key))
+            .map(item => {
+                const change = moved.get(item.key);
+                return change ? { rank: change.to, query: change.query, key: change.key } : item;
+            })
+            .concat(diff.changes.inserted)
+            .sort((a, b) => a.rank - b.rank);
+
+        return {
+            ...previous,
+            timestamp: diff.timestamp || previous.timestamp,
+            version: diff.version,
+            trending_searches: trending
+        };
+    },
+
     /**
      * Check if data is valid trends response
      */
@@ -369,12 +369,15 @@ class WorldTrendsApp {
             
             console.log(`🔍 Searching trends for: "${keyword}" in ${geo || 'worldwide'}`);
             
-            // Search trends
-            const data = await this.api.searchTrends(keyword, geo);
-            
+            // Stream search legs so the chart renders before the map and tables
+            const data = await this.api.searchTrendsStream(keyword, geo, 'today 12-m', {
+                onLeg: (field, partial) => this.displaySearchLeg(field, partial)
+            });
+
             if (TrendsUtils.isValidTrendsData(data)) {
                 this.currentData = data;
-                this.displaySearchResults(data);
+                // The fetch time only arrives with the stream's summary
+                this.displaySearchStats(data);
             } else {
                 throw new Error('Invalid data received from API');
             }
@@ -583,50 +586,59 @@ class WorldTrendsApp {
         await this.handleSearch();
     }
 
-    displaySearchResults(data) {
-        if (!this.elements.resultsSection) {
-            console.warn('Search results elements not found');
-            return;
-        }
-        
-        // Update result header
-        if (this.elements.resultsTitle) {
-            this.elements.resultsTitle.textContent = `"${data.keyword}" Trends`;
-        }
-        if (this.elements.searchStats) {
-            this.elements.searchStats.textContent = 
-                `Updated: ${TrendsUtils.formatRelativeTime(data.timestamp)} | Region: ${data.geo || 'Worldwide'}`;
-        }
-        
-        // Show results section
-        this.elements.resultsSection.style.display = 'block';
-        this.elements.resultsSection.classList.add('fade-in');
-        
-        // Update chart
-        if (this.chart) {
-            this.chart.updateChart(data);
-        }
-        
-        // Update world map
-        if (this.worldMap) {
-            this.worldMap.updateData(data);
+    /**
+     * Show when the results were fetched and for which region
+     */
+    displaySearchStats(data) {
+        if (!this.elements.searchStats) return;
+
+        const region = `Region: ${data.geo || 'Worldwide'}`;
+        this.elements.searchStats.textContent = data.timestamp
+            ? `Updated: ${TrendsUtils.formatRelativeTime(data.timestamp)} | ${region}`
+            : region;
+    }
+
+    /**
+     * Render one streamed search leg as soon as it arrives
+     */
+    displaySearchLeg(field, data) {
+        if (!this.elements.resultsSection) return;
+
+        switch (field) {
+            case 'interest_over_time':
+                if (this.elements.resultsTitle) {
+                    this.elements.resultsTitle.textContent = `"${data.keyword}" Trends`;
+                }
+                this.displaySearchStats(data);
+                if (this.elements.loadingIndicator) {
+                    this.elements.loadingIndicator.style.display = 'none';
+                }
+                this.elements.resultsSection.style.display = 'block';
+                this.elements.resultsSection.classList.add('fade-in');
+                if (this.chart) {
+                    this.chart.updateChart(data);
+                }
+
+                // Scroll to results as soon as the first leg is on screen
+                setTimeout(() => {
+                    this.elements.resultsSection.scrollIntoView({
+                        behavior: 'smooth',
+                        block: 'start'
+                    });
+                }, 100);
+                break;
+            case 'interest_by_region':
+                if (this.worldMap) {
+                    this.worldMap.updateData(data);
+                }
+                this.displayRegionalData(data.interest_by_region, data.keyword);
+                break;
+            case 'related_queries':
+                this.displayRelatedQueries(data.related_queries);
+                break;
         }
-        
-        // Update regional data
-        this.displayRegionalData(data.interest_by_region, data.keyword);
-        
-        // Update related queries
-        this.displayRelatedQueries(data.related_queries);
-        
-        // Scroll to results
-        setTimeout(() => {
-            this.elements.resultsSection.scrollIntoView({ 
-                behavior: 'smooth', 
-                block: 'start' 
-            });
-        }, 100);
-        
-        console.log(`✅ Search results displayed for "${data.keyword}"`);
+
+        console.log(`📡 Streamed ${field} for "${data.keyword}"`);
     }
 
     hideSearchResults() {
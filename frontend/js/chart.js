@@ -98,7 +98,15 @@ class TrendsChart {
     }
 
     /**
-     * Create or update chart with trends data
+     * Chart labels for a columnar `dates` array of epoch seconds
+     */
+    columnarLabels(dates) {
+        return dates.map(epoch => (epoch === null ? '' : TrendsUtils.formatDate(epoch)));
+    }
+
+    /**
+     * Create or update chart with trends data.
+     * interest_over_time may be row-per-point or columnar ({dates, series}).
      */
     updateChart(trendsData) {
         if (!trendsData || !trendsData.interest_over_time) {
@@ -107,21 +115,30 @@ class TrendsChart {
         }
 
         const timeData = trendsData.interest_over_time;
-        if (!Array.isArray(timeData) || timeData.length === 0) {
+        let labels;
+        let values;
+
+        if (Array.isArray(timeData)) {
+            labels = timeData.map(item => {
+                if (typeof item.timestamp === 'number') {
+                    return TrendsUtils.formatDate(item.timestamp);
+                }
+                if (item.date) {
+                    return TrendsUtils.formatDate(item.date);
+                }
+                return '';
+            });
+            values = timeData.map(item => item.value || 0);
+        } else if (Array.isArray(timeData.dates) && timeData.series) {
+            labels = this.columnarLabels(timeData.dates);
+            values = (Object.values(timeData.series)[0] || []).map(value => value || 0);
+        }
+
+        if (!labels || labels.length === 0) {
             this.showNoData();
             return;
         }
 
-        // Prepare data
-        const labels = timeData.map(item => {
-            if (item.date) {
-                return TrendsUtils.formatDate(item.date);
-            }
-            return '';
-        });
-
-        const values = timeData.map(item => item.value || 0);
-
         const dataset = {
             label: `"${trendsData.keyword}" Interest`,
             data: values,
@@ -167,7 +184,8 @@ class TrendsChart {
     }
 
     /**
-     * Create comparison chart with multiple keywords
+     * Create comparison chart with multiple keywords.
+     * comparison_data may be row-per-point or columnar ({dates, series}).
      */
     updateComparisonChart(comparisonData) {
         if (!comparisonData || !comparisonData.comparison_data) {
@@ -177,14 +195,19 @@ class TrendsChart {
 
         const timeData = comparisonData.comparison_data;
         const keywords = comparisonData.keywords;
+        const columnar = !Array.isArray(timeData) && Array.isArray(timeData.dates);
+        const length = columnar ? timeData.dates.length : (Array.isArray(timeData) ? timeData.length : 0);
 
-        if (!Array.isArray(timeData) || timeData.length === 0 || !Array.isArray(keywords)) {
+        if (length === 0 || !Array.isArray(keywords)) {
             this.showNoData();
             return;
         }
 
         // Prepare labels
-        const labels = timeData.map(item => {
+        const labels = columnar ? this.columnarLabels(timeData.dates) : timeData.map(item => {
+            if (typeof item.timestamp === 'number') {
+                return TrendsUtils.formatDate(item.timestamp);
+            }
             if (item.date) {
                 return TrendsUtils.formatDate(item.date);
             }
@@ -200,7 +223,9 @@ class TrendsChart {
         // Create datasets for each keyword
         const datasets = keywords.map((keyword, index) => {
             const color = colors[index % colors.length];
-            const values = timeData.map(item => item[keyword] || 0);
+            const values = columnar
+                ? (timeData.series[keyword] || []).map(value => value || 0)
+                : timeData.map(item => item[keyword] || 0);
 
             return {
                 label: `"${keyword}"`,
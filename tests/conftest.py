@@ -45,4 +45,42 @@ def sample_trends_data():
                 {'query': 'rising query 2', 'value': '+300%'}
             ]
         }
-    }
\ No newline at end of file
+    }
+
+
+@pytest.fixture
+def backend_app(tmp_path):
+    """Main Flask app with SerpAPI key configured and upstream calls faked
+
+    Yields (client, calls, set_handler): every SerpAPI request is recorded in
+    ``calls`` and answered by the handler, which receives the params dict.
+    """
+    from unittest.mock import patch
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+    import app as app_module
+    from snapshot_store import TrendingSnapshotStore
+    from series_archive import SeriesArchive
+
+    calls = []
+    state = {'handler': lambda params: {}}
+
+    def fake_request(params):
+        calls.append(dict(params))
+        return state['handler'](params)
+
+    def set_handler(handler):
+        state['handler'] = handler
+
+    app_module.app.config['TESTING'] = True
+    app_module.trends_cache.clear()
+    with patch.object(app_module, 'SERPAPI_KEY', 'test-key'), \
+            patch.object(app_module.serpapi_client, 'make_request', side_effect=fake_request), \
+            patch.object(app_module, 'snapshot_store', TrendingSnapshotStore(tmp_path / 'trending.db')), \
+            patch.object(app_module, 'series_archive', SeriesArchive(tmp_path / 'series')):
+        with app_module.app.test_client() as client:
+            yield client, calls, set_handler
+
+
+def ranked(*queries):
+    """A trending list with ranks 1..n in the given order"""
+    return [{'rank': rank, 'query': query} for rank, query in enumerate(queries, start=1)]
@@ -424,7 +424,8 @@ describe('World Trends Explorer v1.2.4 - Complete Functional Test Suite', () =>
         });
 
         test('should display search results correctly', () => {
-            app.displaySearchResults(MOCK_SEARCH_RESPONSE);
+            ['interest_over_time', 'interest_by_region', 'related_queries']
+                .forEach(field => app.displaySearchLeg(field, MOCK_SEARCH_RESPONSE));
             
             expect(mockElements.resultsTitle.textContent).toContain('artificial intelligence');
             expect(mockElements.searchStats.textContent).toContain('Updated:');
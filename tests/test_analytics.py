@@ -0,0 +1,114 @@
+# tests/test_analytics.py - Timeseries analytics tests
+
+import json
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from analytics import period_change, peak_mask, rolling_mean, series_metrics, trend_slope
+from series_archive import SeriesArchive
+
+WEEK = 7 * 86400
+# Starts of weekly series ending this week, like 'today 5-y' and 'today 12-m' fetches
+THIS_WEEK = np.datetime64('today') - (np.datetime64('today') - np.datetime64('2024-01-07')).astype(int) % 7
+WEEKS_5Y_START = THIS_WEEK - np.timedelta64(260 * 7, 'D')
+WEEKS_12M_START = THIS_WEEK - np.timedelta64(51 * 7, 'D')
+
+
+def weekly_points(values, start):
+    """[{'date', 'value'}] points one week apart from start"""
+    dates = start + np.arange(len(values)) * np.timedelta64(7, 'D')
+    return [{'date': f"{date}T00:00:00Z", 'value': int(value)} for date, value in zip(dates, values)]
+
+
+def weekly_timeline(values):
+    """TIMESERIES payload with one weekly point per value starting Jan 7, 2024"""
+    dates = np.datetime64('2024-01-07') + np.arange(len(values)) * np.timedelta64(7, 'D')
+    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    timeline = []
+    for date, value in zip(dates.astype(object), values):
+        timeline.append({'date': f"{months[date.month - 1]} {date.day}, {date.year}",
+                         'values': [{'extracted_value': value}]})
+    return {'interest_over_time': {'timeline_data': timeline}}
+
+
+class TestAnalyticsFunctions:
+    """Test the vectorized metric kernels"""
+
+    def test_rolling_mean(self):
+        result = rolling_mean(np.array([[1, 2, 3, 4], [4, 4, 4, 4]]), 2)
+        assert np.isnan(result[:, 0]).all()
+        assert result[0, 1:].tolist() == [1.5, 2.5, 3.5]
+        assert result[1, 1:].tolist() == [4, 4, 4]
+
+    def test_peaks(self):
+        mask = peak_mask(np.array([[0, 10, 0, 1, 2, 1, 0, 12, 0]]))
+        assert np.flatnonzero(mask[0]).tolist() == [1, 7]
+
+    def test_period_change(self):
+        values = np.array([[10, 10, 20, 20], [0, 0, 5, 5]])
+        assert period_change(values, 2)[0] == 100
+        assert np.isnan(period_change(values, 2)[1])
+        assert np.isnan(period_change(values, 3)).all()
+        assert period_change(values, 1, lag=3)[0] == 100
+
+    def test_slope_per_year(self):
+        timestamps = np.arange(53) * WEEK
+        values = np.array([timestamps / timestamps[-1] * 52])
+        assert abs(trend_slope(values, timestamps)[0] - 52 * 365.25 / 364) < 1e-6
+
+    def test_year_over_year_needs_a_year(self):
+        timestamps = np.arange(60) * WEEK
+        values = np.vstack([np.r_[np.full(52, 10), np.full(8, 30)], np.full(60, 5)])
+        metrics = series_metrics(values, timestamps, 4)
+        assert metrics['year_over_year'].tolist() == [200, 0]
+        assert np.isnan(series_metrics(values[:, :40], timestamps[:40], 4)['year_over_year']).all()
+
+
+class TestAnalyticsEndpoint:
+    """Test /api/trends/analytics"""
+
+    def test_single_series(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(lambda params: weekly_timeline([10, 20, 90, 20, 10, 30, 40, 50]))
+
+        data = json.loads(client.get('/api/trends/analytics?keyword=pizza&geo=KR&window=2').data)
+
+        assert data['granularity'] == 'weekly'
+        assert [point['rolling_mean'] for point in data['series']][:3] == [None, 15.0, 55.0]
+        assert [peak['value'] for peak in data['peaks']] == [90]
+        assert data['period_over_period'] == 125.0
+        assert data['year_over_year'] is None
+        assert len(calls) == 1
+
+    def test_batch_uses_only_stored_series(self, backend_app, tmp_path):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        set_handler(lambda params: weekly_timeline([10, 20, 30, 40]))
+        client.get('/api/trends/search?keyword=pizza&geo=KR')
+        client.get('/api/trends/search?keyword=pasta&geo=KR')
+        upstream_calls = len(calls)
+
+        # Archived 12-month series must not answer for a 5-year window
+        archive = SeriesArchive(tmp_path / 'analytics-series')
+        archive.store('ramen', 'KR', weekly_points(np.full(261, 30), WEEKS_5Y_START))
+        archive.store('pasta', 'KR', weekly_points(np.full(52, 20), WEEKS_12M_START))
+        with patch.object(app_module, 'series_archive', archive):
+            response = client.post('/api/trends/analytics', json={'window': 2, 'items': [
+                {'keyword': 'pizza', 'geo': 'KR'},
+                {'keyword': 'pasta', 'geo': 'KR', 'timeframe': 'today 5-y'},
+                {'keyword': 'sushi', 'geo': 'KR'},
+                {'geo': 'KR'},
+                {'keyword': 'ramen', 'geo': 'KR', 'timeframe': 'today 5-y'},
+            ]})
+        results = json.loads(response.data)['results']
+
+        assert len(calls) == upstream_calls
+        assert [result['status'] for result in results] == ['ok', 'missing', 'missing', 'error', 'ok']
+        assert results[0]['period_over_period'] == 133.33
+        assert results[4]['latest'] == 30
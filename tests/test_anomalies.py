@@ -0,0 +1,73 @@
+# tests/test_anomalies.py - Anomaly scanner tests
+
+import json
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from analytics import robust_zscores
+from anomalies import AnomalyScanner
+from series_archive import SeriesArchive
+
+
+def weekly(values):
+    dates = np.datetime64('2024-01-07') + np.arange(len(values)) * np.timedelta64(7, 'D')
+    return [{'date': f"{date}T00:00:00Z", 'value': value} for date, value in zip(dates, values)]
+
+
+class TestRobustZscores:
+    """Test rolling median/MAD scoring"""
+
+    def test_scores_only_recent_points(self):
+        values = np.array([[10, 12, 11, 10, 12, 11, 60], [10, 12, 11, 10, 12, 11, 11]])
+        scores, medians = robust_zscores(values, 4, last=1)
+        assert np.isnan(scores[:, :-1]).all()
+        assert scores[0, -1] > 20 and abs(scores[1, -1]) < 1
+        assert medians[0, -1] == 11
+
+    def test_flat_baseline_uses_mad_floor(self):
+        scores, _ = robust_zscores(np.array([[0, 0, 0, 0, 5]]), 4)
+        assert abs(scores[0, -1] - 0.6745 * 5) < 1e-9
+
+
+class TestAnomalyScanner:
+    """Test corpus scans over the columnar archive"""
+
+    def test_scan_finds_spikes_and_drops(self, tmp_path):
+        archive = SeriesArchive(tmp_path / 'series')
+        baseline = [40, 42, 41, 40, 43, 41, 42, 40, 41, 42, 40, 41]
+        archive.store('pizza', 'KR', weekly(baseline + [95]))
+        archive.store('pasta', 'KR', weekly(baseline + [2]))
+        archive.store('sushi', 'JP', weekly(baseline + [42]))
+        archive.store('short', 'JP', weekly([1, 100]))
+
+        scan = AnomalyScanner(archive, window=12, threshold=3.5).scan()
+
+        assert scan['series'] == 4
+        assert [(a['keyword'], a['direction']) for a in scan['anomalies']] == [
+            ('pizza', 'spike'), ('pasta', 'drop')
+        ]
+        assert scan['anomalies'][0]['value'] == 95
+        assert scan['anomalies'][0]['baseline'] == 41
+
+    def test_endpoint_filters_latest_scan(self, backend_app, tmp_path):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        archive = SeriesArchive(tmp_path / 'anomaly-series')
+        baseline = [10] * 12
+        archive.store('pizza', 'KR', weekly(baseline + [90]))
+        archive.store('pizza', 'JP', weekly(baseline + [0]))
+        scanner = AnomalyScanner(archive, window=12, threshold=3.5)
+        scanner._thread = object()  # no background rescans in tests
+
+        with patch.object(app_module, 'anomaly_scanner', scanner):
+            data = json.loads(client.get('/api/trends/anomalies?direction=spike').data)
+            assert [(a['geo'], a['keyword']) for a in data['anomalies']] == [('KR', 'pizza')]
+            assert json.loads(client.get('/api/trends/anomalies?geo=JP').data)['total'] == 1
+            assert client.get('/api/trends/anomalies?direction=up').status_code == 400
+        assert calls == []
@@ -0,0 +1,136 @@
+# tests/test_batch.py - Batch endpoint and cache tests
+
+import json
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from trends_batch import normalize_batch_item, run_bounded
+from trends_cache import TrendsCache
+
+
+def fake_timeseries(params):
+    """Timeseries whose single value encodes the keyword length; 'boom' fails"""
+    if params['q'] == 'boom':
+        raise RuntimeError('upstream exploded')
+    return {'interest_over_time': {'timeline_data': [
+        {'date': 'Jan 1, 2025', 'values': [{'extracted_value': len(params['q'])}]}
+    ]}}
+
+
+def parse_lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+class TestTrendsCache:
+    """Test the in-process TTL cache"""
+
+    def test_get_or_fetch_caches_value(self):
+        cache = TrendsCache(ttl=60)
+        assert cache.get_or_fetch('k', lambda: [1, 2]) == ([1, 2], False)
+        assert cache.get_or_fetch('k', lambda: [3]) == ([1, 2], True)
+        assert cache.stats()['hits'] == 1
+
+    def test_expired_entries_are_misses(self):
+        cache = TrendsCache(ttl=60)
+        cache.set('k', 'v', ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get('k') is None
+
+    def test_lru_eviction(self):
+        cache = TrendsCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+
+
+class TestBatchEngine:
+    """Test batch item validation and bounded fan-out"""
+
+    def test_normalize_fills_defaults(self):
+        item = normalize_batch_item({'keyword': ' ai '})
+        assert item == {'keyword': 'ai', 'geo': 'US', 'timeframe': 'today 12-m',
+                        'fields': ['interest_over_time']}
+
+    def test_normalize_rejects_unknown_fields(self):
+        try:
+            normalize_batch_item({'keyword': 'ai', 'fields': ['bogus']})
+        except ValueError as e:
+            assert 'bogus' in str(e)
+        else:
+            raise AssertionError('expected ValueError')
+
+    def test_run_bounded_limits_in_flight(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def work(item):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.01)
+            with lock:
+                state['running'] -= 1
+            return item * 2
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = {index: future.result()
+                       for index, future in run_bounded(range(10), work, executor, 3)}
+
+        assert results == {i: i * 2 for i in range(10)}
+        assert state['peak'] <= 3
+
+
+class TestBatchEndpoint:
+    """Test POST /api/trends/batch"""
+
+    def test_batch_requires_items(self, backend_app):
+        client, calls, set_handler = backend_app
+        response = client.post('/api/trends/batch', json={'items': []})
+        assert response.status_code == 400
+
+    def test_batch_streams_ndjson_with_per_item_errors(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_timeseries)
+
+        response = client.post('/api/trends/batch', json={'items': [
+            {'keyword': 'ai', 'geo': 'KR'},
+            {'keyword': 'boom'},
+            {'geo': 'US'},
+            {'keyword': 'bitcoin', 'timeframe': 'today 5-y'}
+        ]})
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+
+        lines = parse_lines(response)
+        summary = lines[-1]
+        by_index = {line['index']: line for line in lines[:-1]}
+
+        assert by_index[0]['status'] == 'ok'
+        assert by_index[0]['interest_over_time'][0]['value'] == 2
+        assert by_index[1]['status'] == 'error'
+        assert 'exploded' in by_index[1]['error']
+        assert by_index[2]['status'] == 'error'
+        assert by_index[3]['timeframe'] == 'today 5-y'
+        assert summary == {**summary, 'status': 'summary', 'total': 4, 'ok': 2, 'error': 2}
+        assert {call['date'] for call in calls if call['q'] == 'bitcoin'} == {'today 5-y'}
+
+    def test_batch_serves_repeat_items_from_cache(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_timeseries)
+
+        client.post('/api/trends/batch', json={'items': [{'keyword': 'ai'}]})
+        upstream_calls = len(calls)
+
+        lines = parse_lines(client.post('/api/trends/batch', json={'items': [{'keyword': 'ai'}]}))
+        assert lines[0]['cached'] is True
+        assert lines[-1]['cached'] == 1
+        assert len(calls) == upstream_calls
@@ -0,0 +1,99 @@
+# tests/test_collector.py - Trending collector tests
+
+import json
+import sys
+import os
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from collector import TrendingCollector
+from snapshot_store import TrendingSnapshotStore
+
+
+class FakeClock:
+    def __init__(self, now=1_750_000_000):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_collector(tmp_path, fetch, clock, **options):
+    store = TrendingSnapshotStore(tmp_path / 'trending.db')
+    published = {}
+
+    def fetch_and_record(geo):
+        data = fetch(geo)
+        store.record(geo, data['trending_searches'], clock())
+        return data
+
+    collector = TrendingCollector(
+        fetch=fetch_and_record, store=store, geos=['US', 'KR', 'JP'],
+        publish=published.__setitem__, clock=clock, **options
+    )
+    return collector, store, published
+
+
+def ok_fetch(geo):
+    return {'geo': geo, 'trending_searches': [{'rank': 1, 'query': f'{geo} news'}]}
+
+
+class TestTrendingCollector:
+    """Test scheduling, budget and checkpoints"""
+
+    def test_polls_every_geo_then_waits_for_interval(self, tmp_path):
+        clock = FakeClock()
+        collector, store, published = make_collector(tmp_path, ok_fetch, clock, interval=900)
+
+        assert collector.run_once()['polled'] == ['US', 'KR', 'JP']
+        assert set(published) == {'US', 'KR', 'JP'}
+        assert collector.run_once()['polled'] == []
+
+        clock.now += 900
+        assert collector.run_once()['polled'] == ['US', 'KR', 'JP']
+
+    def test_budget_defers_and_checkpoints_survive_restart(self, tmp_path):
+        clock = FakeClock()
+        collector, store, published = make_collector(tmp_path, ok_fetch, clock, calls_per_hour=2)
+
+        summary = collector.run_once()
+        assert summary['polled'] == ['US', 'KR']
+        assert summary['deferred'] == ['JP']
+
+        # A fresh process reads the same checkpoints and call log
+        restarted, _, _ = make_collector(tmp_path, ok_fetch, clock, calls_per_hour=2)
+        assert restarted.run_once()['polled'] == []
+        clock.now += 3601
+        assert restarted.run_once()['polled'] == ['JP', 'US']
+
+    def test_failures_back_off(self, tmp_path):
+        clock = FakeClock()
+
+        def flaky_fetch(geo):
+            if geo == 'KR':
+                raise RuntimeError('upstream down')
+            return ok_fetch(geo)
+
+        collector, store, published = make_collector(tmp_path, flaky_fetch, clock, retry_delay=60)
+        assert collector.run_once()['failed'] == ['KR']
+        clock.now += 30
+        assert collector.run_once()['failed'] == []
+        clock.now += 30
+        assert collector.run_once()['failed'] == ['KR']
+        assert store.checkpoints()['KR']['failures'] == 2
+
+
+class TestTrendingServedFromStore:
+    """Web workers serve collector snapshots without calling upstream"""
+
+    def test_fresh_stored_snapshot_skips_upstream(self, backend_app):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        app_module.snapshot_store.record('KR', [{'rank': 1, 'query': 'collected'}], time.time())
+
+        data = json.loads(client.get('/api/trends/trending?geo=KR').data)
+
+        assert calls == []
+        assert data['trending_searches'] == [{'rank': 1, 'query': 'collected', 'key': 'collected'}]
@@ -0,0 +1,154 @@
+# tests/test_compare.py - Keyword comparison tests
+
+import json
+import sys
+import os
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from keyword_packing import chain_groups, stitch_groups, stitch_region_groups
+
+# True relative popularity of each keyword over three points
+TRUE_INTEREST = {f'k{i}': [10.0 * (i + 1), 5.0 * (i + 1), 20.0 * (i + 1)] for i in range(12)}
+
+
+def fake_group(params):
+    """Scale the group so its largest value is 100, like Google Trends does"""
+    keywords = params['q'].split(',')
+    rows = np.array([TRUE_INTEREST[k] for k in keywords])
+    rows = rows * (100.0 / rows.max())
+    return {'interest_over_time': {'timeline_data': [
+        {'date': f'Jan {day}, 2025', 'values': [{'extracted_value': float(v)} for v in rows[:, column]]}
+        for column, day in enumerate((1, 8, 15))
+    ]}}
+
+
+# True search volume of each keyword per region
+TRUE_REGIONAL = {f'k{i}': {'US': 10.0 * (i + 1), 'KR': 5.0 * (12 - i)} for i in range(12)}
+
+
+def fake_group_with_regions(params):
+    """GEO_MAP answers with each keyword's share among the compared keywords"""
+    if params['data_type'] != 'GEO_MAP':
+        return fake_group(params)
+    keywords = params['q'].split(',')
+    regions = []
+    for code, name in (('US', 'United States'), ('KR', 'South Korea')):
+        volumes = np.array([TRUE_REGIONAL[k][code] for k in keywords])
+        shares = volumes * 100 / volumes.sum()
+        regions.append({'geo': code, 'location': name,
+                        'values': [{'query': k, 'extracted_value': float(v)} for k, v in zip(keywords, shares)]})
+    return {'compared_breakdown_by_region': regions}
+
+
+class TestAnchorChaining:
+    """Test anchor-led grouping and stitching"""
+
+    def test_chain_groups_share_anchor(self):
+        groups = chain_groups([f'k{i}' for i in range(10)], 'k3')
+        assert all(group[0] == 'k3' for group in groups)
+        assert all(len(group) <= 5 for group in groups)
+        assert sorted(k for group in groups for k in group[1:]) == sorted(f'k{i}' for i in range(10) if i != 3)
+
+    def test_stitch_restores_common_scale(self):
+        group_a = np.array([[50.0, 100.0], [25.0, 50.0]])
+        group_b = np.array([[10.0, 20.0], [50.0, 100.0]])
+        stitched = stitch_groups([group_a, group_b])
+        # Anchor is 5x weaker in group b, so its second keyword is 5x the anchor
+        np.testing.assert_allclose(stitched, [[10.0, 20.0], [5.0, 10.0], [50.0, 100.0]])
+
+    def test_stitch_rejects_silent_anchor(self):
+        try:
+            stitch_groups([np.array([[10.0], [5.0]]), np.array([[0.0], [100.0]])])
+        except ValueError as e:
+            assert 'Anchor' in str(e)
+        else:
+            raise AssertionError('expected ValueError')
+
+
+    def test_stitch_region_groups_renormalizes_shares(self):
+        group_a = (['US', 'KR'], ['United States', 'South Korea'], np.array([[50.0, 20.0], [50.0, 80.0]]))
+        group_b = (['US'], ['United States'], np.array([[25.0], [75.0]]))
+        codes, names, shares = stitch_region_groups([group_a, group_b])
+        assert codes == ['US', 'KR']
+        # US volumes relative to the anchor: 1, 1, 3
+        np.testing.assert_allclose(shares[:, 0], [20.0, 20.0, 60.0])
+        assert np.isnan(shares[2, 1])
+        np.testing.assert_allclose(shares[:2, 1], [20.0, 80.0])
+
+
+class TestCompareEndpoint:
+    """Test POST /api/trends/compare"""
+
+    def test_up_to_five_keywords_single_call(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_group)
+
+        response = client.post('/api/trends/compare', json={'keywords': ['k0', 'k1', 'k2']})
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert len(calls) == 1
+        assert data['comparison_data'][2] == {'date': 'Jan 15, 2025', 'timestamp': 1736899200, 'k0': 33, 'k1': 67, 'k2': 100}
+        assert 'anchor' not in data
+
+    def test_many_keywords_chained_through_anchor(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_group)
+
+        keywords = [f'k{i}' for i in range(12)]
+        response = client.post('/api/trends/compare', json={'keywords': keywords, 'anchor': 'k5'})
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data['anchor'] == 'k5'
+        assert data['groups'] == len(calls) == 3
+        last = data['comparison_data'][2]
+        expected = np.rint(np.array([TRUE_INTEREST[k][2] for k in keywords]) * 100 / 240)
+        assert [last[k] for k in keywords] == expected.astype(int).tolist()
+
+    def test_malformed_input_rejected(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(lambda params: fake_group({'q': params['q'].replace('1', 'k1')}))
+
+        response = client.post('/api/trends/compare', json={'keywords': ['k0', 1]})
+        assert response.status_code == 200
+        assert json.loads(response.data)['keywords'] == ['k0', '1']
+        assert client.post('/api/trends/compare', json={'keywords': ['k0', 'k0']}).status_code == 400
+        assert client.post('/api/trends/compare', data='not json').status_code == 400
+
+    def test_anchor_must_be_a_keyword(self, backend_app):
+        client, calls, set_handler = backend_app
+        response = client.post('/api/trends/compare', json={'keywords': ['a', 'b'], 'anchor': 'c'})
+        assert response.status_code == 400
+
+    def test_regional_comparison_columnar(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_group_with_regions)
+
+        response = client.post('/api/trends/compare',
+                               json={'keywords': ['k0', 'k3'], 'include_regions': True})
+        data = json.loads(response.data)
+
+        regional = data['regional_comparison']
+        assert regional['geoCodes'] == ['US', 'KR']
+        assert regional['values'] == {'k0': [20.0, 57.1], 'k3': [80.0, 42.9]}
+        assert regional['leader'] == ['k3', 'k0']
+        assert sorted(call['data_type'] for call in calls) == ['GEO_MAP', 'TIMESERIES']
+
+    def test_regional_comparison_chained(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_group_with_regions)
+
+        keywords = [f'k{i}' for i in range(9)]
+        response = client.post('/api/trends/compare',
+                               json={'keywords': keywords, 'include_regions': True})
+        regional = json.loads(response.data)['regional_comparison']
+
+        assert regional['leader'] == ['k8', 'k0']
+        us = np.array([regional['values'][k][0] for k in keywords])
+        expected = np.array([TRUE_REGIONAL[k]['US'] for k in keywords])
+        np.testing.assert_allclose(us, expected * 100 / expected.sum(), atol=1.0)
@@ -0,0 +1,65 @@
+# tests/test_compare_geo.py - Multi-geo comparison tests
+
+import json
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from timeseries import align_series
+
+
+def fake_geo_series(params):
+    """Each geo reports a different curve; JP lacks the last point and BR fails"""
+    if params['geo'] == 'BR':
+        raise RuntimeError('quota exceeded')
+    values = {'US': [10, 20, 30], 'KR': [40, 50, 60], 'JP': [70, 80]}[params['geo']]
+    return {'interest_over_time': {'timeline_data': [
+        {'date': f'Jan {day}, 2025', 'values': [{'extracted_value': value}]}
+        for day, value in zip((1, 8, 15), values)
+    ]}}
+
+
+class TestAlignSeries:
+    """Test date alignment"""
+
+    def test_missing_points_become_none(self):
+        timestamps, columns = align_series({
+            'a': [{'date': 'd1', 'timestamp': '100', 'value': 1}, {'date': 'd2', 'timestamp': '200', 'value': 2}],
+            'b': [{'date': 'd2', 'timestamp': '200', 'value': 5}, {'date': 'd3', 'timestamp': '300', 'value': 6}]
+        })
+        assert timestamps == [100, 200, 300]
+        assert columns == {'a': [1, 2, None], 'b': [None, 5, 6]}
+
+    def test_differently_worded_dates_share_a_timestamp(self):
+        timestamps, columns = align_series({
+            'a': [{'date': 'Jan 8, 2025', 'value': 1}, {'date': 'Jan 1, 2025', 'value': 2}],
+            'b': [{'date': 'Jan 1 – 7, 2025', 'value': 3}, {'date': 'not a date', 'value': 4}]
+        })
+        assert timestamps == [1735689600, 1736294400]
+        assert columns == {'a': [2, 1], 'b': [3, None]}
+
+
+class TestCompareGeoEndpoint:
+    """Test POST /api/trends/compare-geo"""
+
+    def test_requires_two_geos(self, backend_app):
+        client, calls, set_handler = backend_app
+        response = client.post('/api/trends/compare-geo', json={'keyword': 'bitcoin', 'geos': ['US']})
+        assert response.status_code == 400
+
+    def test_fetches_only_timeseries_per_geo(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_geo_series)
+
+        response = client.post('/api/trends/compare-geo',
+                               json={'keyword': 'bitcoin', 'geos': ['us', 'KR', 'JP', 'BR']})
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert sorted(call['geo'] for call in calls) == ['BR', 'JP', 'KR', 'US']
+        assert {call['data_type'] for call in calls} == {'TIMESERIES'}
+        assert data['dates'] == [1735689600, 1736294400, 1736899200]
+        assert data['series'] == {'US': [10, 20, 30], 'KR': [40, 50, 60], 'JP': [70, 80, None]}
+        assert 'quota' in data['errors']['BR']
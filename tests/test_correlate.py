@@ -0,0 +1,105 @@
+# tests/test_correlate.py - Keyword correlation tests
+
+import json
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from correlation import correlation_matrix, rank_rows
+from series_archive import SeriesArchive
+from test_analytics import WEEKS_12M_START, weekly_points
+
+DATES = [f"Jan {day}, 2024" for day in range(1, 11)]
+RISING = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+
+
+def fake_timeseries(params):
+    """Keywords starting with 'up' rise steadily; all others fall"""
+    curves = [RISING if keyword.startswith('up') else RISING[::-1] for keyword in params['q'].split(',')]
+    return {'interest_over_time': {'timeline_data': [
+        {'date': date, 'values': [{'extracted_value': c[i]} for c in curves]}
+        for i, date in enumerate(DATES)
+    ]}}
+
+
+class TestCorrelationMatrix:
+    """Test the vectorized correlation kernels"""
+
+    def test_pearson_matches_numpy(self):
+        values = np.random.default_rng(7).random((6, 40))
+        matrix, _, _ = correlation_matrix(values)
+        assert np.allclose(matrix, np.corrcoef(values))
+
+    def test_spearman_uses_average_ranks(self):
+        assert rank_rows(np.array([[5, 1, 5, 0]])).tolist() == [[3.5, 2, 3.5, 1]]
+        monotonic = np.array([[1, 2, 3, 4, 5], [1, 4, 9, 16, 25]])
+        assert np.allclose(correlation_matrix(monotonic, 'spearman')[0], 1)
+
+    def test_best_lag(self):
+        base = np.random.default_rng(3).random(30)
+        values = np.vstack([base, np.r_[0, 0, base[:-2]]])
+        _, best, lags = correlation_matrix(values, max_lag=3)
+        assert lags[0, 1] == 2 and lags[1, 0] == -2
+        assert best[0, 1] > 0.99
+
+
+class TestCorrelateEndpoint:
+    """Test POST /api/trends/correlate"""
+
+    def test_fetches_only_missing_series_packed(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_timeseries)
+        client.get('/api/trends/search?keyword=up0&geo=KR')
+        calls.clear()
+
+        keywords = ['up0', 'up1', 'down1', 'up2', 'down2', 'up3', 'down3']
+        response = client.post('/api/trends/correlate', json={'keywords': keywords, 'geo': 'KR'})
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data['sources'] == {'cached': 1, 'archived': 0, 'fetched': 6}
+        assert sorted(len(call['q'].split(',')) for call in calls) == [1, 5]
+        matrix = np.array(data['matrix'])
+        assert np.allclose(matrix[0, 1], 1) and np.allclose(matrix[0, 2], -1)
+
+    def test_archived_series_must_span_timeframe(self, backend_app, tmp_path):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        set_handler(fake_timeseries)
+        archive = SeriesArchive(tmp_path / 'correlate-series')
+        archive.store('up0', 'KR', weekly_points(np.arange(52), WEEKS_12M_START))
+        archive.store('up1', 'KR', weekly_points(np.arange(52) * 2, WEEKS_12M_START))
+
+        with patch.object(app_module, 'series_archive', archive):
+            twelve_months = json.loads(client.post('/api/trends/correlate', json={
+                'keywords': ['up0', 'up1'], 'geo': 'KR'
+            }).data)
+            assert calls == []
+            five_years = json.loads(client.post('/api/trends/correlate', json={
+                'keywords': ['up0', 'up1'], 'geo': 'KR', 'timeframe': 'today 5-y'
+            }).data)
+
+        assert twelve_months['sources'] == {'cached': 0, 'archived': 2, 'fetched': 0}
+        assert twelve_months['points'] == 52
+        assert five_years['sources'] == {'cached': 0, 'archived': 0, 'fetched': 2}
+        assert five_years['points'] == 10
+
+    def test_lagged_and_validation(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_timeseries)
+
+        data = json.loads(client.post('/api/trends/correlate', json={
+            'keywords': ['up', 'down'], 'method': 'spearman', 'max_lag': 2
+        }).data)
+        assert data['max_lag'] == 2
+        assert data['best_lag'][0][0] == 0
+
+        assert client.post('/api/trends/correlate', json={'keywords': ['up']}).status_code == 400
+        assert client.post('/api/trends/correlate', json={
+            'keywords': ['up', 'down'], 'method': 'kendall'
+        }).status_code == 400
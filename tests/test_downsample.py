@@ -0,0 +1,100 @@
+# tests/test_downsample.py - LTTB downsampling tests
+
+import json
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from timeseries import lttb_indices
+from test_analytics import weekly_timeline
+
+
+def reference_lttb(values, points):
+    """Textbook single-series LTTB, one point at a time"""
+    length = len(values)
+    every = (length - 2) / (points - 2)
+    kept, anchor = [0], 0
+    for bucket in range(points - 2):
+        start, end = int(bucket * every) + 1, int((bucket + 1) * every) + 1
+        next_start, next_end = end, min(int((bucket + 2) * every) + 1, length)
+        if bucket == points - 3:
+            next_start, next_end = length - 1, length
+        next_x = (next_start + next_end - 1) / 2
+        next_y = np.mean(values[next_start:next_end])
+        areas = [abs((anchor - next_x) * (values[i] - values[anchor]) - (anchor - i) * (next_y - values[anchor]))
+                 for i in range(start, end)]
+        anchor = start + int(np.argmax(areas))
+        kept.append(anchor)
+    return kept + [length - 1]
+
+
+def fake_comparison(params):
+    """Daily two-keyword TIMESERIES with one spike per keyword"""
+    keywords = params['q'].split(',')
+    dates = np.datetime64('2024-01-01') + np.arange(400)
+    curves = [np.full(400, 20 + 10 * i) for i in range(len(keywords))]
+    curves[0][123] = 100
+    return {'interest_over_time': {'timeline_data': [
+        {'date': f"{date}", 'values': [{'extracted_value': int(c[i])} for c in curves]}
+        for i, date in enumerate(dates)
+    ]}}
+
+
+class TestLttb:
+    """Test the vectorized LTTB kernel"""
+
+    def test_matches_reference(self):
+        values = np.random.default_rng(4).random(1000) * 100
+        for points in (3, 10, 97, 500):
+            assert lttb_indices(values[np.newaxis], points).tolist() == reference_lttb(values, points)
+
+    def test_keeps_spikes_and_ends(self):
+        values = np.zeros((1, 500))
+        values[0, 321] = 100
+        kept = lttb_indices(values, 20)
+        assert kept[0] == 0 and kept[-1] == 499 and 321 in kept
+        assert lttb_indices(values, 600).tolist() == list(range(500))
+
+    def test_shared_indices_cover_every_series(self):
+        values = np.zeros((2, 300))
+        values[0, 40], values[1, 250] = 100, 100
+        kept = lttb_indices(values, 30)
+        assert 40 in kept and 250 in kept
+
+
+class TestDownsampleEndpoints:
+    """Test the points parameter on /search and /compare"""
+
+    def test_search_points_cached(self, backend_app):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        set_handler(lambda params: weekly_timeline([10 + i % 7 for i in range(260)]))
+
+        with patch.object(app_module, 'lttb_indices', wraps=lttb_indices) as kernel:
+            first = json.loads(client.get('/api/trends/search?keyword=pizza&points=50').data)
+            second = json.loads(client.get('/api/trends/search?keyword=pizza&points=50').data)
+        full = json.loads(client.get('/api/trends/search?keyword=pizza').data)
+
+        assert len(first['interest_over_time']) == 50 and first['original_points'] == 260
+        assert second['interest_over_time'] == first['interest_over_time']
+        assert kernel.call_count == 1
+        assert len(full['interest_over_time']) == 260 and 'original_points' not in full
+        assert client.get('/api/trends/search?keyword=pizza&points=2').status_code == 400
+
+    def test_compare_points_keep_shared_dates(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_comparison)
+
+        data = json.loads(client.post('/api/trends/compare', json={
+            'keywords': ['a', 'b'], 'points': 40
+        }).data)
+        rows = data['comparison_data']
+        assert len(rows) == 40 and data['original_points'] == 400
+        assert max(row['a'] for row in rows) == 100
+        assert all(row['b'] == 30 for row in rows)
+        assert client.post('/api/trends/compare', json={'keywords': ['a', 'b'], 'points': 'x'}).status_code == 400
@@ -0,0 +1,103 @@
+# tests/test_export.py - Streaming export tests
+
+import csv
+import io
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import export
+from series_archive import SeriesArchive
+from test_analytics import WEEKS_12M_START, weekly_points
+from test_correlate import fake_timeseries
+
+JAN_1_2024 = 1704067200
+
+
+def read_csv(response):
+    return list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+
+class TestExportEndpoint:
+    """Test POST /api/trends/export"""
+
+    def test_csv_from_cache_archive_and_batch_engine(self, backend_app, tmp_path):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        set_handler(fake_timeseries)
+        client.get('/api/trends/search?keyword=up0&geo=KR')
+        calls.clear()
+
+        archive = SeriesArchive(tmp_path / 'export-series')
+        archive.store('pasta', 'KR', [{'date': 'Jan 1, 2024', 'value': 7}, {'date': 'Jan 8, 2024', 'value': 9}])
+        items = [{'keyword': 'up0', 'geo': 'KR'}, {'keyword': 'pasta', 'geo': 'KR', 'timeframe': '2024-01-01 2024-01-14'},
+                 {'keyword': 'up1', 'geo': 'KR'}, {'keyword': 'down1', 'geo': 'KR'}, {'geo': 'KR'}]
+        with patch.object(app_module, 'series_archive', archive):
+            response = client.post('/api/trends/export', json={'items': items})
+            # The body streams, so read it while the archive is patched
+            rows = read_csv(response)
+
+        assert response.mimetype == 'text/csv'
+        assert 'trends-export.csv' in response.headers['Content-Disposition']
+        by_keyword = {}
+        for row in rows:
+            by_keyword.setdefault(row['keyword'], []).append(row)
+
+        assert [row['value'] for row in by_keyword['up0']] == [str(v) for v in range(10, 101, 10)]
+        assert by_keyword['pasta'][0] == {
+            'keyword': 'pasta', 'geo': 'KR', 'timeframe': '2024-01-01 2024-01-14', 'timestamp': str(JAN_1_2024),
+            'date': '2024-01-01T00:00:00Z', 'value': '7', 'error': ''
+        }
+        assert len(by_keyword['up1']) == 10 and len(by_keyword['down1']) == 10
+        assert by_keyword[''][0]['error'] == 'Keyword is required'
+        # Both misses came from one packed call
+        assert len(calls) == 1 and calls[0]['q'] == 'up1,down1'
+
+    def test_archived_series_from_another_window_is_refetched(self, backend_app, tmp_path):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        set_handler(fake_timeseries)
+        archive = SeriesArchive(tmp_path / 'export-series')
+        archive.store('pizza', 'KR', weekly_points(np.full(52, 40), WEEKS_12M_START))
+
+        with patch.object(app_module, 'series_archive', archive):
+            twelve_months = read_csv(client.post('/api/trends/export', json={
+                'items': [{'keyword': 'pizza', 'geo': 'KR', 'timeframe': 'today 12-m'}]
+            }))
+            assert calls == []
+            five_years = read_csv(client.post('/api/trends/export', json={
+                'items': [{'keyword': 'pizza', 'geo': 'KR', 'timeframe': 'today 5-y'}]
+            }))
+
+        assert len(twelve_months) == 52 and {row['value'] for row in twelve_months} == {'40'}
+        assert len(calls) == 1 and calls[0]['date'] == 'today 5-y'
+        assert len(five_years) == 10 and {row['timeframe'] for row in five_years} == {'today 5-y'}
+
+    def test_validation(self, backend_app):
+        client, calls, set_handler = backend_app
+        assert client.post('/api/trends/export', json={'items': []}).status_code == 400
+        assert client.post('/api/trends/export', json={
+            'items': [{'keyword': 'a'}], 'format': 'xlsx'
+        }).status_code == 400
+        with patch.object(export, 'pyarrow', None):
+            assert client.post('/api/trends/export', json={
+                'items': [{'keyword': 'a'}], 'format': 'parquet'
+            }).status_code == 501
+
+    def test_parquet(self, backend_app, tmp_path):
+        pyarrow = pytest.importorskip('pyarrow')
+        import pyarrow.parquet
+        client, calls, set_handler = backend_app
+        set_handler(fake_timeseries)
+        response = client.post('/api/trends/export', json={
+            'items': [{'keyword': 'up0'}, {'keyword': 'down0'}], 'format': 'parquet'
+        })
+        table = pyarrow.parquet.read_table(pyarrow.BufferReader(response.data))
+        assert table.num_rows == 20
+        assert sorted(set(table.column('keyword').to_pylist())) == ['down0', 'up0']
@@ -0,0 +1,99 @@
+# tests/test_forecast.py - Forecasting tests
+
+import json
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from forecasting import fit, fit_holt_winters, forecast_from_state, season_length, stack_states, state_row
+from series_archive import SeriesArchive
+from test_analytics import weekly_timeline
+
+WEEK = 7 * 86400
+
+
+def seasonal_values(cycles=3, season=52, noise=0.0, seed=0):
+    t = np.arange(cycles * season)
+    rng = np.random.default_rng(seed)
+    return 50 + 20 * np.sin(2 * np.pi * t / season) + 0.05 * t + rng.normal(0, noise, len(t))
+
+
+class TestForecasting:
+    """Test the vectorized fitting and extrapolation"""
+
+    def test_season_needs_two_cycles(self):
+        assert season_length('weekly', 104) == 52
+        assert season_length('weekly', 60) is None
+        assert season_length('single', 100) is None
+
+    def test_holt_winters_tracks_season(self):
+        values = seasonal_values()
+        history, future = values[:-8], values[-8:]
+        state = fit_holt_winters(history[np.newaxis], 52)
+        forecast, lower, upper = forecast_from_state(state, 8)
+        assert np.abs(forecast[0] - future).max() < 3
+        assert (lower <= forecast).all() and (forecast <= upper).all()
+        assert (np.diff(upper - lower) >= -1e-9).all()
+
+    def test_batch_fit_matches_single_fits(self):
+        values = np.stack([seasonal_values(noise=2, seed=seed) for seed in range(5)])
+        batch = fit_holt_winters(values, 52)
+        for row in range(5):
+            single = fit_holt_winters(values[row:row + 1], 52)
+            assert np.allclose(batch['level'][row], single['level'][0])
+            assert batch['alpha'][row] == single['alpha'][0]
+
+    def test_cached_state_round_trip(self):
+        values = np.stack([seasonal_values(seed=1), seasonal_values(seed=2)])
+        state = fit(values, 'seasonal_naive', 52)
+        restored = stack_states([json.loads(json.dumps(state_row(state, row))) for row in range(2)])
+        assert np.allclose(forecast_from_state(restored, 5)[0], forecast_from_state(state, 5)[0])
+        assert np.allclose(forecast_from_state(state, 5)[0], values[:, -52:-47])
+
+
+class TestForecastEndpoint:
+    """Test /api/trends/forecast"""
+
+    def test_repeat_requests_reuse_model(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(lambda params: weekly_timeline(np.round(seasonal_values()).astype(int).tolist()))
+
+        first = json.loads(client.get('/api/trends/forecast?keyword=pizza&geo=KR&horizon=4').data)
+        second = json.loads(client.get('/api/trends/forecast?keyword=pizza&geo=KR&horizon=12&level=80').data)
+        assert first['cached_model'] is False and second['cached_model'] is True
+        assert first['season'] == 52 and first['granularity'] == 'weekly'
+        assert len(first['forecast']) == 4 and len(second['forecast']) == 12
+        assert second['forecast'][0]['timestamp'] - first['forecast'][0]['timestamp'] == 0
+        assert second['forecast'][1]['timestamp'] - second['forecast'][0]['timestamp'] == WEEK
+        assert len(calls) == 1
+
+        assert client.get('/api/trends/forecast?keyword=pizza&horizon=99').status_code == 400
+        assert client.get('/api/trends/forecast?keyword=pizza&method=arima').status_code == 400
+        assert client.get('/api/trends/forecast?keyword=pizza&level=50').status_code == 400
+
+    def test_batch_fits_stored_series_only(self, backend_app, tmp_path):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        archive = SeriesArchive(tmp_path / 'forecast-series')
+        dates = np.datetime64('2023-01-01') + np.arange(156) * np.timedelta64(7, 'D')
+        for seed, keyword in enumerate(['pizza', 'pasta', 'sushi']):
+            values = np.clip(np.round(seasonal_values(noise=3, seed=seed)), 0, 100)
+            archive.store(keyword, 'KR', [{'date': f"{d}T00:00:00Z", 'value': int(v)}
+                                          for d, v in zip(dates, values)])
+
+        items = [{'keyword': k, 'geo': 'KR', 'timeframe': '2023-01-01 2025-12-27'}
+                 for k in ('pizza', 'pasta', 'sushi', 'ramen')]
+        with patch.object(app_module, 'series_archive', archive):
+            first = json.loads(client.post('/api/trends/forecast', json={'items': items, 'horizon': 3}).data)
+            second = json.loads(client.post('/api/trends/forecast', json={'items': items[:2]}).data)
+
+        assert first['models_fitted'] == 3 and second['models_fitted'] == 0
+        assert [r['status'] for r in first['results']] == ['ok', 'ok', 'ok', 'missing']
+        assert all(len(r['forecast']) == 3 for r in first['results'][:3])
+        assert first['results'][0]['season'] == 52
+        assert calls == []
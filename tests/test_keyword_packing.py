@@ -0,0 +1,99 @@
+# tests/test_keyword_packing.py - Five-keyword TIMESERIES packing tests
+
+import json
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from keyword_packing import pack_entries, split_packed_result
+
+# Packed scale: each keyword's true curve times a shared factor
+PACKED_VALUES = {'a': [50, 25], 'b': [10, 20], 'c': [100, 80], 'd': [0, 0], 'e': [2, 1]}
+
+
+def packed_result(keywords):
+    return {'interest_over_time': {'timeline_data': [
+        {'date': f'Jan {day}, 2025',
+         'values': [{'query': k, 'extracted_value': PACKED_VALUES.get(k, [7, 7])[column]}
+                    for k in keywords]}
+        for column, day in enumerate((1, 8))
+    ]}}
+
+
+def fake_packed(params):
+    return packed_result(params['q'].split(','))
+
+
+class TestPackEntries:
+    """Test grouping of pending fetches"""
+
+    def test_groups_at_most_five_distinct_keywords(self):
+        keywords = ['k1', 'k2', 'K1', 'k3', 'k4', 'k5', 'k6', 'k7']
+        groups = pack_entries(keywords, lambda k: k)
+        assert [len({k.lower() for k in group}) for group in groups] == [5, 2]
+        assert 'K1' in groups[0] and 'k1' in groups[0]
+
+
+class TestSplitPackedResult:
+    """Test splitting and renormalization of packed results"""
+
+    def test_each_series_rescaled_to_own_peak(self):
+        series, coarse = split_packed_result(packed_result(['a', 'b', 'c']), ['a', 'b', 'c'])
+        assert [p['value'] for p in series['a']] == [100, 50]
+        assert [p['value'] for p in series['b']] == [50, 100]
+        assert [p['value'] for p in series['c']] == [100, 80]
+        assert series['a'][0]['date'] == 'Jan 1, 2025'
+        assert coarse == []
+
+    def test_low_resolution_series_flagged_for_refetch(self):
+        series, coarse = split_packed_result(packed_result(['c', 'e']), ['c', 'e'])
+        assert coarse == ['e']
+        assert 'e' not in series
+
+    def test_all_zero_series_flagged_for_refetch(self):
+        series, coarse = split_packed_result(packed_result(['c', 'd']), ['c', 'd'])
+        assert coarse == ['d']
+        assert 'd' not in series
+
+
+class TestBatchPacking:
+    """Test that batch items share upstream TIMESERIES calls"""
+
+    def test_five_keywords_one_call(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_packed)
+
+        items = [{'keyword': k} for k in ('a', 'b', 'c', 'x', 'y')]
+        response = client.post('/api/trends/batch', json={'items': items})
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        assert len(calls) == 1
+        assert calls[0]['q'].count(',') == 4
+        results = {line['keyword']: line for line in lines[:-1]}
+        assert [p['value'] for p in results['b']['interest_over_time']] == [50, 100]
+        assert all(line['packed'] for line in results.values())
+
+    def test_coarse_series_refetched_alone(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_packed)
+
+        client.post('/api/trends/batch', json={'items': [{'keyword': 'c'}, {'keyword': 'd'}, {'keyword': 'e'}]})
+        assert [call['q'] for call in calls] == ['c,d,e', 'd', 'e']
+
+
+class TestComparePacking:
+    """Test that /compare archives only rows fine enough to rescale"""
+
+    def test_coarse_rows_not_archived(self, backend_app):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        set_handler(fake_packed)
+
+        response = client.post('/api/trends/compare', json={'keywords': ['c', 'd', 'e'], 'geo': 'US'})
+
+        assert response.status_code == 200
+        assert app_module.series_archive.load('c', 'US')[1].tolist() == [100, 80]
+        assert app_module.series_archive.load('d', 'US') is None
+        assert app_module.series_archive.load('e', 'US') is None
@@ -0,0 +1,102 @@
+# tests/test_response_formats.py - Columnar and MessagePack response tests
+
+import json
+import sys
+import os
+from unittest.mock import patch
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import response_formats
+from response_formats import columnar_series
+from test_compare import fake_group
+
+JAN_1_2024 = 1704067200
+
+
+class TestColumnarLayout:
+    """Test the columnar conversion"""
+
+    def test_series_dates_become_epochs(self):
+        series = [{'date': 'Jan 1, 2024', 'value': 5}, {'date': 'Jan 8, 2024', 'value': 7},
+                  {'date': 'sometime', 'value': 1}]
+        assert columnar_series(series, 'pizza') == {
+            'dates': [JAN_1_2024, JAN_1_2024 + 7 * 86400, None],
+            'series': {'pizza': [5, 7, 1]},
+        }
+
+
+class TestFormatParameter:
+    """Test format= on /search and /compare"""
+
+    def test_search_columnar(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_group)
+        rows = json.loads(client.get('/api/trends/search?keyword=k1').data)
+        data = json.loads(client.get('/api/trends/search?keyword=k1&format=columnar').data)
+
+        assert data['format'] == 'columnar'
+        assert data['interest_over_time']['series']['k1'] == [row['value'] for row in rows['interest_over_time']]
+        assert len(data['interest_over_time']['dates']) == 3
+        assert client.get('/api/trends/search?keyword=k1&format=xml').status_code == 400
+
+    def test_search_points_carry_serpapi_timestamp(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(lambda params: {'interest_over_time': {'timeline_data': [
+            {'date': 'Jan 1 – 7, 2024', 'timestamp': '1704067200', 'values': [{'extracted_value': 40}]},
+            {'date': 'Jan 8 – 14, 2024', 'timestamp': '1704672000', 'values': [{'extracted_value': 60}]},
+        ]}})
+        data = json.loads(client.get('/api/trends/search?keyword=pizza').data)
+        assert [point['timestamp'] for point in data['interest_over_time']] == [JAN_1_2024, JAN_1_2024 + 7 * 86400]
+
+    def test_compare_uses_serpapi_timestamps(self, backend_app, tmp_path):
+        import app as app_module
+        from series_archive import SeriesArchive
+        client, calls, set_handler = backend_app
+        # Labels are in the requested tz (UTC-6); SerpAPI's timestamp is the true instant
+        labels = ['Jan 7, 2024 at 3:00 PM', 'Jan 7, 2024 at 4:00 PM']
+        instants = [JAN_1_2024 + 6 * 86400 + (15 + 6) * 3600, JAN_1_2024 + 6 * 86400 + (16 + 6) * 3600]
+        set_handler(lambda params: {'interest_over_time': {'timeline_data': [
+            {'date': label, 'timestamp': str(instant),
+             'values': [{'extracted_value': 50 + i}, {'extracted_value': 100 - i}]}
+            for i, (label, instant) in enumerate(zip(labels, instants))
+        ]}})
+        archive = SeriesArchive(tmp_path / 'compare-series')
+
+        with patch.object(app_module, 'series_archive', archive):
+            rows = json.loads(client.post('/api/trends/compare', json={'keywords': ['k0', 'k1']}).data)
+            data = json.loads(client.post('/api/trends/compare', json={
+                'keywords': ['k0', 'k1'], 'format': 'columnar'
+            }).data)
+            archived = archive.load('k0', 'US')
+
+        assert [row['timestamp'] for row in rows['comparison_data']] == instants
+        assert data['comparison_data']['dates'] == instants
+        assert archived[0].tolist() == instants
+        assert len(calls) == 1
+
+    def test_compare_columnar(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_group)
+        rows = json.loads(client.post('/api/trends/compare', json={'keywords': ['k0', 'k1']}).data)
+        data = json.loads(client.post('/api/trends/compare', json={
+            'keywords': ['k0', 'k1'], 'format': 'columnar'
+        }).data)
+        for keyword in ('k0', 'k1'):
+            assert data['comparison_data']['series'][keyword] == [row[keyword] for row in rows['comparison_data']]
+        assert data['comparison_data']['dates'][0] == 1735689600  # Jan 1, 2025
+
+    def test_msgpack(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_group)
+        with patch.object(response_formats, 'msgpack', None):
+            assert client.get('/api/trends/search?keyword=k1&format=msgpack').status_code == 501
+        assert calls == []
+
+        msgpack = pytest.importorskip('msgpack')
+        response = client.post('/api/trends/compare', json={'keywords': ['k0', 'k1'], 'format': 'msgpack'})
+        assert response.mimetype == 'application/msgpack'
+        assert set(msgpack.unpackb(response.data)['comparison_data']['series']) == {'k0', 'k1'}
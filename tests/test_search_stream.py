@@ -0,0 +1,77 @@
+# tests/test_search_stream.py - Progressive SSE search tests
+
+import json
+import sys
+import os
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+
+def fake_trends(params):
+    """Answer each google_trends data type with a minimal REAL-shaped payload"""
+    if params['data_type'] == 'TIMESERIES':
+        return {'interest_over_time': {'timeline_data': [
+            {'date': 'Jan 1, 2025', 'values': [{'extracted_value': 40}]},
+            {'date': 'Jan 8, 2025', 'values': [{'extracted_value': 60}]}
+        ]}}
+    if params['data_type'] == 'GEO_MAP':
+        return {'interest_by_region': [
+            {'location': 'Korea', 'location_code': 'KR', 'extracted_value': 100}
+        ]}
+    raise RuntimeError('related queries unavailable')
+
+
+def parse_events(body):
+    """Split an SSE body into (event, data) pairs"""
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+class TestSearchStream:
+    """Test /api/trends/search/stream"""
+
+    def test_stream_requires_keyword(self, backend_app):
+        client, calls, set_handler = backend_app
+        response = client.get('/api/trends/search/stream')
+        assert response.status_code == 400
+        assert calls == []
+
+    def test_stream_emits_each_leg_then_summary(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_trends)
+
+        response = client.get('/api/trends/search/stream?keyword=bitcoin&geo=KR')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+
+        events = parse_events(response.get_data(as_text=True))
+        names = [name for name, _ in events]
+        assert sorted(names[:-1]) == ['interest_by_region', 'interest_over_time', 'related_queries']
+        assert names[-1] == 'summary'
+
+        payloads = dict(events)
+        assert [p['value'] for p in payloads['interest_over_time']['interest_over_time']] == [40, 60]
+        assert payloads['interest_by_region']['interest_by_region'][0]['geoCode'] == 'KR'
+        assert payloads['related_queries']['related_queries'] == {'top': [], 'rising': []}
+        assert 'error' in payloads['related_queries']
+        assert payloads['summary']['legs'] == {
+            'interest_over_time': 'ok',
+            'interest_by_region': 'ok',
+            'related_queries': 'error'
+        }
+        assert len(calls) == 3
+
+    def test_search_keeps_optional_legs_best_effort(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_trends)
+
+        response = client.get('/api/trends/search?keyword=bitcoin&geo=KR')
+        assert response.status_code == 200
+
+        data = json.loads(response.data)
+        assert len(data['interest_over_time']) == 2
+        assert data['related_queries'] == {'top': [], 'rising': []}
@@ -0,0 +1,119 @@
+# tests/test_series_archive.py - Columnar series archive tests
+
+import json
+import sys
+import os
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from series_archive import SeriesArchive
+from timeseries import infer_granularity, parse_point_date, point_timestamp, timeframe_window
+
+JAN_1_2024 = 1704067200
+
+
+def weekly(*values):
+    return [{'date': f"Jan {1 + 7 * i}, 2024", 'value': value} for i, value in enumerate(values)]
+
+
+class TestParsePointDate:
+    """Test SerpAPI timeline date parsing"""
+
+    def test_serpapi_formats(self):
+        assert parse_point_date('Jan 1, 2024') == JAN_1_2024
+        assert parse_point_date('Jan 2024') == JAN_1_2024
+        assert parse_point_date('Jan 1 – 7, 2024') == JAN_1_2024
+        assert parse_point_date('Dec 31, 2023 – Jan 6, 2024') == JAN_1_2024 - 86400
+        assert parse_point_date('Jan 1, 2024 at 3:00 PM') == JAN_1_2024 + 15 * 3600
+        assert parse_point_date('2024-01-01T00:00:00Z') == JAN_1_2024
+        assert parse_point_date('someday') is None
+
+    def test_point_timestamp_prefers_serpapi_field(self):
+        assert point_timestamp({'date': 'Jan 1 – 7, 2024', 'timestamp': '1704153600'}) == 1704153600
+        assert point_timestamp({'date': 'Jan 1, 2024'}) == JAN_1_2024
+        assert point_timestamp({'date': 'Jan 1, 2024', 'timestamp': ''}) == JAN_1_2024
+
+    def test_granularity(self):
+        assert infer_granularity(np.array([0, 7 * 86400, 14 * 86400])) == 'weekly'
+        assert infer_granularity(np.array([0, 3600, 7200])) == 'hourly'
+
+
+class TestSeriesArchive:
+    """Test append, lookup and compaction of archived series"""
+
+    def test_timeframe_window(self):
+        now = JAN_1_2024 + 365 * 86400
+        assert timeframe_window('today 12-m', now) == (now - int(12 * 30.4375 * 86400), now)
+        assert timeframe_window('now 7-d', now) == (now - 7 * 86400, now)
+        assert timeframe_window('2024-01-01 2024-01-14') == (JAN_1_2024, JAN_1_2024 + 14 * 86400)
+        assert timeframe_window('all', now)[1] == now
+        assert timeframe_window('next week') is None
+
+    def test_load_window_needs_matching_span(self, tmp_path):
+        archive = SeriesArchive(tmp_path / 'series')
+        archive.store('pizza', 'KR', weekly(1, 2, 3, 4, 5))   # Jan 1 - Jan 29, 2024
+        day = 86400
+        assert len(archive.load_window('pizza', 'KR', JAN_1_2024, JAN_1_2024 + 35 * day)[0]) == 5
+        # A window starting long before (or ending long after) the slice is not covered
+        assert archive.load_window('pizza', 'KR', JAN_1_2024 - 365 * day, JAN_1_2024 + 35 * day) is None
+        assert archive.load_window('pizza', 'KR', JAN_1_2024, JAN_1_2024 + 365 * day) is None
+        assert archive.load_window('pasta', 'KR', JAN_1_2024, JAN_1_2024 + 35 * day) is None
+
+    def test_store_and_load(self, tmp_path):
+        archive = SeriesArchive(tmp_path / 'series')
+        assert archive.store('Pizza', 'KR', weekly(10, 100, 55)) == 'weekly'
+        archive.store('pasta', 'KR', weekly(1, 2))
+
+        timestamps, values = archive.load(' PIZZA ', 'KR')
+        assert timestamps.tolist() == [JAN_1_2024, JAN_1_2024 + 7 * 86400, JAN_1_2024 + 14 * 86400]
+        assert values.dtype == np.uint8 and values.tolist() == [10, 100, 55]
+        assert isinstance(archive.columns()[1], np.memmap)
+        assert archive.load('pizza', 'JP') is None
+
+    def test_refetch_replaces_and_compacts(self, tmp_path):
+        archive = SeriesArchive(tmp_path / 'series')
+        archive.store('pizza', 'KR', weekly(10, 100))
+        archive.store('pizza', 'KR', weekly(10, 100))
+        assert archive.stats()['stored_points'] == 2
+
+        archive.store('pizza', 'KR', weekly(50, 100, 70))
+        archive.store('pasta', 'KR', weekly(5))
+        assert archive.stats() == {'series': 2, 'points': 4, 'stored_points': 6}
+
+        assert archive.compact() == 2
+        assert archive.stats()['stored_points'] == 4
+        assert archive.load('pizza', 'KR')[1].tolist() == [50, 100, 70]
+        assert archive.load('pasta', 'KR')[1].tolist() == [5]
+
+
+class TestArchiveHooks:
+    """Test that upstream timeseries fetches land in the archive"""
+
+    def test_search_and_compare_are_archived(self, backend_app):
+        client, calls, set_handler = backend_app
+
+        def fake_timeseries(params):
+            keywords = params['q'].split(',')
+            return {'interest_over_time': {'timeline_data': [
+                {'date': 'Jan 1, 2024', 'values': [{'extracted_value': 40 + i} for i in range(len(keywords))]},
+                {'date': 'Jan 8, 2024', 'values': [{'extracted_value': 80} for _ in keywords]}
+            ]}}
+        set_handler(fake_timeseries)
+
+        client.get('/api/trends/search?keyword=Pizza&geo=KR')
+        client.post('/api/trends/compare', json={'keywords': ['tea', 'coffee'], 'geo': 'JP'})
+        upstream_calls = len(calls)
+
+        data = json.loads(client.get('/api/trends/history/series?keyword=pizza&geo=KR').data)
+        assert data['values'] == [40, 80]
+        assert data['granularity'] == 'weekly'
+
+        # Compare rows are archived rescaled to their own peak
+        coffee = json.loads(client.get('/api/trends/history/series?keyword=coffee&geo=JP').data)
+        assert coffee['values'] == [51, 100]
+        assert len(calls) == upstream_calls
+
+        assert client.get('/api/trends/history/series?keyword=tea&geo=US').status_code == 404
@@ -0,0 +1,94 @@
+# tests/test_similar.py - Shape similarity search tests
+
+import json
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from series_archive import SeriesArchive
+from similarity import ShapeIndex, SimilarityIndex, shape_vectors
+
+
+# Twenty weeks of weekly() points
+WINDOW = '2024-01-07 2024-05-19'
+
+
+def weekly(values):
+    dates = np.datetime64('2024-01-07') + np.arange(len(values)) * np.timedelta64(7, 'D')
+    return [{'date': f"{date}T00:00:00Z", 'value': int(value)} for date, value in zip(dates, values)]
+
+
+class TestShapeVectors:
+    """Test resampling and normalization"""
+
+    def test_scale_and_length_do_not_matter(self):
+        short = np.array([[0, 50, 100, 50, 0]])
+        long = np.array([np.interp(np.linspace(0, 4, 9), np.arange(5), short[0]) / 2])
+        a, b = shape_vectors(short)[0], shape_vectors(long)[0]
+        assert abs(np.linalg.norm(a) - 1) < 1e-6
+        assert a @ b > 0.999
+
+    def test_flat_series_has_no_shape(self):
+        assert not shape_vectors(np.array([[7, 7, 7]])).any()
+
+
+class TestShapeIndex:
+    """Test exact and IVF search"""
+
+    def test_ivf_finds_exact_neighbours(self):
+        rng = np.random.default_rng(1)
+        centers = shape_vectors(rng.random((40, 30)))
+        vectors = centers[rng.integers(0, 40, 3000)] + rng.normal(0, 0.05, (3000, 64))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        exact = ShapeIndex(list(range(3000)), vectors)
+        ivf = ShapeIndex(list(range(3000)), vectors, brute_force_max=100)
+        assert exact.centroids is None and ivf.centroids is not None
+
+        query = vectors[17]
+        assert [key for key, _ in ivf.query(query, 5)] == [key for key, _ in exact.query(query, 5)]
+        assert 17 not in [key for key, _ in exact.query(query, 5, exclude=17)]
+
+
+class TestSimilarEndpoint:
+    """Test GET /api/trends/similar"""
+
+    def test_ranks_archived_shapes(self, backend_app, tmp_path):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        archive = SeriesArchive(tmp_path / 'similar-series')
+        rising = np.linspace(0, 100, 20)
+        archive.store('pizza', 'KR', weekly(rising))
+        archive.store('pasta', 'KR', weekly(rising / 2 + 10))
+        archive.store('sushi', 'JP', weekly(rising[::-1]))
+        archive.store('flat', 'JP', weekly(np.full(20, 50)))
+
+        with patch.object(app_module, 'series_archive', archive), \
+                patch.object(app_module, 'similarity_index', SimilarityIndex(archive)):
+            data = json.loads(client.get(f'/api/trends/similar?keyword=Pizza&geo=KR&timeframe={WINDOW}').data)
+            assert [m['keyword'] for m in data['similar']] == ['pasta', 'sushi']
+            assert data['similar'][0]['similarity'] > 0.999
+            assert data['similar'][1]['similarity'] < -0.999
+            assert client.get(f'/api/trends/similar?keyword=flat&geo=JP&timeframe={WINDOW}').status_code == 422
+        assert calls == []
+
+    def test_archive_for_another_window_is_refetched(self, backend_app, tmp_path):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        archive = SeriesArchive(tmp_path / 'similar-series')
+        archive.store('pizza', 'KR', weekly(np.linspace(0, 100, 20)))
+        set_handler(lambda params: {'interest_over_time': {'timeline_data': [
+            {'date': f'Jan {day}, 2025', 'values': [{'extracted_value': value}]}
+            for day, value in ((1, 10), (2, 60), (3, 30))
+        ]}})
+
+        with patch.object(app_module, 'series_archive', archive), \
+                patch.object(app_module, 'similarity_index', SimilarityIndex(archive)):
+            data = json.loads(client.get('/api/trends/similar?keyword=pizza&geo=KR&timeframe=now 7-d').data)
+        assert len(calls) == 1
+        assert data['granularity'] == 'daily'
@@ -0,0 +1,141 @@
+# tests/test_snapshot_store.py - Trending history store tests
+
+import json
+import sys
+import os
+import threading
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from snapshot_store import TrendingSnapshotStore
+from conftest import ranked
+
+DAY = 86400
+JULY_1 = 1751328000  # 2025-07-01T00:00:00Z
+
+
+class TestTrendingSnapshotStore:
+    """Test SQLite snapshot persistence and indexed lookups"""
+
+    def test_wal_mode(self, tmp_path):
+        store = TrendingSnapshotStore(tmp_path / 'trending.db')
+        mode = store.connection().execute('PRAGMA journal_mode').fetchone()[0]
+        assert mode == 'wal'
+
+    def test_snapshots_between(self, tmp_path):
+        store = TrendingSnapshotStore(tmp_path / 'trending.db')
+        store.record('KR', ranked('a', 'b'), JULY_1 - 60)
+        store.record('KR', ranked('c'), JULY_1 + 3600)
+        store.record('JP', ranked('d'), JULY_1 + 3600)
+
+        snapshots = store.snapshots_between('KR', JULY_1, JULY_1 + DAY)
+        assert len(snapshots) == 1
+        assert snapshots[0]['trending_searches'] == [{'rank': 1, 'query': 'c', 'key': 'c'}]
+        assert store.latest_before('KR', JULY_1)['trending_searches'][1]['query'] == 'b'
+
+    def test_rank_history_matches_normalized_query(self, tmp_path):
+        store = TrendingSnapshotStore(tmp_path / 'trending.db')
+        store.record('US', ranked('x', 'Pokémon GO'), JULY_1)
+        store.record('US', ranked('pokemon go'), JULY_1 + 3600)
+        store.record('FR', ranked('y', 'z', 'POKEMON GO'), JULY_1 + 7200)
+
+        history = store.rank_history('pokemon go', start=JULY_1)
+        assert [(h['geo'], h['rank']) for h in history] == [('US', 2), ('US', 1), ('FR', 3)]
+        assert len(store.rank_history('pokemon go', geo='FR', start=JULY_1)) == 1
+
+    def test_concurrent_records_chain_rank_changes(self, tmp_path, monkeypatch):
+        store = TrendingSnapshotStore(tmp_path / 'trending.db')
+        store.record('KR', ranked('a', 'b'), JULY_1)
+        latest_before = store.latest_before
+
+        def slow_latest_before(geo, when):
+            snapshot = latest_before(geo, when)
+            time.sleep(0.2)
+            return snapshot
+
+        monkeypatch.setattr(store, 'latest_before', slow_latest_before)
+        first = threading.Thread(target=store.record, args=('KR', ranked('b', 'a'), JULY_1 + 1))
+        second = threading.Thread(target=store.record, args=('KR', ranked('c'), JULY_1 + 2))
+        first.start()
+        time.sleep(0.05)
+        second.start()
+        first.join()
+        second.join()
+
+        # Deltas telescope: each query's total is its climb from unlisted to now
+        totals = dict(store.connection().execute(
+            'SELECT query_norm, SUM(delta) FROM rank_changes GROUP BY query_norm'
+        ).fetchall())
+        assert totals == {'a': 0, 'b': 0, 'c': 20}
+
+
+class TestHistorySearch:
+    """Test full-text search over stored trending queries"""
+
+    def test_substring_search_across_scripts(self, tmp_path):
+        store = TrendingSnapshotStore(tmp_path / 'trending.db')
+        store.record('JP', ranked('東京 地震 速報', 'x'), JULY_1 + 60)
+        store.record('JP', ranked('y', '東京 地震 速報'), JULY_1 + 3600)
+        store.record('KR', ranked('서울 지진 속보'), JULY_1 + DAY)
+        store.record('US', ranked('Earthquake Alaska'), JULY_1 + DAY)
+        assert store.fts
+
+        results = store.search('地震 速')
+        assert [(r['geo'], r['date'], r['best_rank'], r['snapshots']) for r in results] == [
+            ('JP', '2025-07-01', 1, 2)
+        ]
+        assert store.search('earthquake')[0]['query'] == 'Earthquake Alaska'
+        # Shorter than a trigram: served by the LIKE fallback
+        assert [r['geo'] for r in store.search('지진')] == ['KR']
+
+    def test_geo_and_date_filters(self, tmp_path):
+        store = TrendingSnapshotStore(tmp_path / 'trending.db')
+        store.record('JP', ranked('earthquake'), JULY_1)
+        store.record('JP', ranked('earthquake tokyo'), JULY_1 + 2 * DAY)
+        store.record('CL', ranked('earthquake chile'), JULY_1 + 2 * DAY)
+
+        assert [r['date'] for r in store.search('earthquake', geo='JP')] == ['2025-07-03', '2025-07-01']
+        assert [r['geo'] for r in store.search('earthquake', start=JULY_1 + DAY)] == ['CL', 'JP']
+
+    def test_existing_entries_are_backfilled(self, tmp_path):
+        path = tmp_path / 'trending.db'
+        TrendingSnapshotStore(path).record('US', ranked('earthquake'), JULY_1)
+        conn = TrendingSnapshotStore(path).connection()
+        conn.executescript('DROP TABLE queries_fts; DELETE FROM queries;')
+
+        assert TrendingSnapshotStore(path).search('quake')[0]['query'] == 'earthquake'
+
+
+class TestHistoryEndpoints:
+    """Test /api/trends/history/*"""
+
+    def test_trending_fetch_is_persisted(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(lambda params: {'trending_searches': [{'query': 'earthquake'}]})
+
+        client.get('/api/trends/trending?geo=JP')
+        today = time.strftime('%Y-%m-%d', time.gmtime())
+
+        data = json.loads(client.get(f'/api/trends/history/trending?geo=JP&date={today}').data)
+        assert data['snapshots'][0]['trending_searches'] == [{'rank': 1, 'query': 'earthquake', 'key': 'earthquake'}]
+
+        history = json.loads(client.get('/api/trends/history/query?q=Earthquake').data)['history']
+        assert [(h['geo'], h['rank']) for h in history] == [('JP', 1)]
+
+    def test_invalid_date(self, backend_app):
+        client, calls, set_handler = backend_app
+        response = client.get('/api/trends/history/trending?geo=JP&date=yesterday')
+        assert response.status_code == 400
+
+    def test_history_search(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(lambda params: {'trending_searches': [{'query': 'Earthquake Tokyo'}]})
+        client.get('/api/trends/trending?geo=JP')
+
+        data = json.loads(client.get('/api/trends/history/search?q=quake&geo=JP').data)
+        assert [(r['geo'], r['query']) for r in data['results']] == [('JP', 'Earthquake Tokyo')]
+
+        assert client.get('/api/trends/history/search?q=').status_code == 400
+        assert client.get('/api/trends/history/search?q=quake&from=soon').status_code == 400
@@ -0,0 +1,217 @@
+# tests/test_trending.py - Trending endpoint tests
+
+import gzip
+import json
+import sys
+import os
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from trending import GlobalTrendingAggregate, normalize_query, overlap_matrix, trending_diff
+from conftest import ranked
+
+
+def fake_trending_now(params):
+    """Every country trends on its own geo code; RU fails"""
+    if params['geo'] == 'RU':
+        raise RuntimeError('upstream unavailable')
+    return {'trending_searches': [
+        {'query': f"{params['geo'].lower()} news"},
+        {'query': 'weather'}
+    ]}
+
+
+class TestGlobalTrendingAggregate:
+    """Test incremental rank-weighted aggregation"""
+
+    def test_normalize_merges_near_duplicates(self):
+        assert normalize_query('Pokémon  GO!') == normalize_query('pokemon go')
+        assert normalize_query('ＢＴＳ') == normalize_query('bts')
+
+    def test_scores_sum_across_countries(self):
+        aggregate = GlobalTrendingAggregate()
+        aggregate.update('US', ranked('Pokémon GO', 'weather'))
+        aggregate.update('FR', ranked('weather', 'pokemon go'))
+        aggregate.update('JP', ranked('weather'))
+
+        top = aggregate.top()
+        assert top[0]['query'] == 'weather'
+        assert top[0]['countries'] == ['FR', 'JP', 'US']
+        assert top[0]['score'] == round(1.0 + 1.0 + 0.95, 3)
+        assert top[1]['query'] == 'Pokémon GO'
+
+    def test_update_replaces_previous_snapshot(self):
+        aggregate = GlobalTrendingAggregate()
+        aggregate.update('US', ranked('old story'))
+        aggregate.update('US', ranked('new story'))
+        assert [item['query'] for item in aggregate.top()] == ['new story']
+
+        aggregate.remove('US')
+        assert aggregate.top() == []
+
+
+class TestTrendingEndpoint:
+    """Test GET /api/trends/trending"""
+
+    def test_trending_is_cached(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_trending_now)
+
+        first = json.loads(client.get('/api/trends/trending?geo=KR').data)
+        second = json.loads(client.get('/api/trends/trending?geo=KR').data)
+
+        assert first == second
+        assert first['trending_searches'][0] == {'rank': 1, 'query': 'kr news', 'key': 'kr news'}
+        assert len(calls) == 1
+
+
+class TestAllTrendingEndpoint:
+    """Test GET /api/trends/trending/all"""
+
+    def test_fills_missing_geos_and_reuses_snapshots(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_trending_now)
+
+        client.get('/api/trends/trending?geo=KR')
+        response = client.get('/api/trends/trending/all')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert len(data['countries']) == 19
+        assert data['countries']['JP']['trending_searches'][0]['query'] == 'jp news'
+        assert 'RU' in data['errors']
+        assert data['cached'] == 1
+        assert data['fetched'] == 18
+        assert [call['geo'] for call in calls].count('KR') == 1
+
+    def test_store_served_geos_not_counted_as_fetched(self, backend_app):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        set_handler(fake_trending_now)
+        app_module.snapshot_store.record('JP', ranked('collected'), time.time())
+
+        data = json.loads(client.get('/api/trends/trending/all').data)
+
+        assert 'JP' not in [call['geo'] for call in calls]
+        assert data['cached'] == 1
+        assert data['fetched'] == 18
+
+    def test_gzip_when_accepted(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_trending_now)
+
+        response = client.get('/api/trends/trending/all', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        data = json.loads(gzip.decompress(response.data))
+        assert 'US' in data['countries']
+
+
+class TestGlobalTrendingEndpoint:
+    """Test GET /api/trends/trending/global"""
+
+    def test_aggregates_only_cached_snapshots(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_trending_now)
+
+        client.get('/api/trends/trending?geo=KR')
+        client.get('/api/trends/trending?geo=JP')
+        upstream_calls = len(calls)
+
+        data = json.loads(client.get('/api/trends/trending/global').data)
+
+        assert len(calls) == upstream_calls
+        assert data['countries'] == ['JP', 'KR']
+        weather = data['trending_searches'][0]
+        assert weather['query'] == 'weather'
+        assert weather['countries'] == ['JP', 'KR']
+        assert {item['query'] for item in data['trending_searches'][1:]} == {'jp news', 'kr news'}
+
+
+class TestTrendingOverlap:
+    """Test the cross-country Jaccard overlap matrix"""
+
+    def test_matches_set_jaccard(self):
+        sets = {'KR': {'a', 'b', 'c'}, 'JP': {'b', 'c', 'd'}, 'US': {'e'}, 'FR': set()}
+        geos, jaccard, shared = overlap_matrix(sets)
+
+        assert geos == ['FR', 'JP', 'KR', 'US']
+        jp, kr, us = 1, 2, 3
+        assert jaccard[jp, kr] == jaccard[kr, jp] == 0.5
+        assert shared[jp, kr] == 2
+        assert jaccard[kr, us] == 0
+        assert jaccard[kr, kr] == 1 and shared[kr, kr] == 3
+        assert jaccard[0, 0] == 0
+
+    def test_overlap_endpoint_uses_cached_snapshots(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_trending_now)
+        client.get('/api/trends/trending?geo=KR')
+        client.get('/api/trends/trending?geo=JP')
+        upstream_calls = len(calls)
+
+        data = json.loads(client.get('/api/trends/trending/overlap?geos=KR,JP,FR').data)
+        assert len(calls) == upstream_calls
+        assert data['countries'] == ['JP', 'KR']
+        assert data['top_pairs'] == [{'geos': ['JP', 'KR'], 'jaccard': 0.3333, 'shared': 1}]
+
+        stored = json.loads(client.get('/api/trends/trending/overlap?hours=1').data)
+        assert stored['countries'] == ['JP', 'KR']
+        assert stored['jaccard'][0][1] == 0.3333
+
+
+class TestTrendingDiff:
+    """Test since= version diffs"""
+
+    def test_diff_lists(self):
+        changes = trending_diff(ranked('a', 'b', 'c'), ranked('b', 'a', 'd'))
+        assert changes == {
+            'inserted': [{'rank': 3, 'query': 'd', 'key': 'd'}],
+            'removed': [{'query': 'c', 'key': 'c'}],
+            'moved': [
+                {'query': 'b', 'key': 'b', 'from': 2, 'to': 1},
+                {'query': 'a', 'key': 'a', 'from': 1, 'to': 2}
+            ]
+        }
+
+    def test_diff_matches_respelled_query_on_key(self):
+        changes = trending_diff(ranked('Pokémon', 'b'), ranked('b', 'Pokemon'))
+        assert changes['inserted'] == [] and changes['removed'] == []
+        assert changes['moved'] == [
+            {'query': 'b', 'key': 'b', 'from': 2, 'to': 1},
+            {'query': 'Pokemon', 'key': 'pokemon', 'from': 1, 'to': 2}
+        ]
+
+    def test_since_returns_changes_or_304(self, backend_app, monkeypatch):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        feeds = iter([['a', 'b', 'c'], ['b', 'a', 'd'], ['b', 'a', 'd']])
+        set_handler(lambda params: {'trending_searches': [{'query': q} for q in next(feeds)]})
+        # Force a fresh upstream fetch whenever the cache is cleared
+        monkeypatch.setattr(app_module, 'TRENDING_STORE_MAX_AGE', -1)
+
+        first = json.loads(client.get('/api/trends/trending?geo=KR').data)
+        assert first['version'] is not None
+        assert client.get(f"/api/trends/trending?geo=KR&since={first['version']}").status_code == 304
+
+        app_module.trends_cache.clear()
+        diff = json.loads(client.get(f"/api/trends/trending?geo=KR&since={first['version']}").data)
+        assert diff['since'] == first['version']
+        assert diff['version'] > first['version']
+        assert diff['changes']['removed'] == [{'query': 'c', 'key': 'c'}]
+        assert 'trending_searches' not in diff
+
+        # Same content under a newer version is still "nothing changed"
+        app_module.trends_cache.clear()
+        response = client.get(f"/api/trends/trending?geo=KR&since={diff['version']}")
+        assert response.status_code == 304
+        assert int(response.headers['X-Trending-Version']) > diff['version']
+
+    def test_unknown_since_returns_full_list(self, backend_app):
+        client, calls, set_handler = backend_app
+        set_handler(fake_trending_now)
+
+        data = json.loads(client.get('/api/trends/trending?geo=KR&since=999999').data)
+        assert data['trending_searches'][0]['query'] == 'kr news'
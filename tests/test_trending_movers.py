@@ -0,0 +1,73 @@
+# tests/test_trending_movers.py - Trending movers tests
+
+import json
+import sys
+import os
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from snapshot_store import TrendingSnapshotStore
+from trending import rank_changes
+from conftest import ranked
+
+
+class TestRankChanges:
+    """Test consecutive-snapshot diffs"""
+
+    def test_climb_entry_and_drop(self):
+        changes = {change[0]: change[2:] for change in rank_changes(ranked('a', 'b', 'c'), ranked('c', 'a', 'd'))}
+        assert changes == {
+            'c': (3, 1, 2),
+            'a': (1, 2, -1),
+            'd': (None, 3, 18),
+            'b': (2, None, -19)
+        }
+
+
+class TestMovers:
+    """Test window aggregation over the rank-change log"""
+
+    def test_movers_over_window(self, tmp_path):
+        store = TrendingSnapshotStore(tmp_path / 'trending.db')
+        now = time.time()
+        store.record('KR', ranked('a', 'b', 'c', 'd'), now - 7200)
+        store.record('KR', ranked('a', 'c', 'b', 'e'), now - 3000)
+        store.record('KR', ranked('c', 'a', 'e', 'f'), now - 60)
+
+        movers = store.movers('KR', now - 3600)
+
+        assert [(m['query'], m['net_climb'], m['rank']) for m in movers['climbers']] == [
+            ('e', 18, 3), ('f', 17, 4), ('c', 2, 1)
+        ]
+        assert [m['query'] for m in movers['new_entrants']] == ['e', 'f']
+        assert {m['query'] for m in movers['drop_offs']} == {'b', 'd'}
+
+    def test_window_excludes_older_changes(self, tmp_path):
+        store = TrendingSnapshotStore(tmp_path / 'trending.db')
+        now = time.time()
+        store.record('KR', ranked('a'), now - 7200)
+        store.record('KR', ranked('b', 'a'), now - 5000)
+        store.record('KR', ranked('b', 'a'), now - 60)
+
+        movers = store.movers('KR', now - 3600)
+        assert movers == {'climbers': [], 'new_entrants': [], 'drop_offs': []}
+
+
+class TestMoversEndpoint:
+    """Test GET /api/trends/trending/movers"""
+
+    def test_movers_from_stored_snapshots(self, backend_app):
+        import app as app_module
+        client, calls, set_handler = backend_app
+        now = time.time()
+        app_module.snapshot_store.record('JP', ranked('x', 'y'), now - 7200)
+        app_module.snapshot_store.record('JP', ranked('y', 'z'), now - 60)
+
+        data = json.loads(client.get('/api/trends/trending/movers?geo=JP&hours=1').data)
+
+        assert calls == []
+        movers = data['movers']['JP']
+        assert movers['climbers'][0]['query'] == 'z'
+        assert movers['drop_offs'][0]['query'] == 'x'
@@ -0,0 +1,105 @@
+# tests/test_trending_push.py - Trending push channel tests
+
+import json
+import sys
+import os
+import time
+from unittest.mock import patch
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from broadcaster import TrendingBroadcaster
+from snapshot_store import TrendingSnapshotStore
+from conftest import ranked
+
+
+def read_event(response):
+    chunk = next(response.response)
+    chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+    lines = chunk.strip().split('\n')
+    return lines[0][len('event: '):], json.loads(lines[1][len('data: '):])
+
+
+class TestTrendingBroadcaster:
+    """Test per-worker fan-out of trending diffs"""
+
+    def test_diff_reaches_only_matching_geos(self):
+        broadcaster = TrendingBroadcaster()
+        broadcaster.dispatch('KR', 1, ranked('a', 'b'))
+        kr = broadcaster.subscribe(['KR'])
+        jp = broadcaster.subscribe(['JP'])
+
+        broadcaster.dispatch('KR', 2, ranked('b', 'a'))
+
+        assert kr.get(0)[0] == 'snapshot'
+        event, payload = kr.get(0)
+        assert event == 'diff'
+        assert payload['since'] == 1 and payload['version'] == 2
+        assert payload['changes']['moved'] == [
+            {'query': 'b', 'key': 'b', 'from': 2, 'to': 1}, {'query': 'a', 'key': 'a', 'from': 1, 'to': 2}
+        ]
+        assert jp.get(0) is None
+
+    def test_unchanged_and_stale_snapshots_are_skipped(self):
+        broadcaster = TrendingBroadcaster()
+        subscription = broadcaster.subscribe(['KR'], initial=lambda geo: (5, ranked('a')))
+        subscription.get(0)
+
+        broadcaster.dispatch('KR', 6, ranked('a'))
+        broadcaster.dispatch('KR', 4, ranked('z'))
+        assert subscription.get(0) is None
+
+    def test_slow_subscriber_is_flagged_not_blocking(self):
+        broadcaster = TrendingBroadcaster()
+        subscription = broadcaster.subscribe(['KR'])
+        subscription.events.maxsize = 1
+        broadcaster.dispatch('KR', 1, ranked('a'))
+        broadcaster.dispatch('KR', 2, ranked('b'))
+        assert subscription.overflowed
+
+    def test_redis_publish_and_store_watch(self, tmp_path):
+        published = []
+        redis_client = type('FakeRedis', (), {'publish': lambda self, channel, msg: published.append(msg)})()
+        TrendingBroadcaster(redis_client=redis_client).publish('KR', 3, ranked('a'))
+        assert json.loads(published[0]) == {'geo': 'KR', 'version': 3, 'trending_searches': ranked('a')}
+
+        store = TrendingSnapshotStore(tmp_path / 'trending.db')
+        store.record('KR', ranked('a'), time.time() - 60)
+        first = store.max_snapshot_id()
+        second = store.record('JP', ranked('b'))
+        assert [s['id'] for s in store.snapshots_after(first)] == [second]
+
+
+class TestTrendingStreamEndpoint:
+    """Test the SSE push endpoint"""
+
+    def test_rejects_unknown_geo(self, backend_app):
+        client, _, _ = backend_app
+        assert client.get('/api/trends/trending/stream?geos=KR,XX').status_code == 400
+
+    def test_streams_snapshot_then_diff(self, backend_app):
+        import app as app_module
+        client, calls, _ = backend_app
+        broadcaster = TrendingBroadcaster()
+        broadcaster.dispatch('KR', 1, ranked('a', 'b'))
+
+        with patch.object(app_module, 'trending_broadcaster', broadcaster):
+            response = client.get('/api/trends/trending/stream?geos=KR', buffered=False)
+            assert response.mimetype == 'text/event-stream'
+            assert read_event(response) == ('snapshot', {
+                'geo': 'KR', 'version': 1, 'trending_searches': ranked('a', 'b')
+            })
+
+            broadcaster.dispatch('KR', 2, ranked('a', 'c'))
+            event, payload = read_event(response)
+            assert event == 'diff'
+            assert payload['changes'] == {
+                'inserted': [{'rank': 2, 'query': 'c', 'key': 'c'}],
+                'removed': [{'query': 'b', 'key': 'b'}],
+                'moved': []
+            }
+
+            response.close()
+            assert broadcaster.subscriber_count() == 0
+        assert calls == []